@@ -1,11 +1,417 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from espn_api.football import League
-import requests
-from typing import Dict, Any, List
+from espn_api.football.constant import DEFAULT_POSITION_MAP, PRO_TEAM_MAP
+from espn_api.football.core_stats import normalize_core_stats
+from espn_api.requests import AsyncEspnFantasyRequests, ResponseCache
+from espn_api.requests.constant import CORE_BASE_ENDPOINT
+from espn_api.utils.metrics import REGISTRY, record_upstream_request
+from espn_api.utils.player_directory import PlayerRecord
+from espn_api.utils.shared_cache import SQLiteSharedCache
+from espn_api.utils.single_flight import SingleFlight, SWRCache
+import httpx
+from collections import deque
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Set, Tuple
 import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
 
-app = FastAPI()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+LEAGUE_ID = 3925
+YEAR = 2025
+# How often the shared League snapshot is rebuilt in the background
+LEAGUE_REFRESH_SECONDS = float(os.environ.get('LEAGUE_REFRESH_SECONDS', 60))
+# The free-agent pool is fetched once for every position and reused this long
+FREE_AGENT_POOL_SECONDS = float(os.environ.get('FREE_AGENT_POOL_SECONDS', 30))
+FREE_AGENT_POOL_SIZE = int(os.environ.get('FREE_AGENT_POOL_SIZE', 3000))
+# The pool watcher reloads free agents on this schedule and publishes the diffs
+FREE_AGENT_WATCH_SECONDS = float(os.environ.get('FREE_AGENT_WATCH_SECONDS', 30))
+FREE_AGENT_FEED_HISTORY = int(os.environ.get('FREE_AGENT_FEED_HISTORY', 500))
+SSE_KEEPALIVE_SECONDS = 15
+# Single player cards are reused this long before being refreshed in the background
+PLAYER_INFO_SECONDS = float(os.environ.get('PLAYER_INFO_SECONDS', 5 * 60))
+PLAYER_INFO_BATCH_MAX_PLAYERS = int(os.environ.get('PLAYER_INFO_BATCH_MAX_PLAYERS', 200))
+PLAYER_SEARCH_MAX_RESULTS = 50
+# Expired entries are still served, while one refresh runs, for up to this long
+STALE_SECONDS = float(os.environ.get('STALE_SECONDS', 10 * 60))
+# Upper bound on ESPN requests in flight across every handler and refresher
+ESPN_MAX_CONCURRENCY = int(os.environ.get('ESPN_MAX_CONCURRENCY', 8))
+ESPN_TIMEOUT_SECONDS = float(os.environ.get('ESPN_TIMEOUT_SECONDS', 10))
+# Core API season stats are cached on disk, completed seasons indefinitely
+PLAYER_STATS_CACHE_DIR = os.environ.get('PLAYER_STATS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'player_stats'))
+CURRENT_SEASON_STATS_TTL_SECONDS = float(os.environ.get('CURRENT_SEASON_STATS_TTL_SECONDS', 6 * 60 * 60))
+# Seasons returned by /player-stats when none are asked for
+HISTORICAL_SEASONS = [YEAR - 1 - i for i in range(3)]
+# Core API fetches one /player-stats/batch request may run at once
+PLAYER_STATS_BATCH_CONCURRENCY = int(os.environ.get('PLAYER_STATS_BATCH_CONCURRENCY', 6))
+PLAYER_STATS_BATCH_MAX_PLAYERS = int(os.environ.get('PLAYER_STATS_BATCH_MAX_PLAYERS', 200))
+# Seasons a batch may ask for, each one a core API fetch per uncached player
+PLAYER_STATS_BATCH_MAX_SEASONS = 5
+PLAYER_STATS_FIRST_SEASON = 2006
+# The rostered-player index applies new transactions every ROSTER_POLL_SECONDS
+# and is only rebuilt from full rosters every ROSTER_RESYNC_SECONDS
+ROSTER_POLL_SECONDS = float(os.environ.get('ROSTER_POLL_SECONDS', 5))
+ROSTER_RESYNC_SECONDS = float(os.environ.get('ROSTER_RESYNC_SECONDS', 30 * 60))
+ROSTER_CURSOR_OVERLAP_SECONDS = 60
+ROSTER_TRANSACTION_TYPES = {'FREEAGENT', 'WAIVER', 'TRADE_ACCEPT'}
+# Failed warmup steps are retried on this schedule until the API is ready
+WARMUP_RETRY_SECONDS = float(os.environ.get('WARMUP_RETRY_SECONDS', 5))
+# SQLite file shared by uvicorn workers, unset to keep every cache in-process
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH')
+SHARED_CACHE_LEASE_SECONDS = float(os.environ.get('SHARED_CACHE_LEASE_SECONDS', 30))
+# Encoded bodies kept per data version, one per distinct query
+ENCODED_BODIES_PER_VERSION = 256
+
+# Workers started with the same SHARED_CACHE_PATH share the League payloads,
+# free-agent pool and player cards, and only one of them refreshes each at a time
+shared_cache = SQLiteSharedCache(SHARED_CACHE_PATH) if SHARED_CACHE_PATH else None
+
+_espn_client: Optional[httpx.AsyncClient] = None
+_espn_semaphore: Optional[asyncio.Semaphore] = None
+
+# pro schedules, player lists and positional ratings outlive a League refresh
+espn_response_cache = ResponseCache()
+
+def get_espn_client() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    '''Returns the pooled HTTP client and the semaphore bounding upstream concurrency'''
+    global _espn_client, _espn_semaphore
+    if _espn_client is None:
+        _espn_client = httpx.AsyncClient(timeout=ESPN_TIMEOUT_SECONDS)
+        _espn_semaphore = asyncio.Semaphore(ESPN_MAX_CONCURRENCY)
+    return _espn_client, _espn_semaphore
+
+async def close_espn_client():
+    global _espn_client, _espn_semaphore
+    if _espn_client is not None:
+        await _espn_client.aclose()
+        _espn_client, _espn_semaphore = None, None
+
+async def espn_get(url: str, view: str) -> httpx.Response:
+    '''GETs an ESPN URL outside EspnFantasyRequests on the shared client, recording it under view'''
+    client, semaphore = get_espn_client()
+    async with semaphore:
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            response = await client.get(url)
+            status = response.status_code
+            return response
+        finally:
+            record_upstream_request(view, status, time.perf_counter() - start)
+
+
+def encode_json(data: Any, sort_keys: bool = False) -> bytes:
+    '''Compact JSON bytes for data, through orjson when it is installed'''
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, default=str, option=option)
+    return json.dumps(data, sort_keys=sort_keys, separators=(',', ':'), default=str).encode()
+
+
+def content_etag(payload: Any) -> str:
+    '''Strong ETag over the JSON form of payload'''
+    return '"%s"' % hashlib.blake2b(encode_json(payload, sort_keys=True), digest_size=12).hexdigest()
+
+
+class CacheStats(object):
+    '''Hit and miss counts for a cache that doesn't keep its own'''
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+
+encoded_body_stats = CacheStats('encoded_bodies')
+
+
+class EncodedBodies(object):
+    '''Response bodies encoded once per data version.
+
+    Owners replace it whenever their data changes, so a body built from one
+    version is never served for another.
+    '''
+    def __init__(self):
+        self._bodies: Dict[Any, bytes] = {}
+
+    def get(self, key: Any, build: Callable[[], Any]) -> bytes:
+        '''The encoded body for key, calling build() for the data on first use'''
+        body = self._bodies.get(key)
+        if body is not None:
+            encoded_body_stats.hits += 1
+        else:
+            encoded_body_stats.misses += 1
+            body = encode_json(build())
+            if len(self._bodies) < ENCODED_BODIES_PER_VERSION:
+                self._bodies[key] = body
+        return body
+
+
+def json_response(body: bytes, response: Response) -> Response:
+    '''Returns pre-encoded JSON, keeping the headers already set on response'''
+    return Response(content=body, media_type='application/json', headers=dict(response.headers))
+
+
+class CachedPayload(object):
+    '''JSON-ready data with its validators, computed once when the data is built.
+
+    modified_at carries over from the previous payload when the content is
+    unchanged, so a refresh that returns the same data keeps clients at 304.
+    '''
+    def __init__(self, data: Any, previous: 'CachedPayload' = None):
+        self.data = data
+        self.etag = content_etag(data)
+        self.fetched_at = time.time()
+        unchanged = previous is not None and previous.etag == self.etag
+        self.modified_at = previous.modified_at if unchanged else self.fetched_at
+        self.bodies = EncodedBodies()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def to_shared(self) -> bytes:
+        return encode_json({'data': self.data, 'fetched_at': self.fetched_at, 'modified_at': self.modified_at})
+
+    @classmethod
+    def from_shared(cls, raw: bytes) -> 'CachedPayload':
+        '''Rebuilds a payload another worker stored, keeping its validators'''
+        stored = json_loads(raw)
+        payload = cls(stored['data'])
+        payload.fetched_at, payload.modified_at = stored['fetched_at'], stored['modified_at']
+        return payload
+
+
+def json_loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def shared_payload_cache(name: str, ttl: float, payload_class: type = None) -> SWRCache:
+    '''SWRCache of CachedPayloads, shared between workers when SHARED_CACHE_PATH is set'''
+    payload_class = payload_class or CachedPayload
+    return SWRCache(name, ttl=ttl, stale_ttl=STALE_SECONDS, shared=shared_cache,
+                    encode=lambda payload: payload.to_shared(), decode=payload_class.from_shared,
+                    lease_ttl=SHARED_CACHE_LEASE_SECONDS)
+
+
+def cached_value(cache: SWRCache, key: Any) -> Any:
+    '''The value currently stored in cache for key, or None'''
+    entry = cache.peek(key)
+    return entry[1] if entry else None
+
+
+def not_modified(request: Request, response: Response, etag: str, modified_at: float) -> Optional[Response]:
+    '''Sets ETag and Last-Modified on response.
+
+    Returns a 304 response when the request's validators show the client's
+    copy is current, so the handler can skip building the body.
+    '''
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = formatdate(modified_at, usegmt=True)
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        current = '*' in tags or etag in tags or f'W/{etag}' in tags
+    else:
+        if_modified_since = request.headers.get('if-modified-since')
+        try:
+            current = if_modified_since is not None and int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            current = False
+
+    if current:
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+
+def league_fingerprint(league: League) -> List[Any]:
+    '''The parts of a League the read endpoints expose, used for its ETag'''
+    return [
+        [team.team_id, team.team_name, team.wins, team.losses, team.ties,
+         [[player.playerId, player.name, getattr(player, 'position', None)] for player in team.roster]]
+        for team in league.teams
+    ]
+
+
+class LeagueSnapshot(object):
+    '''Long-lived League for one (league_id, year), rebuilt in the background.
+
+    Handlers read the latest League through get() instead of constructing their
+    own, so ESPN is only hit by the refresher and not once per request.
+    '''
+    def __init__(self, league_id: int, year: int, refresh_interval: float = LEAGUE_REFRESH_SECONDS):
+        self.league_id = league_id
+        self.year = year
+        self.refresh_interval = refresh_interval
+        self._league: Optional[League] = None
+        self._fetched_at: Optional[float] = None
+        self.etag: Optional[str] = None
+        self.modified_at: Optional[float] = None
+        self.bodies = EncodedBodies()
+        self._load_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        return 'LeagueSnapshot(%s, %s)' % (self.league_id, self.year, )
+
+    @property
+    def age(self) -> Optional[float]:
+        '''Seconds since the current League was fetched'''
+        if self._fetched_at is None:
+            return None
+        return time.time() - self._fetched_at
+
+    async def refresh(self) -> League:
+        '''Builds a new League and swaps it in; readers keep the old one until then'''
+        client, semaphore = get_espn_client()
+        espn_request = AsyncEspnFantasyRequests(sport='nfl', year=self.year, league_id=self.league_id,
+                                                client=client, semaphore=semaphore, cache=espn_response_cache)
+        league = League(league_id=self.league_id, year=self.year, fetch_league=False, async_espn_request=espn_request)
+        if shared_cache is None:
+            await league.fetch_league_async()
+        else:
+            # a League another worker fetched within the last half interval is reused
+            league_data = await league_data_cache.get_fresh((self.league_id, self.year), league.fetch_league_data_async)
+            league.load_league_data(league_data)
+        fetched_at = time.time()
+        etag = content_etag(league_fingerprint(league))
+        if etag != self.etag:
+            self.modified_at = fetched_at
+        # single reference assignment so readers never see a half-built League
+        self._league, self._fetched_at, self.etag, self.bodies = league, fetched_at, etag, EncodedBodies()
+        return league
+
+    async def get(self) -> Tuple[League, float]:
+        '''Returns the current League and its fetch time, loading it on first use'''
+        if self._league is None:
+            async with self._load_lock:
+                if self._league is None:
+                    await self.refresh()
+        return self._league, self._fetched_at
+
+    async def _run(self):
+        while True:
+            # the warmup may already have loaded a League, refresh once it's due
+            if self.age is not None:
+                await asyncio.sleep(max(0.0, self.refresh_interval - self.age))
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing {self!r}: {e}")
+                await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name=repr(self))
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+
+_league_snapshots: Dict[Tuple[int, int], LeagueSnapshot] = {}
+league_data_cache = SWRCache('league_data', ttl=LEAGUE_REFRESH_SECONDS / 2, shared=shared_cache,
+                             encode=encode_json, decode=json_loads, lease_ttl=SHARED_CACHE_LEASE_SECONDS)
+
+def get_league_snapshot(league_id: int = LEAGUE_ID, year: int = YEAR) -> LeagueSnapshot:
+    '''Returns the process-wide snapshot for (league_id, year)'''
+    key = (league_id, year)
+    if key not in _league_snapshots:
+        _league_snapshots[key] = LeagueSnapshot(league_id, year)
+    return _league_snapshots[key]
+
+async def get_league(response: Response = None) -> League:
+    '''Returns the shared League, exposing its age on the response when given'''
+    league, fetched_at = await get_league_snapshot().get()
+    if response is not None:
+        response.headers['X-Snapshot-Age'] = '%.1f' % (time.time() - fetched_at)
+    return league
+
+
+player_info_cache = shared_payload_cache('player_info', ttl=PLAYER_INFO_SECONDS)
+
+
+class Warmup(object):
+    '''Loads the caches every request depends on, then starts their refreshers.
+
+    Each step is retried every WARMUP_RETRY_SECONDS until it succeeds; /readyz
+    reports ready once all of them have.
+    '''
+    def __init__(self):
+        self.steps: Dict[str, Callable[[], Awaitable]] = {
+            'league': lambda: get_league_snapshot().get(),
+            'roster_index': lambda: roster_index.sync(),
+            'free_agent_pool': lambda: get_free_agent_pool(),
+        }
+        self.status: Dict[str, str] = {name: 'pending' for name in self.steps}
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    async def _step(self, name: str):
+        try:
+            await self.steps[name]()
+            self.status[name] = 'ready'
+        except Exception as e:
+            self.status[name] = f'error: {e}'
+
+    async def _run(self):
+        # the roster index and the pool wait on the League load they share
+        while True:
+            pending = [name for name, status in self.status.items() if status != 'ready']
+            if not pending:
+                break
+            await asyncio.gather(*[self._step(name) for name in pending])
+            if any(status != 'ready' for status in self.status.values()):
+                await asyncio.sleep(WARMUP_RETRY_SECONDS)
+        self.ready_at = time.time()
+        print(f"Caches warm after {self.ready_at - self.started_at:.1f}s")
+
+        get_league_snapshot().start()
+        roster_index.start()
+        free_agent_feed.start()
+
+    def start(self):
+        self.started_at = time.time()
+        self._task = asyncio.create_task(self._run(), name='Warmup')
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+        get_league_snapshot().stop()
+        roster_index.stop()
+        free_agent_feed.stop()
+
+
+warmup = Warmup()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # warm in the background so /healthz and /readyz answer while it runs
+    warmup.start()
+    yield
+    warmup.stop()
+    await close_espn_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -15,313 +421,788 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-LEAGUE_ID = 3925
-YEAR = 2025
+
+HTTP_REQUESTS = REGISTRY.counter('bid_tool_http_requests_total', 'API requests by route, method and status', ('route', 'method', 'status'))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram('bid_tool_http_request_duration_seconds', 'API request latency by route', ('route', 'method'))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # the route template keeps /player-stats/{player_id} to one series
+        route = request.scope.get('route')
+        path = route.path if route is not None else 'unmatched'
+        HTTP_REQUESTS.inc(route=path, method=request.method, status=status)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=path, method=request.method)
+
+def collect_cache_stats():
+    for cache in (league_data_cache, free_agent_pool_cache, player_info_cache, player_stats_cache, roster_index_cache,
+                  encoded_body_stats):
+        yield {'cache': cache.name, 'result': 'hit'}, cache.hits
+        yield {'cache': cache.name, 'result': 'stale_hit'}, cache.stale_hits
+        yield {'cache': cache.name, 'result': 'miss'}, cache.misses
+    yield {'cache': 'espn_responses', 'result': 'hit'}, espn_response_cache.hits
+    yield {'cache': 'espn_responses', 'result': 'miss'}, espn_response_cache.misses
+
+def collect_cache_entries():
+    for cache in (league_data_cache, free_agent_pool_cache, player_info_cache, roster_index_cache):
+        yield {'cache': cache.name}, len(cache)
+    yield {'cache': 'espn_responses'}, len(espn_response_cache)
+
+REGISTRY.collector('bid_tool_cache_requests_total', 'API cache lookups by cache and result', 'counter', collect_cache_stats)
+REGISTRY.collector('bid_tool_cache_entries', 'Entries held in memory by each API cache', 'gauge', collect_cache_entries)
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {'status': 'ok'}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once the League, roster index and free-agent pool are loaded, 503 until then"""
+    body = {
+        'status': 'ready' if warmup.ready else 'warming',
+        'components': warmup.status,
+        'uptime': round(time.time() - warmup.started_at, 1),
+    }
+    return Response(content=encode_json(body), media_type='application/json', status_code=200 if warmup.ready else 503)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: API latency, cache hit rates and ESPN calls per view"""
+    return Response(content=REGISTRY.render(), media_type='text/plain; version=0.0.4')
 
 @app.get("/teams")
-def get_teams():
-    league_id = 3925
-    year = 2025
-    league = League(league_id=league_id, year=year)
-
-    teams = [
-        {
-            "team_name": team.team_name,
-            "wins": team.wins,
-            "losses": team.losses,
-            "id": team.team_id
+async def get_teams(request: Request, response: Response):
+    league = await get_league(response)
+    snapshot = get_league_snapshot()
+    cached = not_modified(request, response, snapshot.etag, snapshot.modified_at)
+    if cached:
+        return cached
+
+    def build():
+        return [
+            {
+                "team_name": team.team_name,
+                "wins": team.wins,
+                "losses": team.losses,
+                "id": team.team_id
+            }
+            for team in league.teams
+        ]
+    return json_response(snapshot.bodies.get('teams', build), response)
+
+def serialize_player_info(p) -> Dict[str, Any]:
+    return {
+        "id": p.playerId,
+        "name": p.name,
+        "position": p.position,
+        "team": p.proTeam,
+        "projected_points": p.projected_total_points,
+        "total_points": p.total_points,
+        "avg_points": p.avg_points,
+        "projected_avg_points": p.projected_avg_points,
+        "status": p.active_status,
+        "stats": {
+            "breakdown": p.stats.get(0, {}),
+            "projected_breakdown": p.stats.get(1, {})
         }
-        for team in league.teams
-    ]
-    return teams
+    }
+
+async def load_player_infos(league: League, player_ids: List[int]) -> List[CachedPayload]:
+    """Player cards for player_ids, in order, skipping ids ESPN doesn't know.
+
+    Cards are cached per (id, scoring period). Every id that is missing or
+    expired is fetched in one kona_playercard request shared between them.
+    """
+    keys = [(player_id, league.scoringPeriodId) for player_id in player_ids]
+    due = [key for key in keys if not player_info_cache.is_fresh(key)]
+
+    batch: Optional[asyncio.Future] = None
+
+    async def fetch_due() -> Dict[int, Any]:
+        players = await league.player_info_async(playerId=[player_id for player_id, _ in due])
+        if players is None:
+            return {}
+        if not isinstance(players, list):
+            players = [players]
+        return {p.playerId: p for p in players}
+
+    def loader(key: Tuple[int, int]) -> Callable[[], Awaitable[CachedPayload]]:
+        async def load():
+            # started lazily, keys another worker already refreshed never get here
+            nonlocal batch
+            if batch is None:
+                batch = asyncio.ensure_future(fetch_due())
+            player = (await batch).get(key[0])
+            if player is None:
+                raise LookupError(key[0])
+            return CachedPayload(serialize_player_info(player), previous=cached_value(player_info_cache, key))
+        return load
+
+    async def get(key: Tuple[int, int]) -> Optional[CachedPayload]:
+        try:
+            return await player_info_cache.get(key, loader(key))
+        except LookupError:
+            return None
+
+    payloads = await asyncio.gather(*[get(key) for key in keys])
+    return [payload for payload in payloads if payload is not None]
+
+def player_infos_response(request: Request, response: Response, payloads: List[CachedPayload]) -> Response:
+    """Conditional JSON list of player cards built from each card's pre-encoded body"""
+    etag = content_etag([payload.etag for payload in payloads])
+    modified_at = max((payload.modified_at for payload in payloads), default=time.time())
+    cached = not_modified(request, response, etag, modified_at)
+    if cached:
+        return cached
+    body = b','.join(payload.bodies.get('player', lambda: payload.data) for payload in payloads)
+    return json_response(b'[' + body + b']', response)
+
+def parse_player_ids(ids: str) -> List[int]:
+    try:
+        return list(dict.fromkeys(int(player_id) for player_id in ids.split(',') if player_id.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of player ids")
 
 @app.get("/playerinfo")
-def get_player_info(playerId: int = None):
-    league_id = 3925
-    year = 2025
-    league = League(league_id=league_id, year=year)
+async def get_player_info(request: Request, response: Response, playerId: int = None, ids: str = None):
+    """Player cards as a list, for one playerId or for many with ids=1,2,3.
 
-    if not playerId:
-        raise HTTPException(status_code=400, detail="playerId parameter is required")
-    
+    A single playerId that ESPN doesn't know is a 404; with ids unknown
+    players are left out of the list.
+    """
+    if not playerId and not ids:
+        raise HTTPException(status_code=400, detail="playerId or ids parameter is required")
+    player_ids = parse_player_ids(ids) if ids else [playerId]
+    if len(player_ids) > PLAYER_INFO_BATCH_MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {PLAYER_INFO_BATCH_MAX_PLAYERS} players per request")
+
+    league = await get_league(response)
     try:
-        player = league.player_info(playerId=playerId)
-        
-        # Return player data in consistent format
-        if isinstance(player, list) and len(player) > 0:
-            p = player[0]
-        else:
-            p = player
-            
-        return [{
-            "id": p.playerId,
-            "name": p.name,
-            "position": p.position,
-            "team": p.proTeam,
-            "projected_points": p.projected_total_points,
-            "total_points": p.total_points,
-            "avg_points": p.avg_points,
-            "projected_avg_points": p.projected_avg_points,
-            "status": p.active_status,
-            "stats": {
-                "breakdown": p.stats.get(0, {}),
-                "projected_breakdown": p.stats.get(1, {})
-            }
-        }]
+        payloads = await load_player_infos(league, player_ids)
     except Exception as e:
-        print(f"Error fetching player info for {playerId}: {e}")
+        print(f"Error fetching player info for {player_ids}: {e}")
+        raise HTTPException(status_code=502, detail="Error fetching player info from ESPN")
+    if not ids and not payloads:
         raise HTTPException(status_code=404, detail=f"Player {playerId} not found")
+    return player_infos_response(request, response, payloads)
 
-@app.get("/free-agents")
-def get_free_agents():
-    league_id = 3925
-    year = 2025
-    league = League(league_id=league_id, year=year)
+class PlayerInfoRequest(BaseModel):
+    playerIds: List[int]
 
-    free_agents = league.free_agents()
-    return [
-        {
-            "id": p.playerId,
-            "name": p.name,
-            "position": p.position,
-            "team": p.proTeam,
-            "projected_points": p.projected_total_points,
-            "total_points": p.total_points,
-            "avg_points": p.avg_points,
-            "projected_avg_points": p.projected_avg_points,
-            "status": p.active_status,
-            "stats": p.stats.get(0, {})
-        }
-        for p in free_agents[:50]
-    ]
+@app.post("/playerinfo")
+async def get_player_info_batch(body: PlayerInfoRequest, request: Request, response: Response):
+    """Player cards for the playerIds in the body, for id lists too long for a query string"""
+    player_ids = list(dict.fromkeys(body.playerIds))
+    if len(player_ids) > PLAYER_INFO_BATCH_MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {PLAYER_INFO_BATCH_MAX_PLAYERS} players per request")
 
-def get_free_agents_by_position(position: str, size: int = 300):
-    league = League(league_id=LEAGUE_ID, year=YEAR)
-    free_agents = league.free_agents(position=position, size=size)
+    league = await get_league(response)
+    try:
+        payloads = await load_player_infos(league, player_ids)
+    except Exception as e:
+        print(f"Error fetching player info for {player_ids}: {e}")
+        raise HTTPException(status_code=502, detail="Error fetching player info from ESPN")
+    return player_infos_response(request, response, payloads)
 
-    return [
-        {
-            "id": p.playerId,
-            "name": p.name,
-            "position": p.position,
-            "team": p.proTeam,
-            "projected_points": p.projected_total_points,
-            "total_points": p.total_points,
-            "avg_points": p.avg_points,
-            "projected_avg_points": p.projected_avg_points,
-            "status": p.active_status,
-            "stats": p.stats.get(0, {})
+def serialize_player_record(record: PlayerRecord, rostered_player_ids: 'RosterIndex') -> Dict[str, Any]:
+    team_id = rostered_player_ids.team_by_player.get(record.id)
+    return {
+        'playerId': record.id,
+        'name': record.name,
+        'position': DEFAULT_POSITION_MAP.get(record.position_id),
+        'team': PRO_TEAM_MAP.get(record.pro_team_id),
+        'teamId': team_id,
+        'isOnRoster': team_id is not None,
+        'isFreeAgent': team_id is None,
+    }
+
+@app.get("/players/search")
+async def search_players(response: Response, q: str, limit: int = 10):
+    """Pro players matching q by name: exact matches, then name prefixes, then misspellings.
+
+    Answered from the snapshot League's player directory without calling ESPN.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    limit = max(1, min(limit, PLAYER_SEARCH_MAX_RESULTS))
+    league = await get_league(response)
+    rostered_player_ids = await get_all_team_rosters()
+    return [serialize_player_record(record, rostered_player_ids) for record in league.player_map.search(q, limit)]
+
+def serialize_free_agent(p) -> Dict[str, Any]:
+    return {
+        "id": p.playerId,
+        "name": p.name,
+        "position": p.position,
+        "team": p.proTeam,
+        "projected_points": p.projected_total_points,
+        "total_points": p.total_points,
+        "avg_points": p.avg_points,
+        "projected_avg_points": p.projected_avg_points,
+        "status": p.active_status,
+        "stats": p.stats.get(0, {})
+    }
+
+
+class FreeAgentPool(CachedPayload):
+    '''Free agents fetched in one League.free_agents call and partitioned by position'''
+    def __init__(self, players: List[Dict[str, Any]], previous: 'FreeAgentPool' = None):
+        super().__init__(players, previous)
+        self.players = players
+        self.by_position: Dict[str, List[Dict[str, Any]]] = {}
+        for player in players:
+            self.by_position.setdefault(player['position'], []).append(player)
+
+
+free_agent_pool_cache = shared_payload_cache('free_agent_pool', ttl=FREE_AGENT_POOL_SECONDS, payload_class=FreeAgentPool)
+
+class FreeAgentFeed(object):
+    '''Sequence-numbered diffs of the free-agent pool, served by /events/free-agents.
+
+    Every new pool this process sees, loaded here or by another worker through
+    the shared cache, is diffed against the last one; a change becomes an event
+    with the added and removed player ids. The last FREE_AGENT_FEED_HISTORY
+    events are kept so a client reconnecting with Last-Event-ID can resume.
+    The watcher task reloads the pool every FREE_AGENT_WATCH_SECONDS.
+
+    Sequence numbers only mean something within one feed, and every worker
+    has its own, so event ids carry the feed's id: a client reconnecting to
+    another worker, or after a restart, can't resume and gets a reset instead.
+    '''
+    def __init__(self, history: int):
+        self.id = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.pool: Optional[FreeAgentPool] = None
+        self.events: deque = deque(maxlen=history)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, pool: FreeAgentPool):
+        previous = self.pool
+        if previous is pool or (previous is not None and previous.fetched_at > pool.fetched_at):
+            return
+        self.pool = pool
+        if previous is None or previous.etag == pool.etag:
+            return
+        previous_ids = {player['id'] for player in previous.players}
+        pool_ids = {player['id'] for player in pool.players}
+        added, removed = pool_ids - previous_ids, previous_ids - pool_ids
+        if not added and not removed:
+            return
+
+        self.seq += 1
+        event = {
+            'seq': self.seq,
+            'added': sorted(added),
+            'removed': sorted(removed),
+            'etag': pool.etag,
+            'timestamp': pool.fetched_at,
         }
-        for p in free_agents
-    ]
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def event_id(self, seq: int) -> str:
+        return f'{self.id}:{seq}'
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        '''The seq in an event id this feed sent, or None for ids from another feed'''
+        feed_id, _, seq = (event_id or '').partition(':')
+        if feed_id != self.id:
+            return None
+        try:
+            return int(seq)
+        except ValueError:
+            return None
+
+    def since(self, seq: int) -> Optional[List[Dict[str, Any]]]:
+        '''Events after seq, or None when the feed can't resume from it'''
+        if seq > self.seq:
+            return None
+        if seq < self.seq and (not self.events or self.events[0]['seq'] > seq + 1):
+            return None
+        return [event for event in self.events if event['seq'] > seq]
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def _run(self):
+        # the first pool comes from the warmup or the first request
+        while True:
+            await asyncio.sleep(FREE_AGENT_WATCH_SECONDS)
+            try:
+                self.publish(await free_agent_pool_cache.get_fresh('pool', load_free_agent_pool))
+            except Exception as e:
+                print(f"Error refreshing free agent pool: {e}")
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name='FreeAgentFeed')
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+
+free_agent_feed = FreeAgentFeed(FREE_AGENT_FEED_HISTORY)
+
+async def load_free_agent_pool() -> FreeAgentPool:
+    league = await get_league()
+    free_agents = await league.free_agents_async(size=FREE_AGENT_POOL_SIZE)
+    return FreeAgentPool([serialize_free_agent(p) for p in free_agents], cached_value(free_agent_pool_cache, 'pool'))
+
+async def get_free_agent_pool(response: Response = None) -> FreeAgentPool:
+    '''Returns the cached free-agent pool, refetching it once FREE_AGENT_POOL_SECONDS pass'''
+    pool = await free_agent_pool_cache.get('pool', load_free_agent_pool)
+    free_agent_feed.publish(pool)
+    if response is not None:
+        response.headers['X-Snapshot-Age'] = '%.1f' % pool.age
+    return pool
+
+@app.get("/free-agents")
+async def get_free_agents(request: Request, response: Response, positions: str = None,
+                          size: int = Query(50, ge=1, le=FREE_AGENT_POOL_SIZE), offset: int = Query(0, ge=0)):
+    """Free agents from the shared pool.
+
+    Without positions this is the top of the pool by ownership. With
+    positions=QB,RB,... every requested group is returned in one response,
+    keyed by position, each sliced by offset and size.
+    """
+    pool = await get_free_agent_pool(response)
+    cached = not_modified(request, response, pool.etag, pool.modified_at)
+    if cached:
+        return cached
+    if not positions:
+        body = pool.bodies.get(('players', size, offset), lambda: pool.players[offset:offset + size])
+        return json_response(body, response)
+
+    wanted = tuple(dict.fromkeys(p.strip().upper() for p in positions.split(',') if p.strip()))
+    def build():
+        return {position: pool.by_position.get(position, [])[offset:offset + size] for position in wanted}
+    return json_response(pool.bodies.get(('groups', wanted, size, offset), build), response)
+
+async def get_free_agents_by_position(position: str, size: int = 300, request: Request = None, response: Response = None):
+    pool = await get_free_agent_pool(response)
+    if request is None:
+        return pool.by_position.get(position, [])[:size]
+
+    cached = not_modified(request, response, pool.etag, pool.modified_at)
+    if cached:
+        return cached
+    body = pool.bodies.get(('position', position, size), lambda: pool.by_position.get(position, [])[:size])
+    return json_response(body, response)
+
+
+def sse_message(event: str, data: Dict[str, Any], event_id: str = None) -> str:
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines += [f'event: {event}', f'data: {json.dumps(data)}']
+    return '\n'.join(lines) + '\n\n'
+
+@app.get("/events/free-agents")
+async def free_agent_events(request: Request, since: str = None):
+    """Server-sent events with the ids added to and removed from the free-agent pool.
+
+    A client resuming with Last-Event-ID (or ?since=) gets the diffs it missed.
+    A new client, one too far behind, or one whose last event id came from
+    another worker's feed first gets a reset event carrying the whole pool's ids.
+    """
+    since = free_agent_feed.parse_event_id(request.headers.get('last-event-id', since))
+    # subscribe before reading history so no event falls in between
+    queue = free_agent_feed.subscribe()
+
+    async def stream():
+        try:
+            backlog = free_agent_feed.since(since) if since is not None else None
+            if backlog is None:
+                pool = await get_free_agent_pool()
+                sent = free_agent_feed.seq
+                yield sse_message('reset', {'seq': sent, 'ids': [player['id'] for player in pool.players], 'etag': pool.etag},
+                                  free_agent_feed.event_id(sent))
+            else:
+                sent = since
+                for event in backlog:
+                    sent = event['seq']
+                    yield sse_message('diff', event, free_agent_feed.event_id(sent))
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if event['seq'] <= sent:
+                    continue
+                sent = event['seq']
+                yield sse_message('diff', event, free_agent_feed.event_id(sent))
+        finally:
+            free_agent_feed.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.get("/free-agents-qb")
-def get_free_agents_qb():
-    return get_free_agents_by_position("QB")
+async def get_free_agents_qb(request: Request, response: Response):
+    return await get_free_agents_by_position("QB", request=request, response=response)
 
 
 @app.get("/free-agents-rb")
-def get_free_agents_rb():
-    return get_free_agents_by_position("RB")
+async def get_free_agents_rb(request: Request, response: Response):
+    return await get_free_agents_by_position("RB", request=request, response=response)
 
 
 @app.get("/free-agents-wr")
-def get_free_agents_wr():
-    return get_free_agents_by_position("WR")
+async def get_free_agents_wr(request: Request, response: Response):
+    return await get_free_agents_by_position("WR", request=request, response=response)
 
 
 @app.get("/free-agents-te")
-def get_free_agents_te():
-    return get_free_agents_by_position("TE")
+async def get_free_agents_te(request: Request, response: Response):
+    return await get_free_agents_by_position("TE", request=request, response=response)
 
 
 @app.get("/free-agents-dt")
-def get_free_agents_dt():
-    return get_free_agents_by_position("DT")
+async def get_free_agents_dt(request: Request, response: Response):
+    return await get_free_agents_by_position("DT", request=request, response=response)
 
 
 @app.get("/free-agents-de")
-def get_free_agents_de():
-    return get_free_agents_by_position("DE")
+async def get_free_agents_de(request: Request, response: Response):
+    return await get_free_agents_by_position("DE", request=request, response=response)
 
 
 @app.get("/free-agents-lb")
-def get_free_agents_lb():
-    return get_free_agents_by_position("LB")
+async def get_free_agents_lb(request: Request, response: Response):
+    return await get_free_agents_by_position("LB", request=request, response=response)
 
 
 @app.get("/free-agents-cb")
-def get_free_agents_cb():
-    return get_free_agents_by_position("CB")
+async def get_free_agents_cb(request: Request, response: Response):
+    return await get_free_agents_by_position("CB", request=request, response=response)
 
 
 @app.get("/free-agents-s")
-def get_free_agents_s():
-    return get_free_agents_by_position("S")
+async def get_free_agents_s(request: Request, response: Response):
+    return await get_free_agents_by_position("S", request=request, response=response)
 
 
 @app.get("/free-agents-k")
-def get_free_agents_k():
-    return get_free_agents_by_position("K")
+async def get_free_agents_k(request: Request, response: Response):
+    return await get_free_agents_by_position("K", request=request, response=response)
+
+class PlayerStatsCache(object):
+    '''On-disk cache of core API season stats, one JSON file per (player_id, season).
+
+    Completed seasons never change so their entries never expire; seasons from
+    YEAR onwards are refetched once CURRENT_SEASON_STATS_TTL_SECONDS pass.
+    '''
+    def __init__(self, directory: str, current_season_ttl: float):
+        self.name = 'player_stats'
+        self.directory = directory
+        self.current_season_ttl = current_season_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def _path(self, player_id: int, season: int) -> str:
+        return os.path.join(self.directory, str(season), f'{player_id}.json')
+
+    def lookup(self, player_id: int, season: int) -> Tuple[Optional[Dict[str, Any]], bool]:
+        '''Returns the cached value, or None, and whether it is still fresh'''
+        try:
+            with open(self._path(player_id, season)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None, False
+        fresh = season < YEAR or time.time() - entry['fetched_at'] < self.current_season_ttl
+        if fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry['value'], fresh
+
+    def get(self, player_id: int, season: int) -> Optional[Dict[str, Any]]:
+        '''Returns the cached value if it is still fresh'''
+        value, fresh = self.lookup(player_id, season)
+        return value if fresh else None
+
+    def set(self, player_id: int, season: int, value: Dict[str, Any]):
+        path = self._path(player_id, season)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write then rename so concurrent readers never see a partial file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': time.time(), 'value': value}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error caching stats for player {player_id} in {season}: {e}")
 
-def fetch_player_stats_for_year(player_id: int, year: int) -> Dict[str, Any]:
+
+player_stats_cache = PlayerStatsCache(PLAYER_STATS_CACHE_DIR, CURRENT_SEASON_STATS_TTL_SECONDS)
+player_stats_flight = SingleFlight()
+
+async def fetch_player_stats_for_year(player_id: int, year: int,
+                                     lookup: Tuple[Optional[Dict[str, Any]], bool] = None) -> Dict[str, Any]:
+    """Player stats for a specific year, from the disk cache when possible.
+
+    An expired current-season entry is returned as is while one refresh runs in
+    the background; concurrent misses for the same player and year share a fetch.
+    lookup is a player_stats_cache.lookup result the caller already has.
+    """
+    key = (player_id, year)
+    cached, fresh = lookup if lookup is not None else player_stats_cache.lookup(player_id, year)
+    if cached is not None:
+        if not fresh and key not in player_stats_flight:
+            asyncio.ensure_future(player_stats_flight.do(key, fetch_player_stats_from_espn, player_id, year))
+        return cached
+    return await player_stats_flight.do(key, fetch_player_stats_from_espn, player_id, year)
+
+async def fetch_player_stats_from_espn(player_id: int, year: int) -> Dict[str, Any]:
     """Fetch player stats from ESPN Core API for a specific year"""
-    url = f"https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/seasons/{year}/types/2/athletes/{player_id}/statistics"
+    url = f"{CORE_BASE_ENDPOINT}football/leagues/nfl/seasons/{year}/types/2/athletes/{player_id}/statistics"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = await espn_get(url, 'core:statistics')
         if response.status_code == 200:
-            data = response.json()
-            
-            # Extract relevant stats from the response
-            stats = {}
-            
-            if 'splits' in data and 'categories' in data['splits']:
-                categories = data['splits']['categories']
-                
-                
-                for category in categories:
-                    category_name = category.get('name', '').lower()
-                    if 'stats' in category:
-                        for stat in category['stats']:
-                            stat_name = stat.get('name', '')
-                            stat_value = stat.get('value', 0)
-                            
-                            # Map stat names to match our existing structure
-                            if category_name == 'passing':
-                                if 'completions' in stat_name.lower():
-                                    stats['passingCompletions'] = stat_value
-                                elif stat_name.lower() == 'passingattempts':
-                                    stats['passingAttempts'] = stat_value
-                                elif stat_name.lower() == 'passingyards':
-                                    stats['passingYards'] = stat_value
-                                elif 'touchdowns' in stat_name.lower():
-                                    stats['passingTouchdowns'] = stat_value
-                                elif 'interceptions' in stat_name.lower():
-                                    stats['passingInterceptions'] = stat_value
-                            
-                            elif category_name == 'rushing':
-                                if stat_name.lower() == 'rushingattempts':
-                                    stats['rushingAttempts'] = stat_value
-                                elif stat_name.lower() == 'rushingyards':
-                                    stats['rushingYards'] = stat_value
-                                elif stat_name.lower() == 'rushingtouchdowns':
-                                    stats['rushingTouchdowns'] = stat_value
-                            
-                            elif category_name == 'receiving':
-                                if 'targets' in stat_name.lower():
-                                    stats['receivingTargets'] = stat_value
-                                elif 'receptions' in stat_name.lower():
-                                    stats['receivingReceptions'] = stat_value
-                                elif stat_name.lower() == 'receivingyards':
-                                    stats['receivingYards'] = stat_value
-                                elif 'touchdowns' in stat_name.lower():
-                                    stats['receivingTouchdowns'] = stat_value
-                            
-                            elif category_name == 'defensive':
-                                if 'totaltackles' in stat_name.lower().replace(' ', '') or 'combinedtackles' in stat_name.lower().replace(' ', ''):
-                                    stats['defensiveTotalTackles'] = stat_value
-                                elif 'sacks' in stat_name.lower():
-                                    stats['defensiveSacks'] = stat_value
-                                elif 'fumblesForced' in stat_name.lower():
-                                    stats['defensiveForcedFumbles'] = stat_value
-                                elif 'fumblerecoveries' in stat_name.lower().replace(' ', '') or 'fumblesRecovered' in stat_name.lower().replace(' ', ''):
-                                    stats['defensiveFumbles'] = stat_value
-                                elif 'passdefended' in stat_name.lower().replace(' ', '') or 'passesdefended' in stat_name.lower().replace(' ', ''):
-                                    stats['defensivePassesDefensed'] = stat_value
-                                elif 'interceptions' in stat_name.lower():
-                                    stats['defensiveInterceptions'] = stat_value
-                            
-                            elif category_name == 'general':
-                                if stat_name.lower() == 'fumblesforced':
-                                    stats['defensiveForcedFumbles'] = stat_value
-                                elif stat_name.lower() == 'fumblesrecovered':
-                                    stats['defensiveFumbles'] = stat_value
-                            
-                            elif category_name == 'defensiveinterceptions':
-                                if 'interceptions' in stat_name.lower():
-                                    stats['defensiveInterceptions'] = stat_value
-            
-            # Calculate derived stats
-            if 'passingCompletions' in stats and 'passingAttempts' in stats and stats['passingAttempts'] > 0:
-                stats['passingCompletionPercentage'] = stats['passingCompletions'] / stats['passingAttempts']
-            
-            if 'rushingYards' in stats and 'rushingAttempts' in stats and stats['rushingAttempts'] > 0:
-                stats['rushingYardsPerAttempt'] = stats['rushingYards'] / stats['rushingAttempts']
-            
-            if 'receivingYards' in stats and 'receivingReceptions' in stats and stats['receivingReceptions'] > 0:
-                stats['receivingYardsPerReception'] = stats['receivingYards'] / stats['receivingReceptions']
-            
-            return {
+            result = {
                 'year': year,
-                'stats': stats
+                'stats': normalize_core_stats(response.json())
             }
+            player_stats_cache.set(player_id, year, result)
+            return result
+        elif response.status_code == 404:
+            # no stats recorded for this player and season
+            result = {'year': year, 'stats': {}}
+            player_stats_cache.set(player_id, year, result)
+            return result
     except Exception as e:
         print(f"Error fetching stats for player {player_id} in {year}: {e}")
     
     return {'year': year, 'stats': {}}
 
 @app.get("/player-stats/{player_id}")
-def get_player_historical_stats(player_id: int):
+async def get_player_historical_stats(player_id: int):
     """Get historical stats for a player over the past 3 seasons"""
-    current_year = 2024  # Latest completed season
-    years = [current_year - i for i in range(3)]  # [2024, 2023, 2022]
-    
-    historical_stats = []
-    
-    for year in years:
-        year_stats = fetch_player_stats_for_year(player_id, year)
-        if year_stats['stats']:  # Only include years with data
-            historical_stats.append(year_stats)
+    results = await asyncio.gather(*[fetch_player_stats_for_year(player_id, year) for year in HISTORICAL_SEASONS])
+    historical_stats = [year_stats for year_stats in results if year_stats['stats']]  # Only include years with data
     
     return {
         'playerId': player_id,
         'historicalStats': historical_stats
     }
 
-# Cache for roster data to speed up free agent checks
-_roster_cache = None
-_roster_cache_time = None
-ROSTER_CACHE_DURATION = 5 * 60 * 1000  # 5 minutes in milliseconds
+class PlayerStatsBatchRequest(BaseModel):
+    playerIds: List[int]
+    seasons: Optional[List[int]] = Field(None, max_length=PLAYER_STATS_BATCH_MAX_SEASONS)
 
-def get_all_team_rosters():
-    """Get all team rosters and cache them for quick lookups"""
-    global _roster_cache, _roster_cache_time
-    import time
-    
-    current_time = int(time.time() * 1000)
-    
-    # Return cached data if still valid
-    if _roster_cache is not None and _roster_cache_time is not None:
-        if (current_time - _roster_cache_time) < ROSTER_CACHE_DURATION:
-            return _roster_cache
-    
-    try:
-        league = League(league_id=LEAGUE_ID, year=YEAR)
-        
-        # Build a set of all player IDs on team rosters
-        rostered_player_ids = set()
-        
-        for team in league.teams:
-            for player in team.roster:
-                if hasattr(player, 'playerId'):
-                    rostered_player_ids.add(player.playerId)
-        _roster_cache = rostered_player_ids
-        _roster_cache_time = current_time
-        
-        return rostered_player_ids
-        
-    except Exception as e:
-        print(f"Error fetching team rosters: {e}")
-        # Return empty set if we can't fetch rosters
-        return set()
+@app.post("/player-stats/batch")
+async def get_player_stats_batch(body: PlayerStatsBatchRequest):
+    """Stream season stats for many players as NDJSON, one line per (player, season).
+
+    Cached pairs are written first; the rest are fetched with bounded
+    parallelism and written in completion order.
+    """
+    player_ids = list(dict.fromkeys(body.playerIds))
+    if len(player_ids) > PLAYER_STATS_BATCH_MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {PLAYER_STATS_BATCH_MAX_PLAYERS} players per batch")
+    seasons = list(dict.fromkeys(body.seasons)) if body.seasons else HISTORICAL_SEASONS
+    if any(season < PLAYER_STATS_FIRST_SEASON or season > YEAR for season in seasons):
+        raise HTTPException(status_code=400, detail=f"seasons must be between {PLAYER_STATS_FIRST_SEASON} and {YEAR}")
+    limiter = asyncio.Semaphore(PLAYER_STATS_BATCH_CONCURRENCY)
+
+    def encode(player_id: int, year_stats: Dict[str, Any]) -> bytes:
+        return encode_json({'playerId': player_id, **year_stats}) + b'\n'
+
+    async def fetch(player_id: int, season: int, lookup: Tuple[Optional[Dict[str, Any]], bool]):
+        async with limiter:
+            return player_id, await fetch_player_stats_for_year(player_id, season, lookup)
+
+    async def stream():
+        missing = []
+        for player_id in player_ids:
+            for season in seasons:
+                cached, fresh = lookup = player_stats_cache.lookup(player_id, season)
+                if fresh:
+                    yield encode(player_id, cached)
+                else:
+                    missing.append((player_id, season, lookup))
+
+        tasks = [asyncio.ensure_future(fetch(*args)) for args in missing]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                player_id, year_stats = await next_done
+                yield encode(player_id, year_stats)
+        finally:
+            # client went away: tasks still queued on the limiter never start a fetch,
+            # but fetches already started are shielded by player_stats_flight and run
+            # on to fill the disk cache, cancelling only detaches them from this stream
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+roster_index_cache = SWRCache('roster_index', ttl=ROSTER_POLL_SECONDS, shared=shared_cache,
+                              encode=encode_json, decode=json_loads, lease_ttl=SHARED_CACHE_LEASE_SECONDS)
+
+class RosterIndex(object):
+    '''player_id -> team_id for every rostered player.
+
+    Seeded from the snapshot League's rosters, then kept current by applying
+    executed transactions processed after the cursor every ROSTER_POLL_SECONDS.
+    A full resync from rosters only happens every ROSTER_RESYNC_SECONDS.
+
+    The index goes through roster_index_cache, so with a shared cache one
+    worker polls ESPN each interval and the others adopt the index it stored.
+    '''
+    def __init__(self):
+        self.team_by_player: Dict[int, int] = {}
+        self.cursor = 0  # processDate (ms) of the newest applied transaction
+        # scoring period the cursor is in, polled until a newer period's transaction moves it on
+        self.cursor_period: Optional[int] = None
+        self.synced_at: Optional[float] = None
+        self.updated_at: Optional[float] = None
+        self._state: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self.team_by_player
+
+    def __len__(self) -> int:
+        return len(self.team_by_player)
+
+    def seed(self, league: League, fetched_at: float):
+        '''Rebuilds the index from the rosters of a League fetched at fetched_at'''
+        self.team_by_player = {
+            player.playerId: team.team_id
+            for team in league.teams
+            for player in team.roster
+        }
+        # rosters already reflect transactions up to the fetch, replaying a
+        # few around it is harmless since applying one is idempotent
+        self.cursor = int((fetched_at - ROSTER_CURSOR_OVERLAP_SECONDS) * 1000)
+        self.cursor_period = league.scoringPeriodId
+        self.synced_at = self.updated_at = time.time()
+
+    def apply(self, transactions: List[Any]):
+        '''Applies executed transactions newer than the cursor, oldest first'''
+        for transaction in sorted(transactions, key=lambda t: t.date or 0):
+            if transaction.status != 'EXECUTED' or (transaction.date or 0) <= self.cursor:
+                continue
+            for item in transaction.items:
+                if item.type == 'DROP':
+                    # a later add may already have moved the player elsewhere
+                    if self.team_by_player.get(item.playerId) == item.from_team_id:
+                        del self.team_by_player[item.playerId]
+                elif item.type in ('ADD', 'TRADE') and item.to_team_id > 0:
+                    self.team_by_player[item.playerId] = item.to_team_id
+            self.cursor = transaction.date
+            self.cursor_period = max(self.cursor_period or 0, transaction.scoring_period)
+        self.updated_at = time.time()
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'team_by_player': list(self.team_by_player.items()),
+            'cursor': self.cursor,
+            'cursor_period': self.cursor_period,
+            'synced_at': self.synced_at,
+            'updated_at': self.updated_at,
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        '''Replaces the index with one to_state produced, here or in another worker'''
+        if state is self._state:
+            return
+        self.team_by_player = {player_id: team_id for player_id, team_id in state['team_by_player']}
+        self.cursor, self.synced_at, self.updated_at = state['cursor'], state['synced_at'], state['updated_at']
+        self.cursor_period = state.get('cursor_period')
+        self._state = state
+
+    async def sync(self):
+        '''Adopts an index polled within ROSTER_POLL_SECONDS, polling for one if there is none.
+
+        Concurrent callers share the poll already in flight, and with a shared
+        cache so do the other workers.
+        '''
+        self.load_state(await roster_index_cache.get_fresh('rosters', self._poll))
+
+    async def _poll(self) -> Dict[str, Any]:
+        '''Seeds the index when due for a resync and applies new transactions'''
+        # continue from the newest index any worker stored
+        previous = cached_value(roster_index_cache, 'rosters')
+        if previous is not None:
+            self.load_state(previous)
+        league, fetched_at = await get_league_snapshot().get()
+        if self.synced_at is None or time.time() - self.synced_at >= ROSTER_RESYNC_SECONDS:
+            self.seed(league, fetched_at)
+        self.apply([transaction for period in self.poll_periods(league.scoringPeriodId)
+                    for transaction in await self._transactions(league, period)])
+        return self.to_state()
+
+    def poll_periods(self, scoring_period: int) -> List[int]:
+        '''The current scoring period, and the previous one while the cursor is still in it,
+        so moves processed there after the last poll aren't missed until the next resync'''
+        if self.cursor_period is not None and self.cursor_period < scoring_period:
+            return [scoring_period - 1, scoring_period]
+        return [scoring_period]
+
+    async def _transactions(self, league: League, scoring_period: int) -> List[Any]:
+        try:
+            return await league.transactions_async(scoring_period=scoring_period, types=ROSTER_TRANSACTION_TYPES)
+        except Exception as e:
+            # no transactions in this scoring period
+            if str(e) != 'No transactions found':
+                raise
+            return []
+
+    async def get(self) -> 'RosterIndex':
+        if self.synced_at is None:
+            await self.sync()
+        return self
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Error syncing roster index: {e}")
+            await asyncio.sleep(ROSTER_POLL_SECONDS)
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name='RosterIndex')
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+
+roster_index = RosterIndex()
+
+async def get_all_team_rosters() -> RosterIndex:
+    """Index of every rostered player for quick free agent checks"""
+    return await roster_index.get()
 
 @app.get("/player-free-agent-status/{player_id}")
-def check_player_free_agent_status(player_id: int):
+async def check_player_free_agent_status(player_id: int):
     """Check if a player is a free agent by looking at team rosters"""
     try:
-        rostered_player_ids = get_all_team_rosters()
+        rostered_player_ids = await get_all_team_rosters()
         
         # Player is a free agent if they're NOT on any team roster
         is_free_agent = player_id not in rostered_player_ids
@@ -331,6 +1212,7 @@ def check_player_free_agent_status(player_id: int):
             'playerId': player_id,
             'isFreeAgent': is_free_agent,
             'isRostered': not is_free_agent,
+            'teamId': rostered_player_ids.team_by_player.get(player_id),
             'totalRosteredPlayers': len(rostered_player_ids)
         }
         
@@ -345,10 +1227,14 @@ def check_player_free_agent_status(player_id: int):
         }
 
 @app.get("/debug-rosters")
-def debug_team_rosters():
+async def debug_team_rosters(request: Request, response: Response):
     """Debug endpoint to see all team rosters"""
     try:
-        league = League(league_id=LEAGUE_ID, year=YEAR)
+        league = await get_league(response)
+        snapshot = get_league_snapshot()
+        cached = not_modified(request, response, snapshot.etag, snapshot.modified_at)
+        if cached:
+            return cached
         
         team_rosters = []
         all_rostered_ids = set()
@@ -386,29 +1272,16 @@ def debug_team_rosters():
         }
 
 @app.get("/test-deandre-hopkins")
-def test_deandre_hopkins():
+async def test_deandre_hopkins():
     """Test endpoint to find DeAndre Hopkins and check if he's a free agent"""
     try:
         # Get all rostered player IDs
-        rostered_player_ids = get_all_team_rosters()
-        
-        # Get all free agents to look for DeAndre Hopkins
-        league = League(league_id=LEAGUE_ID, year=YEAR)
-        free_agents = league.free_agents(size=200)  # Get more free agents
+        rostered_player_ids = await get_all_team_rosters()
         
-        # Look for DeAndre Hopkins
-        hopkins_players = []
-        for p in free_agents:
-            if 'hopkins' in p.name.lower():
-                hopkins_info = {
-                    'name': p.name,
-                    'playerId': p.playerId,
-                    'position': p.position,
-                    'team': p.proTeam,
-                    'isOnRoster': p.playerId in rostered_player_ids,
-                    'isFreeAgent': p.playerId not in rostered_player_ids
-                }
-                hopkins_players.append(hopkins_info)
+        # Look for DeAndre Hopkins among every pro player, not just the free agents
+        league = await get_league()
+        hopkins_players = [serialize_player_record(record, rostered_player_ids)
+                           for record in league.player_map.prefix('hopkins', limit=PLAYER_SEARCH_MAX_RESULTS)]
         
         return {
             'hopkinsPlayers': hopkins_players,
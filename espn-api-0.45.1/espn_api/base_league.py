@@ -1,21 +1,27 @@
 from abc import ABC
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from .base_settings import BaseSettings
 from .base_pick import BasePick
 from .utils.logger import Logger
-from .requests.espn_requests import EspnFantasyRequests
+from .utils.player_directory import PlayerDirectory
+from .requests.espn_requests import EspnFantasyRequests, DEFAULT_TIMEOUT
 
 class BaseLeague(ABC):
     '''Creates a League instance for Public/Private ESPN league'''
-    def __init__(self, league_id: int, year: int, sport: str, espn_s2=None, swid=None, debug=False):
+    def __init__(self, league_id: int, year: int, sport: str, espn_s2=None, swid=None, debug=False, session=None,
+                 timeout=DEFAULT_TIMEOUT, cache=None, archive=None):
         self.logger = Logger(name=f'{sport} league', debug=debug)
         self.league_id = league_id
         self.year = year
         self.teams = []
+        # team_id -> Team and team_id -> position in team id order, rebuilt by _fetch_teams
+        self._teams_by_id = {}
+        self._team_positions = {}
+        self._indexed_teams = None
         self.members = []
         self.draft = []
-        self.player_map = {}
+        self.player_map = PlayerDirectory()
 
         cookies = None
         if espn_s2 and swid:
@@ -23,13 +29,19 @@ class BaseLeague(ABC):
                 'espn_s2': espn_s2,
                 'SWID': swid
             }
-        self.espn_request = EspnFantasyRequests(sport=sport, year=year, league_id=league_id, cookies=cookies, logger=self.logger)
+        self.espn_request = EspnFantasyRequests(sport=sport, year=year, league_id=league_id, cookies=cookies, logger=self.logger,
+                                                session=session, timeout=timeout, cache=cache,
+                                                archive=archive)
 
     def __repr__(self):
         return 'League(%s, %s)' % (self.league_id, self.year, )
 
     def _fetch_league(self, SettingsClass = BaseSettings):
         data = self.espn_request.get_league()
+        return self._load_league(data, SettingsClass)
+
+    def _load_league(self, data, SettingsClass = BaseSettings):
+        '''Sets league status and settings from a get_league payload'''
         self.currentMatchupPeriod = data['status']['currentMatchupPeriod']
         self.scoringPeriodId = data['scoringPeriodId']
         self.firstScoringPeriod = data['status']['firstScoringPeriod']
@@ -48,6 +60,9 @@ class BaseLeague(ABC):
     def _fetch_draft(self):
         '''Creates list of Pick objects from the leagues draft'''
         data = self.espn_request.get_league_draft()
+        self._load_draft(data)
+
+    def _load_draft(self, data):
         # League has not drafted yet
         if not data.get('draftDetail', {}).get('drafted'):
             return
@@ -85,20 +100,27 @@ class BaseLeague(ABC):
 
         # sort by team ID
         self.teams = sorted(self.teams, key=lambda x: x.team_id, reverse=False)
+        self._index_teams()
+
+    def _index_teams(self):
+        self._indexed_teams = self.teams
+        self._teams_by_id = {team.team_id: team for team in self.teams}
+        ordered = sorted(self.teams, key=lambda x: x.team_id)
+        self._team_positions = {team.team_id: position for position, team in enumerate(ordered)}
 
     def _fetch_players(self):
-        data = self.espn_request.get_pro_players()
-        # Map all player id's to player name
-        for player in data:
-            # two way map to find playerId's by name
-            self.player_map[player['id']] = player['fullName']
-            # if two players have the same fullname use first one for now TODO update for multiple player names
-            if player['fullName'] not in self.player_map:
-                self.player_map[player['fullName']] = player['id']
+        # decoded player by player, the full players_wl list is never built
+        self._load_players(self.espn_request.iter_pro_players())
+
+    def _load_players(self, data):
+        '''Fills player_map from any iterable of players with an id and fullName'''
+        self.player_map.load(data)
 
     def _get_pro_schedule(self, scoringPeriodId: int = None):
         data = self.espn_request.get_pro_schedule()
+        return self._parse_pro_schedule(data, scoringPeriodId)
 
+    def _parse_pro_schedule(self, data, scoringPeriodId: int = None):
         pro_teams = data['settings']['proTeams']
         pro_team_schedule = {}
 
@@ -111,7 +133,9 @@ class BaseLeague(ABC):
     
     def _get_all_pro_schedule(self):
         data = self.espn_request.get_pro_schedule()
+        return self._parse_all_pro_schedule(data)
 
+    def _parse_all_pro_schedule(self, data):
         pro_teams = data.get('settings', {}).get('proTeams', {})
         pro_team_schedule = {}
 
@@ -124,8 +148,12 @@ class BaseLeague(ABC):
         standings = sorted(self.teams, key=lambda x: x.final_standing if x.final_standing != 0 else x.standing, reverse=False)
         return standings
 
+    def _team_index(self) -> Dict[int, int]:
+        if self._indexed_teams is not self.teams or len(self._teams_by_id) != len(self.teams):
+            # teams were replaced or added to without going through _fetch_teams
+            self._index_teams()
+        return self._team_positions
+
     def get_team_data(self, team_id: int) -> List:
-        for team in self.teams:
-            if team_id == team.team_id:
-                return team
-        return None
+        self._team_index()
+        return self._teams_by_id.get(team_id)
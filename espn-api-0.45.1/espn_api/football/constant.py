@@ -79,6 +79,23 @@ PRO_TEAM_MAP = {
     34: 'HOU'
 }
 
+# a player's defaultPositionId, which is not a lineup slot id like POSITION_MAP's keys
+DEFAULT_POSITION_MAP = {
+    1: 'QB',
+    2: 'RB',
+    3: 'WR',
+    4: 'TE',
+    5: 'K',
+    7: 'P',
+    9: 'DT',
+    10: 'DE',
+    11: 'LB',
+    12: 'CB',
+    13: 'S',
+    14: 'HC',
+    16: 'D/ST'
+}
+
 ACTIVITY_MAP = {
     178: 'FA ADDED',
     180: 'WAIVER ADDED',
@@ -521,3 +538,44 @@ TRANSACTION_TYPES = {
     'WAIVER_ERROR',
     'TRADE_ERROR'
 }
+
+# ESPN core API statistics (sports.core.api.espn.com .../athletes/{id}/statistics)
+# keyed by (category name, stat name) as they appear in splits.categories
+CORE_STATS_MAP = {
+    ('passing', 'completions'): 'passingCompletions',
+    ('passing', 'passingAttempts'): 'passingAttempts',
+    ('passing', 'passingYards'): 'passingYards',
+    ('passing', 'passingTouchdowns'): 'passingTouchdowns',
+    ('passing', 'interceptions'): 'passingInterceptions',
+
+    ('rushing', 'rushingAttempts'): 'rushingAttempts',
+    ('rushing', 'rushingYards'): 'rushingYards',
+    ('rushing', 'rushingTouchdowns'): 'rushingTouchdowns',
+
+    ('receiving', 'receivingTargets'): 'receivingTargets',
+    ('receiving', 'receptions'): 'receivingReceptions',
+    ('receiving', 'receivingYards'): 'receivingYards',
+    ('receiving', 'receivingTouchdowns'): 'receivingTouchdowns',
+
+    ('defensive', 'totalTackles'): 'defensiveTotalTackles',
+    ('defensive', 'combinedTackles'): 'defensiveTotalTackles',
+    ('defensive', 'sacks'): 'defensiveSacks',
+    ('defensive', 'fumblesForced'): 'defensiveForcedFumbles',
+    ('defensive', 'fumblesRecovered'): 'defensiveFumbles',
+    ('defensive', 'fumbleRecoveries'): 'defensiveFumbles',
+    ('defensive', 'passesDefended'): 'defensivePassesDefensed',
+    ('defensive', 'passDefended'): 'defensivePassesDefensed',
+    ('defensive', 'interceptions'): 'defensiveInterceptions',
+
+    ('general', 'fumblesForced'): 'defensiveForcedFumbles',
+    ('general', 'fumblesRecovered'): 'defensiveFumbles',
+
+    ('defensiveInterceptions', 'interceptions'): 'defensiveInterceptions',
+}
+
+# ratios computed from normalized core stats: key -> (numerator, denominator)
+CORE_DERIVED_STATS = {
+    'passingCompletionPercentage': ('passingCompletions', 'passingAttempts'),
+    'rushingYardsPerAttempt': ('rushingYards', 'rushingAttempts'),
+    'receivingYardsPerReception': ('receivingYards', 'receivingReceptions'),
+}
@@ -0,0 +1,29 @@
+from typing import Any, Dict, Iterable, Tuple
+
+from .constant import CORE_STATS_MAP, CORE_DERIVED_STATS
+
+
+def normalize_core_stats(data: dict, stats_map: Dict[Tuple[str, str], str] = CORE_STATS_MAP) -> Dict[str, Any]:
+    '''Flattens a core API statistics payload into {output key: value}.
+
+    Every stat is one dict lookup on (category, name); stats missing from
+    stats_map are skipped. Ratios in CORE_DERIVED_STATS are added afterwards
+    when their denominator is positive.
+    '''
+    stats = {}
+    for category in data.get('splits', {}).get('categories', []):
+        category_name = category.get('name', '')
+        for stat in category.get('stats', []):
+            key = stats_map.get((category_name, stat.get('name', '')))
+            if key is not None:
+                stats[key] = stat.get('value', 0)
+
+    for key, (numerator, denominator) in CORE_DERIVED_STATS.items():
+        if numerator in stats and stats.get(denominator, 0) > 0:
+            stats[key] = stats[numerator] / stats[denominator]
+    return stats
+
+
+def normalize_core_stats_many(payloads: Iterable[Tuple[Any, dict]]) -> Dict[Any, Dict[str, Any]]:
+    '''normalize_core_stats over (key, payload) pairs, e.g. ((player_id, season), data) when ingesting in bulk'''
+    return {key: normalize_core_stats(data) for key, data in payloads}
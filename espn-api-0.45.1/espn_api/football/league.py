@@ -1,8 +1,17 @@
+import asyncio
 import json
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, List, Set, Tuple, Union
 
+import requests
+
 from ..base_league import BaseLeague
+from ..requests.async_espn_requests import AsyncEspnFantasyRequests
+from ..requests.espn_requests import DEFAULT_TIMEOUT
+from ..requests.archive import TrafficArchive
+from ..requests.response_cache import ResponseCache
+from ..utils.player_directory import PlayerDirectory
 from .team import Team
 from .matchup import Matchup
 from .box_score import BoxScore
@@ -26,8 +35,19 @@ from .helper import (
 
 class League(BaseLeague):
     '''Creates a League instance for Public/Private ESPN league'''
-    def __init__(self, league_id: int, year: int, espn_s2=None, swid=None, fetch_league=True, debug=False):
-        super().__init__(league_id=league_id, year=year, sport='nfl', espn_s2=espn_s2, swid=swid, debug=debug)
+    def __init__(self, league_id: int, year: int, espn_s2=None, swid=None, fetch_league=True, debug=False,
+                 async_espn_request: AsyncEspnFantasyRequests = None, session: requests.Session = None,
+                 timeout=DEFAULT_TIMEOUT, cache: ResponseCache = None, archive: TrafficArchive = None,
+                 lazy: bool = False):
+        super().__init__(league_id=league_id, year=year, sport='nfl', espn_s2=espn_s2, swid=swid, debug=debug,
+                         session=session, timeout=timeout, cache=cache, archive=archive)
+        self.async_espn_request = async_espn_request
+        # lazy leagues fetch only the league itself up front, the rest on first access
+        self.lazy = lazy
+        self._pro_schedule = None
+        if lazy:
+            self._player_map = None
+            self._draft = None
 
         if fetch_league:
             self.fetch_league()
@@ -35,26 +55,115 @@ class League(BaseLeague):
     def fetch_league(self):
         self._fetch_league()
 
+    @property
+    def player_map(self) -> PlayerDirectory:
+        '''Directory of pro players by id and name, fetched on first access by a lazy League'''
+        if self._player_map is None:
+            players = self.espn_request.iter_pro_players()
+            self._player_map = PlayerDirectory()
+            self._load_players(players)
+        return self._player_map
+
+    @player_map.setter
+    def player_map(self, value: PlayerDirectory):
+        self._player_map = value
+
+    @property
+    def draft(self) -> list:
+        '''The league's draft picks, fetched on first access by a lazy League'''
+        if self._draft is None:
+            data = self.espn_request.get_league_draft()
+            self._draft = []
+            self._load_draft(data)
+        return self._draft
+
+    @draft.setter
+    def draft(self, value: list):
+        self._draft = value
+
+    def _get_lazy_pro_schedule(self) -> dict:
+        '''The whole season's pro schedule, fetched once when a player's schedule is first read'''
+        if self._pro_schedule is None:
+            self._pro_schedule = self._get_all_pro_schedule()
+        return self._pro_schedule
+
+    async def fetch_league_async(self):
+        '''Async counterpart of fetch_league, the initial requests are issued concurrently'''
+        self.load_league_data(await self.fetch_league_data_async())
+
+    async def fetch_league_data_async(self) -> dict:
+        '''The raw ESPN payloads a League is built from, fetched concurrently'''
+        espn_request = self._get_async_request()
+        data, players, pro_schedule, draft = await asyncio.gather(
+            espn_request.get_league(),
+            self._fetch_player_names_async(espn_request),
+            espn_request.get_pro_schedule(),
+            espn_request.get_league_draft(),
+        )
+        return {'league': data, 'players': players, 'pro_schedule': pro_schedule, 'draft': draft}
+
+    async def _fetch_player_names_async(self, espn_request: AsyncEspnFantasyRequests) -> List[dict]:
+        '''The fields of every pro player that PlayerDirectory.load reads'''
+        return [{'id': player['id'], 'fullName': player['fullName'], 'defaultPositionId': player.get('defaultPositionId'),
+                 'proTeamId': player.get('proTeamId')} for player in await espn_request.iter_pro_players()]
+
+    def load_league_data(self, league_data: dict):
+        '''Builds the League from payloads returned by fetch_league_data_async or _fetch_league_data'''
+        data, players = league_data['league'], league_data['players']
+        pro_schedule, draft = league_data['pro_schedule'], league_data['draft']
+        self._load_league(data, Settings)
+        self.nfl_week = data['status']['latestScoringPeriod']
+        self.player_map, self.draft = PlayerDirectory(), []
+        self._load_players(players)
+        self._load_teams(data, self._parse_all_pro_schedule(pro_schedule))
+        self._load_draft(draft)
+
+    def _get_async_request(self) -> AsyncEspnFantasyRequests:
+        if self.async_espn_request is None:
+            self.async_espn_request = AsyncEspnFantasyRequests(sport='nfl', year=self.year, league_id=self.league_id,
+                                                               cookies=self.espn_request.cookies, logger=self.logger,
+                                                               cache=self.espn_request.cache,
+                                                               archive=self.espn_request.archive)
+        return self.async_espn_request
+
     def _fetch_league(self):
+        if not self.lazy:
+            self.load_league_data(self._fetch_league_data())
+            return
         data = super()._fetch_league(SettingsClass=Settings)
 
         self.nfl_week = data['status']['latestScoringPeriod']
-        self._fetch_players()
         self._fetch_teams(data)
-        super()._fetch_draft()
+
+    def _fetch_league_data(self) -> dict:
+        '''The payloads load_league_data builds a League from, fetched concurrently on a thread pool'''
+        espn_request = self.espn_request
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'league': executor.submit(espn_request.get_league),
+                # the request is made here, the players are decoded as load_league_data reads them
+                'players': executor.submit(espn_request.iter_pro_players),
+                'pro_schedule': executor.submit(espn_request.get_pro_schedule),
+                'draft': executor.submit(espn_request.get_league_draft),
+            }
+        # league first, so its errors (unknown league, access denied) are the ones raised
+        return {name: future.result() for name, future in futures.items()}
 
     def _fetch_teams(self, data):
         '''Fetch teams in league'''
-        pro_schedule = self._get_all_pro_schedule()
+        pro_schedule = self._get_lazy_pro_schedule if self.lazy else self._get_all_pro_schedule()
+        self._load_teams(data, pro_schedule)
+
+    def _load_teams(self, data, pro_schedule):
         super()._fetch_teams(data, TeamClass=Team, pro_schedule=pro_schedule)
 
         # replace opponentIds in schedule with team instances
         for team in self.teams:
             team.division_name = self.settings.division_map.get(team.division_id, '')
             for week, matchup in enumerate(team.schedule):
-                for opponent in self.teams:
-                    if matchup == opponent.team_id:
-                        team.schedule[week] = opponent
+                opponent = self.get_team_data(matchup)
+                if opponent is not None:
+                    team.schedule[week] = opponent
 
         # calculate margin of victory
         for team in self.teams:
@@ -63,11 +172,16 @@ class League(BaseLeague):
                 team.mov.append(mov)
 
     def _get_positional_ratings(self, week: int):
-        params = {
+        data = self.espn_request.league_get(params=self._positional_ratings_params(week))
+        return self._parse_positional_ratings(data)
+
+    def _positional_ratings_params(self, week: int) -> dict:
+        return {
             'view': 'mPositionalRatings',
             'scoringPeriodId': week,
         }
-        data = self.espn_request.league_get(params=params)
+
+    def _parse_positional_ratings(self, data):
         ratings = data.get('positionAgainstOpponent', {}).get('positionalRatings', {})
 
         positional_ratings = {}
@@ -86,9 +200,15 @@ class League(BaseLeague):
         self._fetch_teams(data)
 
     def refresh_draft(self, refresh_players=False, refresh__teams=False):
-        super()._fetch_draft()
-        if refresh_players:
-            self._fetch_players()
+        if self.lazy:
+            # refetched on next access
+            self._draft = None
+            if refresh_players:
+                self._player_map = None
+        else:
+            super()._fetch_draft()
+            if refresh_players:
+                self._fetch_players()
         if refresh__teams:
             self._fetch_teams(data)
 
@@ -274,12 +394,13 @@ class League(BaseLeague):
         schedule = data['schedule']
         matchups = [Matchup(matchup) for matchup in schedule if matchup['matchupPeriodId'] == week]
 
-        for team in self.teams:
-            for matchup in matchups:
-                if matchup._home_team_id == team.team_id:
-                    matchup.home_team = team
-                elif matchup._away_team_id == team.team_id:
-                    matchup.away_team = team
+        for matchup in matchups:
+            home_team = self.get_team_data(matchup._home_team_id)
+            if home_team is not None:
+                matchup.home_team = home_team
+            away_team = self.get_team_data(matchup._away_team_id)
+            if away_team is not None:
+                matchup.away_team = away_team
 
         return matchups
 
@@ -311,12 +432,9 @@ class League(BaseLeague):
         positional_rankings = self._get_positional_ratings(scoring_period)
         box_data = [BoxScore(matchup, pro_schedule, positional_rankings, scoring_period, self.year) for matchup in schedule]
 
-        for team in self.teams:
-            for matchup in box_data:
-                if matchup.home_team == team.team_id:
-                    matchup.home_team = team
-                elif matchup.away_team == team.team_id:
-                    matchup.away_team = team
+        for matchup in box_data:
+            matchup.home_team = self.get_team_data(matchup.home_team) or matchup.home_team
+            matchup.away_team = self.get_team_data(matchup.away_team) or matchup.away_team
         return box_data
 
     def power_rankings(self, week: int=None):
@@ -329,10 +447,11 @@ class League(BaseLeague):
         teams_sorted = sorted(self.teams, key=lambda x: x.team_id,
                               reverse=False)
 
+        positions = self._team_index()
         for team in teams_sorted:
             wins = [0]*len(teams_sorted)
             for mov, opponent in zip(team.mov[:week], team.schedule[:week]):
-                opp = teams_sorted.index(opponent)
+                opp = positions[opponent.team_id]
                 if mov > 0:
                     wins[opp] += 1
             win_matrix.append(wins)
@@ -343,7 +462,35 @@ class League(BaseLeague):
     def free_agents(self, week: int=None, size: int=10, position: str=None, position_id: int=None) -> List[Player]:
         '''Returns a List of Free Agents for a Given Week\n
         Should only be used with most recent season'''
+        week, params, headers = self._free_agents_request(week, size, position, position_id)
+
+        data = self.espn_request.league_get(params=params, headers=headers)
+
+        players = data['players']
+        pro_schedule = self._get_pro_schedule(week)
+        positional_rankings = self._get_positional_ratings(week)
+
+        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in players]
+
+    async def free_agents_async(self, week: int=None, size: int=10, position: str=None, position_id: int=None) -> List[Player]:
+        '''Async counterpart of free_agents'''
+        week, params, headers = self._free_agents_request(week, size, position, position_id)
+
+        espn_request = self._get_async_request()
+        data, pro_schedule, ratings = await asyncio.gather(
+            espn_request.league_get(params=params, headers=headers),
+            espn_request.get_pro_schedule(),
+            espn_request.league_get(params=self._positional_ratings_params(week)),
+        )
+
+        players = data['players']
+        pro_schedule = self._parse_pro_schedule(pro_schedule, week)
+        positional_rankings = self._parse_positional_ratings(ratings)
 
+        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in players]
+
+    def _free_agents_request(self, week: int, size: int, position: str, position_id: int):
+        '''Returns the week, params and headers for a free agents request'''
         if self.year < 2019:
             raise Exception('Cant use free agents before 2019')
         if not week:
@@ -362,27 +509,41 @@ class League(BaseLeague):
         }
         filters = {"players":{"filterStatus":{"value":["FREEAGENT","WAIVERS"]},"filterSlotIds":{"value":slot_filter},"limit":size,"sortPercOwned":{"sortPriority":1,"sortAsc":False},"sortDraftRanks":{"sortPriority":100,"sortAsc":True,"value":"STANDARD"}}}
         headers = {'x-fantasy-filter': json.dumps(filters)}
+        return week, params, headers
 
-        data = self.espn_request.league_get(params=params, headers=headers)
+    def player_info(self, name: str = None, playerId: Union[int, list] = None) -> Union[Player, List[Player]]:
+        ''' Returns Player class if name found '''
+        playerIds = self._player_info_ids(name, playerId)
+        if playerIds is None:
+            return None
 
-        players = data['players']
-        pro_schedule = self._get_pro_schedule(week)
-        positional_rankings = self._get_positional_ratings(week)
+        data = self.espn_request.get_player_card(playerIds, self.finalScoringPeriod)
+        pro_schedule = self._get_all_pro_schedule()
+        return self._build_player_info(data, pro_schedule)
 
-        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in players]
+    async def player_info_async(self, name: str = None, playerId: Union[int, list] = None) -> Union[Player, List[Player]]:
+        '''Async counterpart of player_info'''
+        playerIds = self._player_info_ids(name, playerId)
+        if playerIds is None:
+            return None
 
-    def player_info(self, name: str = None, playerId: Union[int, list] = None) -> Union[Player, List[Player]]:
-        ''' Returns Player class if name found '''
+        espn_request = self._get_async_request()
+        data, pro_schedule = await asyncio.gather(
+            espn_request.get_player_card(playerIds, self.finalScoringPeriod),
+            espn_request.get_pro_schedule(),
+        )
+        return self._build_player_info(data, self._parse_all_pro_schedule(pro_schedule))
 
+    def _player_info_ids(self, name: str = None, playerId: Union[int, list] = None) -> List[int]:
         if name:
             playerId = self.player_map.get(name)
         if playerId is None or isinstance(playerId, str):
             return None
         if not isinstance(playerId, list):
             playerId = [playerId]
+        return playerId
 
-        data = self.espn_request.get_player_card(playerId, self.finalScoringPeriod)
-        pro_schedule = self._get_all_pro_schedule()
+    def _build_player_info(self, data, pro_schedule) -> Union[Player, List[Player]]:
         if len(data['players']) == 1:
             return Player(data['players'][0], self.year, pro_schedule)
         if len(data['players']) > 1:
@@ -402,6 +563,19 @@ class League(BaseLeague):
 
     def transactions(self, scoring_period: int = None, types: Set[str] = {"FREEAGENT","WAIVER","WAIVER_ERROR"}) -> List[Transaction]:
         '''Returns a list of recent transactions'''
+        params, headers = self._transactions_request(scoring_period, types)
+
+        data = self.espn_request.league_get(params=params, headers=headers)
+        return self._build_transactions(data)
+
+    async def transactions_async(self, scoring_period: int = None, types: Set[str] = {"FREEAGENT","WAIVER","WAIVER_ERROR"}) -> List[Transaction]:
+        '''Async counterpart of transactions'''
+        params, headers = self._transactions_request(scoring_period, types)
+
+        data = await self._get_async_request().league_get(params=params, headers=headers)
+        return self._build_transactions(data)
+
+    def _transactions_request(self, scoring_period: int, types: Set[str]):
         if not scoring_period:
             scoring_period = self.scoringPeriodId
 
@@ -415,8 +589,9 @@ class League(BaseLeague):
 
         filters = {"transactions":{"filterType":{"value":list(types)}}}
         headers = {'x-fantasy-filter': json.dumps(filters)}
+        return params, headers
 
-        data = self.espn_request.league_get(params=params, headers=headers)
+    def _build_transactions(self, data) -> List[Transaction]:
         if 'transactions' not in data:
             raise Exception('No transactions found')
         transactions = data['transactions']
@@ -10,12 +10,14 @@ class Player(object):
         self.posRank = json_parsing(data, 'positionalRanking')
         self.eligibleSlots = [POSITION_MAP[pos] for pos in json_parsing(data, 'eligibleSlots')]
         self.acquisitionType = json_parsing(data, 'acquisitionType')
-        self.proTeam = PRO_TEAM_MAP[json_parsing(data, 'proTeamId')]
+        self._pro_team_id = json_parsing(data, 'proTeamId')
+        self.proTeam = PRO_TEAM_MAP[self._pro_team_id]
         self.injuryStatus = json_parsing(data, 'injuryStatus')
         self.onTeamId = json_parsing(data, 'onTeamId')
         self.lineupSlot = POSITION_MAP.get(data.get('lineupSlotId'), '')
         self.stats = {}
-        self.schedule = {}
+        self._schedule = None
+        self._pro_team_schedule = pro_team_schedule
 
         # Get players main position
         for pos in json_parsing(data, 'eligibleSlots'):
@@ -23,14 +25,6 @@ class Player(object):
                 self.position = POSITION_MAP[pos]
                 break
 
-        if pro_team_schedule:
-            pro_team_id = json_parsing(data, 'proTeamId')
-            pro_team = pro_team_schedule.get(pro_team_id, {})
-            for key in pro_team:
-                game = pro_team[key][0]
-                team = game['awayProTeamId'] if game['awayProTeamId'] != pro_team_id else game['homeProTeamId']
-                self.schedule[key] = { 'team': PRO_TEAM_MAP[team], 'date': datetime.fromtimestamp(game['date']/1000.0) }
-
         # set each scoring period stat
         player = data['playerPoolEntry']['player'] if 'playerPoolEntry' in data else data['player']
         self.injuryStatus = player.get('injuryStatus', self.injuryStatus)
@@ -66,5 +60,28 @@ class Player(object):
         self.avg_points = self.stats.get(0, {}).get('avg_points', 0)
         self.projected_avg_points = self.stats.get(0, {}).get('projected_avg_points', 0)
 
+    @property
+    def schedule(self) -> dict:
+        '''Games of the player's pro team by scoring period, built on first access.
+        The pro schedule may be given as a function, so it is only fetched if needed'''
+        if self._schedule is None:
+            pro_team_schedule = self._pro_team_schedule
+            if callable(pro_team_schedule):
+                pro_team_schedule = pro_team_schedule()
+            self._schedule = {}
+            if pro_team_schedule:
+                pro_team_id = self._pro_team_id
+                pro_team = pro_team_schedule.get(pro_team_id, {})
+                for key in pro_team:
+                    game = pro_team[key][0]
+                    team = game['awayProTeamId'] if game['awayProTeamId'] != pro_team_id else game['homeProTeamId']
+                    self._schedule[key] = { 'team': PRO_TEAM_MAP[team], 'date': datetime.fromtimestamp(game['date']/1000.0) }
+            self._pro_team_schedule = None
+        return self._schedule
+
+    @schedule.setter
+    def schedule(self, value: dict):
+        self._schedule = value
+
     def __repr__(self):
         return f'Player({self.name})'
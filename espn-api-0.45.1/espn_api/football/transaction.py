@@ -17,7 +17,10 @@ class Transaction(object):
 class TransactionItem(object):
     def __init__(self, data, player_map):
         self.type = data['type']
-        self.player = player_map[data['playerId']]
+        self.playerId = data['playerId']
+        self.player = player_map.get(self.playerId, '')
+        self.from_team_id = data.get('fromTeamId', -1)
+        self.to_team_id = data.get('toTeamId', -1)
 
     def __repr__(self):
         return f'{self.type} {self.player}'
\ No newline at end of file
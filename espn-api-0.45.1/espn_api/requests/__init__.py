@@ -1,3 +1,6 @@
-__all__ = ['EspnFantasyRequests']
+__all__ = ['EspnFantasyRequests', 'AsyncEspnFantasyRequests', 'ResponseCache', 'TrafficArchive']
 
-from .espn_requests import EspnFantasyRequests
\ No newline at end of file
+from .espn_requests import EspnFantasyRequests
+from .async_espn_requests import AsyncEspnFantasyRequests
+from .response_cache import ResponseCache
+from .archive import TrafficArchive
@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from .response_cache import params_key
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class ArchiveMiss(Exception):
+    pass
+
+
+class TrafficArchive(object):
+    '''ESPN responses recorded to, or replayed from, a gzipped JSON lines file.
+
+    In record mode every response fetched from ESPN is appended to the file
+    with its URL, params and x-fantasy-filter header. In replay mode those
+    responses are served instead of calling ESPN, and a request that was never
+    recorded raises ArchiveMiss. Cookies are never written to the archive.
+    '''
+    def __init__(self, path: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f'Unknown archive mode: {mode}, use {RECORD} or {REPLAY}')
+        self.path = path
+        self.mode = mode
+        self._responses: Dict[Hashable, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f'TrafficArchive({self.path}, {self.mode})'
+
+    def __len__(self):
+        return len(self._responses)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None, headers: dict = None) -> Hashable:
+        return endpoint, params_key(params), (headers or {}).get('x-fantasy-filter')
+
+    def _load(self):
+        # a request recorded more than once replays its latest response
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                params = tuple((name, tuple(value) if isinstance(value, list) else value)
+                               for name, value in entry['params'])
+                key = (entry['url'], params, entry['filter'])
+                self._responses[key] = (entry['status'], entry['body'].encode('utf-8'))
+
+    def replay(self, endpoint: str, params: dict = None, headers: dict = None) -> Tuple[int, bytes]:
+        '''The recorded (status, body) for the request'''
+        response = self._responses.get(self.key(endpoint, params, headers))
+        if response is None:
+            raise ArchiveMiss(f'No recorded response for {endpoint} params: {params} headers: {headers}')
+        return response
+
+    def record(self, endpoint: str, params: dict, headers: dict, status: int, body: bytes):
+        key = self.key(endpoint, params, headers)
+        line = json.dumps({
+            'url': key[0],
+            'params': key[1],
+            'filter': key[2],
+            'status': status,
+            'body': body.decode('utf-8'),
+        }, separators=(',', ':'))
+        with self._lock:
+            self._responses[key] = (status, body)
+            # every write appends a gzip member, so an interrupted run keeps what it recorded
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+_default_archives: Dict[Tuple[str, str], TrafficArchive] = {}
+_default_archives_lock = threading.Lock()
+
+
+def default_archive() -> Optional[TrafficArchive]:
+    '''Archive named by ESPN_ARCHIVE_PATH, in the ESPN_ARCHIVE_MODE mode (replay unless set to record).
+    Every request object using the same path and mode shares one instance'''
+    path = os.environ.get('ESPN_ARCHIVE_PATH')
+    if not path:
+        return None
+    key = (path, os.environ.get('ESPN_ARCHIVE_MODE', REPLAY))
+    with _default_archives_lock:
+        if key not in _default_archives:
+            _default_archives[key] = TrafficArchive(*key)
+        return _default_archives[key]
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Iterator, Optional
+
+from .espn_requests import EspnFantasyRequests
+from .archive import TrafficArchive
+from .response_cache import ResponseCache
+from .throttle import HostThrottle
+from ..utils.json_stream import iter_json_array, iter_text
+from ..utils.logger import Logger
+from ..utils.metrics import record_upstream_request, request_view
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_TIMEOUT = 10.0
+
+
+class AsyncEspnFantasyRequests(EspnFantasyRequests):
+    '''asyncio counterpart of EspnFantasyRequests backed by a pooled httpx.AsyncClient.
+
+    league_get, get and news_get are coroutines here, so the endpoint helpers
+    inherited from EspnFantasyRequests (get_league, get_pro_players, ...) return
+    awaitables. Every upstream call holds the semaphore, which bounds how many
+    ESPN requests are in flight; pass the same client and semaphore to several
+    instances to share the connection pool and the limit between them.
+    '''
+    def __init__(self, sport: str, year: int, league_id: int, cookies: dict = None, logger: Logger = None,
+                 client: 'httpx.AsyncClient' = None, semaphore: asyncio.Semaphore = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, cache: ResponseCache = None,
+                 archive: TrafficArchive = None, throttle: HostThrottle = None):
+        if httpx is None:
+            raise ImportError('AsyncEspnFantasyRequests requires httpx, install it with pip install espn_api[async]')
+        super().__init__(sport=sport, year=year, league_id=league_id, cookies=cookies, logger=logger, cache=cache,
+                         archive=archive, throttle=throttle)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self):
+        '''Closes the HTTP client if this instance created it'''
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _cookie_header(self, headers: Optional[dict]) -> Optional[dict]:
+        if not self.cookies:
+            return headers
+        headers = dict(headers or {})
+        headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        return headers
+
+    def _response(self, endpoint: str, status: int, body: bytes) -> 'httpx.Response':
+        return httpx.Response(status, content=body, request=httpx.Request('GET', endpoint))
+
+    async def _fetch(self, endpoint: str, params: dict, headers: dict, view: str) -> 'httpx.Response':
+        async with self.semaphore:
+            # timed inside the semaphore so waiting for a slot isn't counted as ESPN latency
+            start = time.perf_counter()
+            status = 'error'
+            try:
+                r = await self.client.get(endpoint, params=params, headers=self._cookie_header(headers))
+                status = r.status_code
+                return r
+            finally:
+                record_upstream_request(view, status, time.perf_counter() - start)
+
+    async def _get(self, endpoint: str, params: dict = None, headers: dict = None, view: str = '/') -> 'httpx.Response':
+        key, ttl, r = self._local_response(endpoint, params, headers, view)
+        if r is not None:
+            return r
+
+        throttle = self._throttle(endpoint)
+        attempt = 0
+        while True:
+            wait = self._wait(throttle)
+            if wait is None:
+                return self._stale_response(endpoint, key, view)
+            # the rate limit is waited out before taking a slot in the semaphore
+            await asyncio.sleep(wait)
+            try:
+                r = await self._fetch(endpoint, params, headers, view)
+            except httpx.TransportError as e:
+                self._failed(throttle, None)
+                return self._stale_response(endpoint, key, view, error=e)
+            delay = self._retry_delay(throttle, attempt, view, r)
+            if delay is None:
+                return self._final_response(endpoint, params, headers, view, key, ttl, r)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def league_get(self, params: dict = None, headers: dict = None, extend: str = ''):
+        league_endpoint = self.LEAGUE_ENDPOINT
+        view = request_view(params, extend)
+        r = await self._get(league_endpoint + extend, params=params, headers=headers, view=view)
+        if r.status_code == 401:
+            # concurrent requests can all see the 401, only the first one switches
+            if self.LEAGUE_ENDPOINT == league_endpoint:
+                self._switch_league_endpoint()
+            r = await self._get(self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, view=view)
+            if r.status_code != 200:
+                raise self._access_denied()
+        else:
+            self._raise_for_status(r.status_code)
+
+        response = r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, response=response)
+
+        return response[0] if isinstance(response, list) else response
+
+    async def get(self, params: dict = None, headers: dict = None, extend: str = ''):
+        endpoint = self.ENDPOINT + extend
+        r = await self._get(endpoint, params=params, headers=headers, view=request_view(params, extend))
+        self._raise_for_status(r.status_code)
+
+        response = r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=response)
+        return response
+
+    async def iter_pro_players(self) -> Iterator[dict]:
+        '''Awaits the players_wl response, then returns an iterator decoding the players one at a time'''
+        params, headers = self._pro_players_request()
+        endpoint = self.ENDPOINT + '/players'
+        r = await self._get(endpoint, params=params, headers=headers, view='players_wl')
+        self._raise_for_status(r.status_code)
+
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=f'{len(r.content)} bytes')
+        return iter_json_array(iter_text(r.content))
+
+    async def news_get(self, params: dict = None, headers: dict = None, extend: str = ''):
+        endpoint = self.NEWS_ENDPOINT + extend
+        r = await self._get(endpoint, params=params, headers=headers, view='news' + extend)
+
+        response = r.json()
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=response)
+        return response
@@ -1,9 +1,13 @@
-FANTASY_BASE_ENDPOINT = 'https://lm-api-reads.fantasy.espn.com/apis/v3/games/'
-NEWS_BASE_ENDPOINT = 'https://site.api.espn.com/apis/fantasy/v3/games/'
+import os
+
+# the ESPN_*_BASE_ENDPOINT variables point the library at a stand-in server, e.g. loadtest/fake_espn.py
+FANTASY_BASE_ENDPOINT = os.environ.get('ESPN_FANTASY_BASE_ENDPOINT', 'https://lm-api-reads.fantasy.espn.com/apis/v3/games/')
+NEWS_BASE_ENDPOINT = os.environ.get('ESPN_NEWS_BASE_ENDPOINT', 'https://site.api.espn.com/apis/fantasy/v3/games/')
+CORE_BASE_ENDPOINT = os.environ.get('ESPN_CORE_BASE_ENDPOINT', 'https://sports.core.api.espn.com/v2/sports/')
 FANTASY_SPORTS = {
     'nfl' : 'ffl',
     'nba' : 'fba',
     'nhl' : 'fhl',
     'mlb' : 'flb',
     'wnba' : 'wfba'
-}
\ No newline at end of file
+}
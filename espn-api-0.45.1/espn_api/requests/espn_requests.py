@@ -1,8 +1,18 @@
 import requests
 import json
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .constant import FANTASY_BASE_ENDPOINT, NEWS_BASE_ENDPOINT, FANTASY_SPORTS
+from .archive import TrafficArchive, default_archive
+from .response_cache import ResponseCache
+from .throttle import RETRY_STATUSES, HostThrottle, get_throttle
+from ..utils.json_stream import iter_json_array, iter_text
 from ..utils.logger import Logger
-from typing import List
+from ..utils.metrics import ESPN_RETRIES, ESPN_STALE_RESPONSES, record_upstream_request, request_view
+from typing import Iterator, List, Optional
 
 
 class ESPNAccessDenied(Exception):
@@ -17,8 +27,49 @@ class ESPNUnknownError(Exception):
     pass
 
 
+class ESPNUnavailable(ESPNUnknownError):
+    pass
+
+
+# (connect, read) seconds; ESPN can take a while to build the larger views
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                   backoff_factor: float = DEFAULT_BACKOFF_FACTOR) -> requests.Session:
+    '''Session keeping up to pool_size connections alive per host, retrying GETs that fail
+    to connect up to retries times with exponential backoff. Error statuses are retried by
+    the host's HostThrottle instead'''
+    session = requests.Session()
+    retry = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=backoff_factor,
+                  allowed_methods=frozenset(['GET']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # leagues sharing a session pass their own cookies on each request, so keep none from responses
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_default_session() -> requests.Session:
+    '''The session shared by every EspnFantasyRequests not given its own'''
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
+
+
 class EspnFantasyRequests(object):
-    def __init__(self, sport: str, year: int, league_id: int, cookies: dict = None, logger: Logger = None):
+    def __init__(self, sport: str, year: int, league_id: int, cookies: dict = None, logger: Logger = None,
+                 session: requests.Session = None, timeout=DEFAULT_TIMEOUT, cache: ResponseCache = None,
+                 archive: TrafficArchive = None, throttle: HostThrottle = None):
         if sport not in FANTASY_SPORTS:
             raise Exception(f'Unknown sport: {sport}, available options are {FANTASY_SPORTS.keys()}')
         self.year = year
@@ -27,6 +78,16 @@ class EspnFantasyRequests(object):
         self.NEWS_ENDPOINT = NEWS_BASE_ENDPOINT + FANTASY_SPORTS[sport] + '/news/' + 'players'
         self.cookies = cookies
         self.logger = logger
+        # None uses the default session, created on the first request that needs it
+        self.session = session
+        self.timeout = timeout
+        # without a cache of their own, requests only keep the views with a ttl, not every
+        # response for the stale fallback
+        self.cache = cache if cache is not None else ResponseCache(keep_stale=False)
+        self.archive = archive if archive is not None else default_archive()
+        # None shares one throttle per host with every other request object
+        self.throttle = throttle
+        self._endpoint_lock = threading.Lock()
 
         self.LEAGUE_ENDPOINT = FANTASY_BASE_ENDPOINT + FANTASY_SPORTS[sport]
         # older season data is stored at a different endpoint
@@ -35,41 +96,176 @@ class EspnFantasyRequests(object):
         else:
             self.LEAGUE_ENDPOINT += "/seasons/" + str(year) + "/segments/0/leagues/" + str(league_id)
 
-    def checkRequestStatus(self, status: int, extend: str = "", params: dict = None, headers: dict = None) -> dict:
-        '''Handles ESPN API response status codes and endpoint format switching'''
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = get_default_session()
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self._session = session
+
+    def checkRequestStatus(self, status: int, extend: str = "", params: dict = None, headers: dict = None,
+                           league_endpoint: str = None) -> dict:
+        '''Handles ESPN API response status codes and endpoint format switching.
+        league_endpoint is the LEAGUE_ENDPOINT the request was sent to'''
         if status == 401:
-            # If the current LEAGUE_ENDPOINT was using the /leagueHistory/ endpoint, switch to "/seasons/" endpoint
-            if "/leagueHistory/" in self.LEAGUE_ENDPOINT:
-                base_endpoint = self.LEAGUE_ENDPOINT.split("/leagueHistory/")[0]
-                self.LEAGUE_ENDPOINT = f"{base_endpoint}/seasons/{self.year}/segments/0/leagues/{self.league_id}"
-            else:
-                # If the current LEAGUE_ENDPOINT was using /seasons, switch to the "/leagueHistory/" endpoint
-                base_endpoint = self.LEAGUE_ENDPOINT.split(f"/seasons/")[0]
-                self.LEAGUE_ENDPOINT = f"{base_endpoint}/leagueHistory/{self.league_id}?seasonId={self.year}"
+            with self._endpoint_lock:
+                # requests on other threads can all see the 401, only the first one switches
+                if league_endpoint is None or self.LEAGUE_ENDPOINT == league_endpoint:
+                    self._switch_league_endpoint()
 
             #try the alternate endpoint
-            r = requests.get(self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, cookies=self.cookies)
+            r = self._get(self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, view=request_view(params, extend))
             
             if r.status_code == 200:
                 # Return the updated response if alternate works
                 return r.json()
                 
             # If all endpoints failed, raise the corresponding error
-            raise ESPNAccessDenied(f"League {self.league_id} cannot be accessed with espn_s2={self.cookies.get('espn_s2')} and swid={self.cookies.get('SWID')}")
+            raise self._access_denied()
+
+        self._raise_for_status(status)
+        
+        # If no issues with the status code, return None
+        return None
+
+    def _switch_league_endpoint(self):
+        '''Flips LEAGUE_ENDPOINT between the /seasons/ and /leagueHistory/ formats'''
+        # If the current LEAGUE_ENDPOINT was using the /leagueHistory/ endpoint, switch to "/seasons/" endpoint
+        if "/leagueHistory/" in self.LEAGUE_ENDPOINT:
+            base_endpoint = self.LEAGUE_ENDPOINT.split("/leagueHistory/")[0]
+            self.LEAGUE_ENDPOINT = f"{base_endpoint}/seasons/{self.year}/segments/0/leagues/{self.league_id}"
+        else:
+            # If the current LEAGUE_ENDPOINT was using /seasons, switch to the "/leagueHistory/" endpoint
+            base_endpoint = self.LEAGUE_ENDPOINT.split(f"/seasons/")[0]
+            self.LEAGUE_ENDPOINT = f"{base_endpoint}/leagueHistory/{self.league_id}?seasonId={self.year}"
+
+    def _access_denied(self) -> ESPNAccessDenied:
+        cookies = self.cookies or {}
+        return ESPNAccessDenied(f"League {self.league_id} cannot be accessed with espn_s2={cookies.get('espn_s2')} and swid={cookies.get('SWID')}")
 
-        elif status == 404:
+    def _raise_for_status(self, status: int):
+        if status == 404:
             raise ESPNInvalidLeague(f"League {self.league_id} does not exist")
 
         elif status != 200:
             raise ESPNUnknownError(f"ESPN returned an HTTP {status}")
-        
-        # If no issues with the status code, return None
-        return None
-        
+
+    def _throttle(self, endpoint: str) -> HostThrottle:
+        return self.throttle if self.throttle is not None else get_throttle(endpoint)
+
+    def _response(self, endpoint: str, status: int, body: bytes) -> requests.Response:
+        '''Response served from the cache or the archive instead of ESPN'''
+        r = requests.Response()
+        r.status_code = status
+        r.url = endpoint
+        r.encoding = 'utf-8'
+        r._content = body
+        return r
+
+    def _failed(self, throttle: HostThrottle, r) -> bool:
+        '''Reports an attempt to the circuit breaker; True if it failed (no response, 429 or 5xx)'''
+        if r is not None and r.status_code not in RETRY_STATUSES:
+            throttle.breaker.record_success()
+            return False
+        throttle.breaker.record_failure()
+        return True
+
+    def _local_response(self, endpoint: str, params: dict, headers: dict, view: str):
+        '''The cache key and ttl for a request, and its response if the cache or a replaying
+        archive has one so ESPN needn't be called'''
+        key = self.cache.key(endpoint, params, headers, self.cookies)
+        ttl = self.cache.ttl(view)
+        body = self.cache.get(key) if ttl > 0 else None
+        if body is not None:
+            return key, ttl, self._response(endpoint, 200, body)
+        if self.archive is not None and self.archive.replaying:
+            return key, ttl, self._response(endpoint, *self.archive.replay(endpoint, params, headers))
+        return key, ttl, None
+
+    def _wait(self, throttle: HostThrottle) -> Optional[float]:
+        '''Seconds to wait for the host's rate limit before the next attempt, or None while its circuit is open'''
+        if not throttle.breaker.allow():
+            return None
+        return throttle.bucket.reserve()
+
+    def _retry_delay(self, throttle: HostThrottle, attempt: int, view: str, r) -> Optional[float]:
+        '''Seconds to wait before retrying the attempt that got r, or None if r is the final response'''
+        if not self._failed(throttle, r):
+            return None
+        delay = throttle.retry_delay(attempt, r.headers.get('Retry-After'))
+        if delay is not None:
+            ESPN_RETRIES.inc(view=view, status=r.status_code)
+        return delay
+
+    def _final_response(self, endpoint: str, params: dict, headers: dict, view: str, key, ttl: float, r):
+        '''Archives and caches the final response from ESPN, or falls back to a stale one if it failed'''
+        if r.status_code in RETRY_STATUSES:
+            return self._stale_response(endpoint, key, view, r)
+        if self.archive is not None and self.archive.recording:
+            self.archive.record(endpoint, params, headers, r.status_code, r.content)
+        if r.status_code == 200:
+            self.cache.set(key, r.content, ttl)
+        return r
+
+    def _stale_response(self, endpoint: str, key, view: str, r=None, error: Exception = None):
+        '''The last good response for key once ESPN has failed, else the failure itself'''
+        body = self.cache.get_stale(key)
+        if body is not None:
+            ESPN_STALE_RESPONSES.inc(view=view)
+            return self._response(endpoint, 200, body)
+        if error is not None:
+            raise error
+        if r is not None:
+            return r
+        raise ESPNUnavailable(f"ESPN calls to {endpoint} are paused after repeated failures")
+
+    def _fetch(self, endpoint: str, params: dict, headers: dict, view: str) -> requests.Response:
+        '''One GET to ESPN, recording its status and duration under view'''
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            r = self.session.get(endpoint, params=params, headers=headers, cookies=self.cookies, timeout=self.timeout)
+            status = r.status_code
+            return r
+        finally:
+            record_upstream_request(view, status, time.perf_counter() - start)
+
+    def _get(self, endpoint: str, params: dict = None, headers: dict = None, view: str = '/') -> requests.Response:
+        '''GETs endpoint within the host's rate limit, retrying 429s and 5xxs with backoff.
+        Responses for views with a ttl are served from the response cache while fresh, and the
+        last good response is served while the host's circuit is open or the retries run out.
+        A replaying archive serves every response'''
+        key, ttl, r = self._local_response(endpoint, params, headers, view)
+        if r is not None:
+            return r
+
+        throttle = self._throttle(endpoint)
+        attempt = 0
+        while True:
+            wait = self._wait(throttle)
+            if wait is None:
+                return self._stale_response(endpoint, key, view)
+            time.sleep(wait)
+            try:
+                r = self._fetch(endpoint, params, headers, view)
+            except requests.RequestException as e:
+                self._failed(throttle, None)
+                return self._stale_response(endpoint, key, view, error=e)
+            delay = self._retry_delay(throttle, attempt, view, r)
+            if delay is None:
+                return self._final_response(endpoint, params, headers, view, key, ttl, r)
+            time.sleep(delay)
+            attempt += 1
+
     def league_get(self, params: dict = None, headers: dict = None, extend: str = ''):
-        endpoint = self.LEAGUE_ENDPOINT + extend
-        r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
-        alternate_response = self.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers)
+        league_endpoint = self.LEAGUE_ENDPOINT
+        endpoint = league_endpoint + extend
+        r = self._get(endpoint, params=params, headers=headers, view=request_view(params, extend))
+        alternate_response = self.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers,
+                                                     league_endpoint=league_endpoint)
 
         
         response = alternate_response if alternate_response else r.json()
@@ -81,7 +277,7 @@ class EspnFantasyRequests(object):
 
     def get(self, params: dict = None, headers: dict = None, extend: str = ''):
         endpoint = self.ENDPOINT + extend
-        r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
+        r = self._get(endpoint, params=params, headers=headers, view=request_view(params, extend))
         self.checkRequestStatus(r.status_code)
 
         if self.logger:
@@ -90,7 +286,7 @@ class EspnFantasyRequests(object):
         
     def news_get(self, params: dict = None, headers: dict = None, extend: str = ''):
         endpoint = self.NEWS_ENDPOINT + extend
-        r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
+        r = self._get(endpoint, params=params, headers=headers, view='news' + extend)
 
         if self.logger:
             self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=r.json())
@@ -112,16 +308,32 @@ class EspnFantasyRequests(object):
         data = self.get(params=params)
         return data
 
-    def get_pro_players(self):
-        '''Gets the current sports professional players'''
+    def _pro_players_request(self):
         params = {
             'view': 'players_wl'
         }
         filters = {"filterActive": {"value": True}}
         headers = {'x-fantasy-filter': json.dumps(filters)}
+        return params, headers
+
+    def get_pro_players(self):
+        '''Gets the current sports professional players'''
+        params, headers = self._pro_players_request()
         data = self.get(extend='/players', params=params, headers=headers)
         return data
 
+    def iter_pro_players(self) -> Iterator[dict]:
+        '''Gets the current sports professional players, decoding them one at a time as they
+        are iterated instead of building the whole list'''
+        params, headers = self._pro_players_request()
+        endpoint = self.ENDPOINT + '/players'
+        r = self._get(endpoint, params=params, headers=headers, view='players_wl')
+        self.checkRequestStatus(r.status_code)
+
+        if self.logger:
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=f'{len(r.content)} bytes')
+        return iter_json_array(iter_text(r.content))
+
     def get_league_draft(self):
         '''Gets the leagues draft'''
         params = {
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+# seconds a response stays fresh, by view; a call with several views gets the shortest
+DEFAULT_VIEW_TTLS = {
+    'proTeamSchedules_wl': 6 * 60 * 60,
+    'players_wl': 6 * 60 * 60,
+    'mPositionalRatings': 6 * 60 * 60,
+    'mMatchupScore': 10,
+    'mScoreboard': 10,
+}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def params_key(params: dict = None) -> tuple:
+    '''Query params in a hashable form that doesn't depend on their order or value types'''
+    return tuple(sorted((name, tuple(value) if isinstance(value, (list, tuple)) else str(value))
+                        for name, value in (params or {}).items()))
+
+
+class ResponseCache(object):
+    '''LRU cache of ESPN response bodies bounded by their total size in bytes.
+
+    Entries are keyed by endpoint, query params, x-fantasy-filter header and
+    cookies, so one cache can be shared between leagues with different
+    credentials. How long a response is fresh depends on its view: views
+    missing from ttls use default_ttl, and a ttl of 0 means the view is never
+    served fresh from the cache. Expired entries stay until they are evicted,
+    so get_stale can serve them while ESPN is failing. With keep_stale False
+    responses with a ttl of 0 aren't stored at all, so only the cached views
+    have a last good response to fall back on.
+    '''
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttls: Dict[str, float] = None, default_ttl: float = 0,
+                 keep_stale: bool = True):
+        self.max_bytes = max_bytes
+        self.keep_stale = keep_stale
+        self.ttls = dict(DEFAULT_VIEW_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (expires_at, body)
+        self._entries: 'OrderedDict[Hashable, Tuple[float, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, view: str) -> float:
+        '''Seconds to keep a response for view, a comma separated list of views'''
+        return min(self.ttls.get(name, self.default_ttl) for name in view.split(','))
+
+    def key(self, endpoint: str, params: dict = None, headers: dict = None, cookies: dict = None) -> Hashable:
+        fantasy_filter = (headers or {}).get('x-fantasy-filter')
+        return endpoint, params_key(params), fantasy_filter, tuple(sorted((cookies or {}).items()))
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        '''The cached body for key, or None if there is none or it has expired'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, key: Hashable) -> Optional[bytes]:
+        '''The last body stored for key, expired or not'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, body: bytes, ttl: float):
+        '''Stores body, fresh for ttl seconds, evicting the least recently used entries to stay within max_bytes'''
+        if len(body) > self.max_bytes or (ttl <= 0 and not self.keep_stale):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, body)
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        _, body = self._entries.pop(key)
+        self.bytes -= len(body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+        }
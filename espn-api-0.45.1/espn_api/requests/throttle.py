@@ -0,0 +1,132 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# requests per second and burst allowed to each ESPN host, across every request object in the process
+DEFAULT_RATE = float(os.environ.get('ESPN_RATE_LIMIT', 10))
+DEFAULT_BURST = int(os.environ.get('ESPN_RATE_BURST', 20))
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class TokenBucket(object):
+    '''Allows rate calls per second on average and up to burst at once.
+
+    reserve() takes a token and returns how long the caller must wait before
+    using it, so sync callers can time.sleep and async ones asyncio.sleep.
+    Tokens can go negative, which queues callers in the order they reserved.
+    '''
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class CircuitBreaker(object):
+    '''Stops calls to a host after failure_threshold failures in a row.
+
+    While open, allow() is False for reset_timeout seconds. Then one call is
+    let through: its success closes the breaker, its failure opens it again.
+    '''
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class HostThrottle(object):
+    '''Rate limit, retry policy and circuit breaker for the calls to one host'''
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, retries: int = 3,
+                 backoff_factor: float = 0.5, max_backoff: float = 30, failure_threshold: int = 5,
+                 reset_timeout: float = 30):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        '''Seconds to wait before retrying after the given failed attempt (0 based),
+        or None if the request should not be retried'''
+        if attempt >= self.retries:
+            return None
+        if retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_backoff else None
+        # full jitter keeps callers that failed together from retrying together
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    '''Seconds from a Retry-After header, given either as seconds or as an HTTP date'''
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_throttles: Dict[str, HostThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(url: str) -> HostThrottle:
+    '''The throttle shared by every request to url's host'''
+    host = urlparse(url).netloc
+    with _throttles_lock:
+        if host not in _throttles:
+            _throttles[host] = HostThrottle()
+        return _throttles[host]
+
+
+def set_throttle(url: str, throttle: HostThrottle):
+    '''Replaces the throttle for url's host, e.g. to change its rate'''
+    with _throttles_lock:
+        _throttles[urlparse(url).netloc] = throttle
@@ -0,0 +1,57 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def iter_text(body: bytes, chunk_size: int = CHUNK_SIZE, encoding: str = 'utf-8') -> Iterator[str]:
+    '''Decodes body chunk by chunk, without a str copy of the whole of it'''
+    decoder = codecs.getincrementaldecoder(encoding)()
+    view = memoryview(body)
+    for start in range(0, len(view), chunk_size):
+        yield decoder.decode(view[start:start + chunk_size])
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    '''Yields the elements of a top-level JSON array one at a time as its text arrives.
+
+    Only the element being decoded and the unread rest of the current chunk
+    are held, so a large array of small objects never exists as one list.
+    '''
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    started = False
+    for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (started and buffer[pos] == ',')):
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError(f'Expected a JSON array, got {buffer[pos]!r}')
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the element continues in the next chunk
+                break
+            if not isinstance(element, (dict, list, str)) and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                # a number cut off by the chunk boundary decodes as a shorter one
+                break
+            yield element
+            pos = end
+    raise ValueError('JSON array ended before its closing bracket')
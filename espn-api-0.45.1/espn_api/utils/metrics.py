@@ -0,0 +1,164 @@
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(object):
+    '''Monotonic count per label combination'''
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(object):
+    '''Cumulative bucket counts, sum and count of observations per label combination'''
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [bucket counts..., sum, count]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return state[-1] if state else 0
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    samples.append((self.name + '_bucket', {**labels, 'le': _format_value(float(bound))}, cumulative))
+                samples.append((self.name + '_bucket', {**labels, 'le': '+Inf'}, state[-1]))
+                samples.append((self.name + '_sum', labels, state[-2]))
+                samples.append((self.name + '_count', labels, state[-1]))
+        return samples
+
+
+class Collector(object):
+    '''Metric whose samples are read from elsewhere when the registry is rendered'''
+    def __init__(self, name: str, documentation: str, type: str, collect: Callable[[], Iterable[Sample]]):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self._collect = collect
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [(self.name, labels, value) for labels, value in self._collect()]
+
+
+class MetricsRegistry(object):
+    '''Named metrics rendered together in the Prometheus text exposition format'''
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f'Metric {metric.name} is already registered as a {existing.type}')
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, name: str, documentation: str, type: str, collect: Callable[[], Iterable[Sample]]) -> Collector:
+        return self._register(Collector(name, documentation, type, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+ESPN_REQUESTS = REGISTRY.counter(
+    'espn_api_upstream_requests_total', 'ESPN API requests by view and HTTP status', ('view', 'status'))
+ESPN_REQUEST_SECONDS = REGISTRY.histogram(
+    'espn_api_upstream_request_duration_seconds', 'ESPN API request duration by view', ('view',))
+ESPN_RETRIES = REGISTRY.counter(
+    'espn_api_upstream_retries_total', 'ESPN API requests retried by view and the status that caused it', ('view', 'status'))
+ESPN_STALE_RESPONSES = REGISTRY.counter(
+    'espn_api_upstream_stale_responses_total', 'Stale cached responses served because ESPN failed, by view', ('view',))
+
+
+def request_view(params: dict = None, extend: str = '') -> str:
+    '''Label for an upstream call: its view parameter(s), else the path it extends the endpoint with'''
+    view = (params or {}).get('view')
+    if view:
+        return view if isinstance(view, str) else ','.join(view)
+    return extend or '/'
+
+
+def record_upstream_request(view: str, status: Any, seconds: float):
+    ESPN_REQUESTS.inc(view=view, status=status)
+    ESPN_REQUEST_SECONDS.observe(seconds, view=view)
@@ -0,0 +1,170 @@
+import bisect
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+_NOT_NAME = re.compile(r'[^a-z0-9 ]+')
+
+
+def normalize_name(name: str) -> str:
+    '''Lower case ASCII form of name that lookups match on.
+
+    Accents are dropped, hyphens split words and other punctuation joins
+    them, so "Amon-Ra St. Brown" is "amon ra st brown" and "D.J. Moore" is "dj moore".
+    '''
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(_NOT_NAME.sub('', name.replace('-', ' ')).split())
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    # padded so the start of each word counts for more than its middle
+    padded = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerRecord(NamedTuple):
+    id: int
+    name: str
+    position_id: Optional[int] = None
+    pro_team_id: Optional[int] = None
+
+
+class PlayerDirectory(object):
+    '''Pro players by id, with name indexes for exact, prefix and fuzzy lookups.
+
+    Players sharing a name are all kept: ids(name) returns every one of them.
+    For the callers of the two way player_map dict this replaces, an int key
+    still gives the player's name and a name gives the first id added for it.
+    '''
+    def __init__(self, players: Iterable[dict] = ()):
+        self._records: Dict[int, PlayerRecord] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        # (suffix of the normalized name starting at a word, id), sorted on first prefix lookup
+        self._prefixes: List[Tuple[str, int]] = []
+        self._prefixes_sorted = True
+        self._by_trigram: Dict[str, Set[int]] = {}
+        self._trigram_counts: Dict[int, int] = {}
+        self.load(players)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[PlayerRecord]:
+        return iter(self._records.values())
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        if isinstance(key, str):
+            return normalize_name(key) in self._by_name
+        return key in self._records
+
+    def __getitem__(self, key: Union[int, str]) -> Union[str, int]:
+        if isinstance(key, str):
+            return self._by_name[normalize_name(key)][0]
+        return self._records[key].name
+
+    def __repr__(self):
+        return f'PlayerDirectory({len(self)} players)'
+
+    def get(self, key: Union[int, str], default=None) -> Union[str, int, None]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def load(self, players: Iterable[dict]):
+        '''Adds players from a players_wl payload, or anything with an id and fullName per player'''
+        for player in players:
+            self.add(player['id'], player['fullName'], player.get('defaultPositionId'), player.get('proTeamId'))
+
+    def add(self, player_id: int, name: str, position_id: int = None, pro_team_id: int = None) -> PlayerRecord:
+        old = self._records.get(player_id)
+        record = PlayerRecord(player_id, name, position_id, pro_team_id)
+        self._records[player_id] = record
+        if old is not None:
+            if old.name == name:
+                return record
+            self._unindex(old)
+
+        normalized = normalize_name(name)
+        self._by_name.setdefault(normalized, []).append(player_id)
+        words = normalized.split(' ')
+        for i in range(len(words)):
+            self._prefixes.append((' '.join(words[i:]), player_id))
+        self._prefixes_sorted = False
+        trigrams = _trigrams(normalized)
+        for trigram in trigrams:
+            self._by_trigram.setdefault(trigram, set()).add(player_id)
+        self._trigram_counts[player_id] = len(trigrams)
+        return record
+
+    def _unindex(self, record: PlayerRecord):
+        '''Drops the name indexes of a player being renamed'''
+        normalized = normalize_name(record.name)
+        ids = self._by_name[normalized]
+        ids.remove(record.id)
+        if not ids:
+            del self._by_name[normalized]
+        self._prefixes = [entry for entry in self._prefixes if entry[1] != record.id]
+        for trigram in _trigrams(normalized):
+            self._by_trigram[trigram].discard(record.id)
+
+    def record(self, player_id: int) -> Optional[PlayerRecord]:
+        return self._records.get(player_id)
+
+    def ids(self, name: str) -> List[int]:
+        '''Ids of every player whose normalized name is name's'''
+        return list(self._by_name.get(normalize_name(name), []))
+
+    def prefix(self, query: str, limit: int = 10) -> List[PlayerRecord]:
+        '''Players with a word of their name, and the words after it, starting with query.
+
+        "hop" and "deandre hop" both find DeAndre Hopkins. Results are in name order.
+        '''
+        query = normalize_name(query)
+        if not query:
+            return []
+        if not self._prefixes_sorted:
+            self._prefixes.sort()
+            self._prefixes_sorted = True
+        found: Dict[int, PlayerRecord] = {}
+        for i in range(bisect.bisect_left(self._prefixes, (query,)), len(self._prefixes)):
+            key, player_id = self._prefixes[i]
+            if not key.startswith(query) or len(found) >= limit:
+                break
+            found.setdefault(player_id, self._records[player_id])
+        return list(found.values())
+
+    def fuzzy(self, query: str, limit: int = 10, min_score: float = 0.5) -> List[Tuple[PlayerRecord, float]]:
+        '''Players whose names share the most trigrams with query, best first, with their scores.
+
+        The score is the share of query's trigrams found in the name, so
+        misspelled and partial names still match; ties go to the name closest
+        in length to query.
+        '''
+        query = normalize_name(query)
+        if not query:
+            return []
+        query_trigrams = _trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._by_trigram.get(trigram, ()))
+        scored = []
+        for player_id, count in shared.items():
+            score = count / len(query_trigrams)
+            if score >= min_score:
+                similarity = count / (len(query_trigrams) + self._trigram_counts[player_id] - count)
+                scored.append((score, similarity, player_id))
+        scored.sort(key=lambda x: (-x[0], -x[1], x[2]))
+        return [(self._records[player_id], round(score, 3)) for score, _, player_id in scored[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> List[PlayerRecord]:
+        '''Exact name matches, then prefix matches, then fuzzy ones, without repeats'''
+        found: Dict[int, PlayerRecord] = {player_id: self._records[player_id] for player_id in self.ids(query)}
+        if len(found) < limit:
+            for record in self.prefix(query, limit):
+                found.setdefault(record.id, record)
+        if len(found) < limit:
+            for record, _ in self.fuzzy(query, limit):
+                found.setdefault(record.id, record)
+        return list(found.values())[:limit]
@@ -0,0 +1,87 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional, Tuple
+
+
+class SQLiteSharedCache(object):
+    '''Cache entries and refresh leases in a SQLite file shared by several processes.
+
+    The database runs in WAL mode so readers in every process proceed while one
+    writes. A lease on a key marks the process refreshing it; others read the
+    entry it writes instead of fetching the same data themselves. Leases expire
+    so a crashed holder only blocks a key for the lease's ttl.
+    '''
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # one connection per process, serialized since callers may use threads
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value BLOB NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def __repr__(self):
+        return f'SQLiteSharedCache({self.path})'
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        '''Returns (stored_at, value) for key, or None'''
+        with self._lock:
+            row = self._conn.execute('SELECT stored_at, value FROM entries WHERE key = ?', (key,)).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def stored_at(self, key: str) -> Optional[float]:
+        '''When key was last written, without reading its value'''
+        with self._lock:
+            row = self._conn.execute('SELECT stored_at FROM entries WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, stored_at: float = None):
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO entries (key, stored_at, value) VALUES (?, ?, ?)',
+                               (key, stored_at, value))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        '''Takes the lease on key for ttl seconds unless another owner holds an unexpired one'''
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute('SELECT owner, expires_at FROM leases WHERE key = ?', (key,)).fetchone()
+                if row and row[0] != self.owner and row[1] > now:
+                    self._conn.execute('ROLLBACK')
+                    return False
+                self._conn.execute('INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)',
+                                   (key, self.owner, now + ttl))
+                self._conn.execute('COMMIT')
+                return True
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def lease_held(self, key: str) -> bool:
+        '''Whether any owner holds an unexpired lease on key'''
+        with self._lock:
+            row = self._conn.execute('SELECT expires_at FROM leases WHERE key = ?', (key,)).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def release_lease(self, key: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, self.owner))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,215 @@
+import asyncio
+import functools
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .shared_cache import SQLiteSharedCache
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight(object):
+    '''Collapses concurrent calls with the same key into one in-flight call.
+
+    Every caller that asks for a key while a call for it is running awaits that
+    call's result instead of starting its own. A caller being cancelled does not
+    cancel the shared call for the others.
+    '''
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def _start(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._done, key))
+        return future
+
+    def _done(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # mark the exception retrieved when every waiter has gone away
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        '''Awaits fn(*args, **kwargs), sharing the call with concurrent callers of key'''
+        return await asyncio.shield(self._start(key, fn, *args, **kwargs))
+
+
+def single_flight(fn: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    '''Decorates a coroutine function so concurrent calls with equal arguments share one call'''
+    flight = SingleFlight()
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        return await flight.do(key, fn, *args, **kwargs)
+
+    wrapper.flight = flight
+    return wrapper
+
+
+class SWRCache(object):
+    '''TTL cache that serves expired entries while one background refresh runs.
+
+    A fresh entry is returned as is. An entry older than ttl but younger than
+    ttl + stale_ttl is returned immediately and a refresh is started if one
+    isn't already running. Misses, and entries past stale_ttl, wait for the
+    loader; concurrent misses for a key share a single load.
+
+    With a shared cache, processes using the same file share entries: an
+    expired local entry is first replaced by a newer one another process
+    stored, and only the process holding the key's lease runs the loader while
+    the others wait for its result. encode and decode convert values to and
+    from the bytes stored there.
+    '''
+    def __init__(self, name: str, ttl: float, stale_ttl: Optional[float] = None, shared: SQLiteSharedCache = None,
+                 encode: Callable[[Any], bytes] = None, decode: Callable[[bytes], Any] = None,
+                 lease_ttl: float = 30.0, poll_interval: float = 0.1):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self.encode = encode or (lambda value: json.dumps(value).encode())
+        self.decode = decode or json.loads
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.shared_hits = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+
+    def __repr__(self):
+        return f'SWRCache({self.name})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        '''Returns (stored_at, value) for key without loading or counting it'''
+        return self._entries.get(key)
+
+    def is_fresh(self, key: Hashable) -> bool:
+        '''Whether key holds an entry younger than ttl'''
+        entry = self._entries.get(key)
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def set(self, key: Hashable, value: Any, stored_at: float = None):
+        self._entries[key] = (time.time() if stored_at is None else stored_at, value)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key(key))
+
+    def _run_shared(self, fn: Callable, *args) -> Awaitable:
+        '''Runs a blocking shared cache call on the default executor'''
+        return asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f'{self.name}:{key!r}'
+
+    async def _adopt_shared(self, key: Hashable, entry: Optional[Tuple[float, Any]]) -> Optional[Tuple[float, Any]]:
+        '''Replaces entry with the shared one when another process stored a newer value'''
+        shared_key = self._shared_key(key)
+        stored_at = await self._run_shared(self.shared.stored_at, shared_key)
+        if stored_at is None or (entry is not None and stored_at <= entry[0]):
+            return entry
+        shared_entry = await self._run_shared(self.shared.get, shared_key)
+        if shared_entry is None:
+            return entry
+        self.set(key, self.decode(shared_entry[1]), stored_at=shared_entry[0])
+        return self._entries[key]
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        if self.shared is not None:
+            return await self._load_shared(key, loader)
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    async def _adopt_stored_since(self, key: Hashable, started: float) -> Optional[Tuple[float, Any]]:
+        '''The shared entry for key if another process stored it at or after started'''
+        stored_at = await self._run_shared(self.shared.stored_at, self._shared_key(key))
+        if stored_at is None or stored_at < started:
+            return None
+        entry = await self._adopt_shared(key, None)
+        if entry is not None:
+            self.shared_hits += 1
+        return entry
+
+    async def _load_shared(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        '''Loads key in the process holding its lease, the others wait for what it stores'''
+        shared_key = self._shared_key(key)
+        started = time.time()
+        deadline = started + self.lease_ttl
+        while not await self._run_shared(self.shared.acquire_lease, shared_key, self.lease_ttl):
+            await asyncio.sleep(self.poll_interval)
+            entry = await self._adopt_stored_since(key, started)
+            if entry is not None:
+                return entry[1]
+            if time.time() >= deadline:
+                # the holder is stuck, load without the lease
+                break
+
+        try:
+            # the previous holder may have stored and released between the check above and taking the lease
+            entry = await self._adopt_stored_since(key, started)
+            if entry is not None:
+                return entry[1]
+            value = await loader()
+            stored_at = time.time()
+            self.set(key, value, stored_at=stored_at)
+            await self._run_shared(self.shared.set, shared_key, self.encode(value), stored_at)
+            return value
+        finally:
+            await self._run_shared(self.shared.release_lease, shared_key)
+
+    async def _revalidate(self, key: Hashable, loader: Callable[[], Awaitable]):
+        try:
+            await self._flight.do(key, self._load, key, loader)
+        except Exception as e:
+            logger.warning('%r: background refresh of %r failed: %s', self, key, e)
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        '''Reloads key now, joining a load already in flight for it'''
+        return await self._flight.do(key, self._load, key, loader)
+
+    async def get_fresh(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        '''Returns a value for key younger than ttl, loading one if neither this nor another process has it'''
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or time.time() - entry[0] >= self.ttl):
+            entry = await self._adopt_shared(key, entry)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return await self._flight.do(key, self._load, key, loader)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        '''Returns the cached value for key, calling loader() to fill or refresh it'''
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or time.time() - entry[0] >= self.ttl):
+            entry = await self._adopt_shared(key, entry)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if self.stale_ttl is None or age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._flight:
+                    asyncio.ensure_future(self._revalidate(key, loader))
+                return entry[1]
+
+        self.misses += 1
+        return await self._flight.do(key, self._load, key, loader)
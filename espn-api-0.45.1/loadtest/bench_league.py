@@ -0,0 +1,70 @@
+'''Benchmark of League construction and analytics replayed from a traffic archive.
+
+Record the traffic once, against ESPN or loadtest.fake_espn, then replay it
+as many times as needed with no network, so runs are comparable. Replay with
+the same ESPN_*_BASE_ENDPOINT settings the archive was recorded with:
+
+    python -m loadtest.bench_league --archive .cache/league.jsonl.gz --league-id 1234 --year 2023 --record
+    python -m loadtest.bench_league --archive .cache/league.jsonl.gz --league-id 1234 --year 2023 --rounds 50
+
+ESPN_S2 and SWID in the environment are used for private leagues when recording.
+'''
+import argparse
+import os
+import statistics
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from espn_api.football import League
+from espn_api.requests import ResponseCache, TrafficArchive
+
+STEPS: Dict[str, Callable[[League], object]] = {
+    'scoreboard': lambda league: league.scoreboard(),
+    'box_scores': lambda league: league.box_scores(),
+    'power_rankings': lambda league: league.power_rankings(),
+    'free_agents': lambda league: league.free_agents(size=100),
+    'player_info': lambda league: league.player_info(playerId=[p.playerId for p in league.teams[0].roster]),
+}
+
+
+def run_round(league_id: int, year: int, archive: TrafficArchive, steps: List[str], timings: Dict[str, List[float]]):
+    # no response cache, so every round parses every payload the way a fresh process would
+    start = time.perf_counter()
+    league = League(league_id, year, espn_s2=os.environ.get('ESPN_S2'), swid=os.environ.get('SWID'),
+                    cache=ResponseCache(ttls={}), archive=archive)
+    timings['League()'].append(time.perf_counter() - start)
+    for name in steps:
+        start = time.perf_counter()
+        STEPS[name](league)
+        timings[name].append(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', required=True)
+    parser.add_argument('--league-id', type=int, required=True)
+    parser.add_argument('--year', type=int, required=True)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--steps', default=','.join(STEPS), help='comma separated, default: %(default)s')
+    parser.add_argument('--record', action='store_true', help='fetch from ESPN and write the archive')
+    args = parser.parse_args()
+    steps = args.steps.split(',') if args.steps else []
+
+    archive = TrafficArchive(args.archive, 'record' if args.record else 'replay')
+    timings: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(1 if args.record else args.rounds):
+        run_round(args.league_id, args.year, archive, steps, timings)
+    if args.record:
+        print(f'Recorded {len(archive)} responses to {args.archive}')
+        return
+
+    print(f"{'step':16} {'median ms':>10} {'p95 ms':>10} {'min ms':>10}")
+    for name, samples in timings.items():
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(f'{name:16} {statistics.median(samples) * 1000:>10.2f} {p95 * 1000:>10.2f} {ordered[0] * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+'''Local stand-in for the ESPN endpoints espn_api and api.py call.
+
+Serves the recorded fixtures in tests/football/unit/data, plus a synthetic
+league built from their player ids, for every view the library requests.
+Latency and errors can be injected to see how the API behaves under a slow
+or failing upstream. Point the library at it with:
+
+    ESPN_FANTASY_BASE_ENDPOINT=http://127.0.0.1:9000/apis/v3/games/
+    ESPN_NEWS_BASE_ENDPOINT=http://127.0.0.1:9000/apis/fantasy/v3/games/
+    ESPN_CORE_BASE_ENDPOINT=http://127.0.0.1:9000/v2/sports/
+
+GET /__stats returns the number of requests served per view and
+POST /__reset clears it.
+
+    python -m loadtest.fake_espn --port 9000 --latency-ms 150 --error-rate 0.02
+'''
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'football', 'unit', 'data')
+
+# defaultPositionId -> lineup slot, for synthetic rosters
+POSITION_SLOTS = {1: 0, 2: 2, 3: 4, 4: 6, 5: 17, 16: 16}
+ROSTER_SLOTS = [0, 2, 2, 4, 4, 6, 23, 16, 17, 20, 20, 20, 20, 20, 20]
+
+
+def load_fixture(name: str) -> Any:
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+class FakeEspnData(object):
+    '''Payloads for every view, built once from the fixtures'''
+    def __init__(self, teams: int = 10, seed: int = 0):
+        rng = random.Random(seed)
+        self.pro_players: List[dict] = load_fixture('league_players_2018.json')
+        self.pro_schedule = load_fixture('pro_schedule_2024.json')
+        self.draft = load_fixture('league_draft_2018.json')
+        self.player_card = load_fixture('league_2019_playerCard.json')['players'][0]
+        self.core_stats = load_fixture('core_stats_2023.json')
+        self.free_agent_entries: List[dict] = load_fixture('league_free_agents_2018.json')['players']
+
+        rosterable = [p for p in self.pro_players if p.get('defaultPositionId') in POSITION_SLOTS]
+        rng.shuffle(rosterable)
+        self.league = self._build_league(teams, rosterable)
+        rostered = {entry['playerId'] for team in self.league['teams'] for entry in team['roster']['entries']}
+        self.free_agents = self._build_free_agents([p for p in rosterable if p['id'] not in rostered])
+
+    def _build_league(self, team_count: int, players: List[dict]) -> dict:
+        teams, schedule = [], []
+        by_slot: Dict[int, List[dict]] = {}
+        for player in players:
+            by_slot.setdefault(POSITION_SLOTS[player['defaultPositionId']], []).append(player)
+        bench = iter(players[::-1])
+
+        for team_id in range(1, team_count + 1):
+            entries = []
+            for slot in ROSTER_SLOTS:
+                pool = by_slot.get(slot)
+                player = pool.pop() if pool else next(bench)
+                entries.append({
+                    'lineupSlotId': slot,
+                    'playerId': player['id'],
+                    'playerPoolEntry': {'id': player['id'], 'onTeamId': team_id, 'player': dict(player, stats=[])},
+                })
+            wins = (team_id * 7) % 5
+            teams.append({
+                'id': team_id, 'abbrev': f'T{team_id}', 'name': f'Team {team_id}', 'divisionId': 0,
+                'record': {'overall': {'wins': wins, 'losses': 4 - wins, 'ties': 0, 'pointsFor': 400.0 + team_id,
+                                       'pointsAgainst': 390.0, 'streakLength': 1, 'streakType': 'WIN'}},
+                'playoffSeed': team_id, 'rankCalculatedFinal': 0, 'owners': [], 'roster': {'entries': entries},
+            })
+
+        for week in range(1, 5):
+            for home in range(1, team_count, 2):
+                schedule.append({
+                    'matchupPeriodId': week, 'id': week * 100 + home,
+                    'home': {'teamId': home, 'totalPoints': 100.0 + week},
+                    'away': {'teamId': home + 1, 'totalPoints': 95.0 + home},
+                    'winner': 'HOME',
+                })
+
+        return {
+            'id': 0, 'seasonId': 0, 'scoringPeriodId': 5,
+            'status': {'currentMatchupPeriod': 5, 'firstScoringPeriod': 1, 'finalScoringPeriod': 17,
+                       'latestScoringPeriod': 5, 'previousSeasons': []},
+            'settings': {
+                'name': 'Fake ESPN League', 'size': team_count,
+                'scheduleSettings': {'matchupPeriodCount': 14, 'playoffTeamCount': 4,
+                                     'matchupPeriods': {str(week): [week] for week in range(1, 18)},
+                                     'playoffSeedingRule': 'TOTAL_POINTS_SCORED', 'divisions': [{'id': 0, 'name': 'League'}]},
+                'tradeSettings': {'vetoVotesRequired': 4}, 'draftSettings': {'keeperCount': 0},
+                'scoringSettings': {'matchupTieRule': 'NONE', 'playoffMatchupTieRule': 'NONE', 'scoringItems': []},
+                'acquisitionSettings': {'isUsingAcquisitionBudget': True, 'acquisitionBudget': 100},
+                'rosterSettings': {'lineupSlotCounts': {str(slot): ROSTER_SLOTS.count(slot) for slot in set(ROSTER_SLOTS)}},
+            },
+            'teams': teams, 'schedule': schedule, 'members': [],
+        }
+
+    def _build_free_agents(self, players: List[dict]) -> List[dict]:
+        '''The recorded free agents re-keyed onto unrostered pro players, so the pool is as large as asked'''
+        free_agents = []
+        for i, player in enumerate(players):
+            entry = copy.deepcopy(self.free_agent_entries[i % len(self.free_agent_entries)])
+            entry['id'] = player['id']
+            entry['player'].update({key: player[key] for key in ('id', 'fullName', 'firstName', 'lastName',
+                                                                  'defaultPositionId', 'eligibleSlots', 'proTeamId')
+                                    if key in player})
+            free_agents.append(entry)
+        return free_agents
+
+    def player_cards(self, player_ids: List[int]) -> dict:
+        known = {p['id']: p for p in self.pro_players}
+        cards = []
+        for player_id in player_ids:
+            if player_id not in known:
+                continue
+            card = copy.deepcopy(self.player_card)
+            card['id'] = player_id
+            card['player'].update(id=player_id, fullName=known[player_id]['fullName'],
+                                  defaultPositionId=known[player_id].get('defaultPositionId', 1))
+            cards.append(card)
+        return {'players': cards}
+
+
+def fantasy_filter(headers) -> dict:
+    try:
+        return json.loads(headers.get('x-fantasy-filter') or '{}')
+    except ValueError:
+        return {}
+
+
+class FakeEspnServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], data: FakeEspnData, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, rate_limit_rate: float = 0.0):
+        super().__init__(address, FakeEspnHandler)
+        self.data = data
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rate = rate_limit_rate
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+    def record(self, view: str):
+        with self._stats_lock:
+            self.stats[view] += 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def environment(self) -> Dict[str, str]:
+        '''Environment variables that point espn_api at this server'''
+        return {
+            'ESPN_FANTASY_BASE_ENDPOINT': f'{self.base_url}/apis/v3/games/',
+            'ESPN_NEWS_BASE_ENDPOINT': f'{self.base_url}/apis/fantasy/v3/games/',
+            'ESPN_CORE_BASE_ENDPOINT': f'{self.base_url}/v2/sports/',
+        }
+
+
+class FakeEspnHandler(BaseHTTPRequestHandler):
+    server: FakeEspnServer
+    protocol_version = 'HTTP/1.1'
+
+    LEAGUE_PATH = re.compile(r'^/apis/v3/games/\w+/(seasons/\d+/segments/0/leagues/\d+|leagueHistory/\d+)(/.*)?$')
+    SEASON_PATH = re.compile(r'^/apis/v3/games/\w+/seasons/\d+(/players)?$')
+    NEWS_PATH = re.compile(r'^/apis/fantasy/v3/games/\w+/news/')
+    CORE_STATS_PATH = re.compile(r'^/v2/sports/football/leagues/nfl/seasons/\d+/types/\d+/athletes/\d+/statistics$')
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload: Any, status: int = 200, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path == '/__reset':
+            with self.server._stats_lock:
+                self.server.stats.clear()
+            self.send_json({})
+        else:
+            self.send_json({'messages': ['Not found']}, status=404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/__stats':
+            with self.server._stats_lock:
+                return self.send_json(dict(self.server.stats))
+
+        query = parse_qs(url.query)
+        view, payload = self.route(url.path, query)
+        self.server.record(view)
+
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay:
+            time.sleep(delay)
+        roll = random.random()
+        if roll < self.server.rate_limit_rate:
+            return self.send_json({'messages': ['Too many requests']}, status=429, headers={'Retry-After': '1'})
+        if roll < self.server.rate_limit_rate + self.server.error_rate:
+            return self.send_json({'messages': ['Injected error']}, status=self.server.error_status)
+        if payload is None:
+            return self.send_json({'messages': ['Not found']}, status=404)
+        self.send_json(payload)
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Tuple[str, Optional[Any]]:
+        '''(view label, payload) for a request, payload None for a 404'''
+        data = self.server.data
+        views = query.get('view', [])
+        view = ','.join(views) or path
+
+        match = self.LEAGUE_PATH.match(path)
+        if match:
+            history = match.group(1).startswith('leagueHistory')
+            payload = self.league_view(views, match.group(2) or '')
+            return view, [payload] if history and payload is not None else payload
+
+        match = self.SEASON_PATH.match(path)
+        if match:
+            if match.group(1):
+                return view, data.pro_players
+            if 'proTeamSchedules_wl' in views:
+                return view, data.pro_schedule
+            return view, {}
+
+        if self.NEWS_PATH.match(path):
+            return 'news', {'feed': []}
+        if self.CORE_STATS_PATH.match(path):
+            return 'core:statistics', data.core_stats
+        return path, None
+
+    def league_view(self, views: List[str], extend: str) -> Optional[Any]:
+        data = self.server.data
+        filters = fantasy_filter(self.headers)
+        if extend.startswith('/communication'):
+            return load_fixture('league_recent_activity_2019.json')
+        if 'mDraftDetail' in views:
+            return data.draft
+        if 'kona_player_info' in views:
+            limit = filters.get('players', {}).get('limit', 50)
+            return {'players': data.free_agents[:limit]}
+        if 'kona_playercard' in views:
+            ids = filters.get('players', {}).get('filterIds', {}).get('value', [])
+            return data.player_cards(ids)
+        if 'mTransactions2' in views:
+            return {'transactions': []}
+        if 'mPositionalRatings' in views:
+            return {'positionAgainstOpponent': {'positionalRatings': {}}}
+        return data.league
+
+
+def serve(host: str = '127.0.0.1', port: int = 9000, **kwargs) -> FakeEspnServer:
+    '''Starts a FakeEspnServer on a daemon thread; port 0 picks a free port'''
+    teams = kwargs.pop('teams', 10)
+    server = FakeEspnServer((host, port), FakeEspnData(teams=teams), **kwargs)
+    threading.Thread(target=server.serve_forever, name='FakeEspnServer', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=0, help='added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='random extra latency up to this much')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='fraction of requests answered with 429')
+    args = parser.parse_args()
+
+    server = FakeEspnServer((args.host, args.port), FakeEspnData(teams=args.teams),
+                            latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                            error_rate=args.error_rate, error_status=args.error_status,
+                            rate_limit_rate=args.rate_limit_rate)
+    print(f'Fake ESPN listening on {server.base_url}')
+    for name, value in server.environment().items():
+        print(f'  {name}={value}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
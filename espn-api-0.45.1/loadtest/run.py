@@ -0,0 +1,182 @@
+'''Load test for the FastAPI routes in api.py.
+
+Drives each route at the given concurrency and reports latency percentiles,
+errors and how many ESPN calls the run caused per view. With --spawn it starts
+loadtest.fake_espn and api.py (under uvicorn) itself, so nothing touches the
+real ESPN endpoints:
+
+    python -m loadtest.run --spawn --concurrency 50 --requests 2000
+    python -m loadtest.run --api http://127.0.0.1:8000 --routes /teams,/free-agents-qb
+
+Without --spawn, upstream calls are read from the API's /metrics endpoint.
+'''
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+from .fake_espn import serve
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ROUTES = [
+    '/teams',
+    '/free-agents?positions=QB,RB,WR,TE,DT,DE,LB,CB,S,K&size=300',
+    '/free-agents-qb',
+    '/free-agents-wr',
+    '/debug-rosters',
+]
+UPSTREAM_SAMPLE = re.compile(r'^espn_api_upstream_requests_total\{view="([^"]*)",status="([^"]*)"\} (\S+)$')
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def upstream_calls(client: httpx.AsyncClient, api: str, fake_espn: str = None) -> Counter:
+    '''ESPN calls so far per view, from the fake server when there is one, else from /metrics'''
+    if fake_espn:
+        return Counter((await client.get(f'{fake_espn}/__stats')).json())
+    calls = Counter()
+    response = await client.get(f'{api}/metrics')
+    for line in response.text.splitlines():
+        match = UPSTREAM_SAMPLE.match(line)
+        if match:
+            calls[match.group(1)] += float(match.group(3))
+    return calls
+
+
+async def wait_ready(client: httpx.AsyncClient, api: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f'{api}/readyz')).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f'{api} not ready after {timeout}s')
+
+
+async def run_load(api: str, routes: List[str], concurrency: int, requests: int, duration: float,
+                   fake_espn: str = None, revalidate: bool = False) -> Dict[str, dict]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    etags: Dict[str, str] = {}
+    issued = 0
+    deadline = time.monotonic() + duration if duration else None
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await wait_ready(client, api, timeout=120)
+        before = await upstream_calls(client, api, fake_espn)
+
+        async def worker():
+            nonlocal issued
+            while True:
+                if deadline is not None:
+                    if time.monotonic() >= deadline:
+                        return
+                elif issued >= requests:
+                    return
+                route = routes[issued % len(routes)]
+                issued += 1
+                headers = {'If-None-Match': etags[route]} if revalidate and route in etags else {}
+                start = time.perf_counter()
+                try:
+                    response = await client.get(api + route, headers=headers)
+                    await response.aread()
+                    status = response.status_code
+                    if 'etag' in response.headers:
+                        etags[route] = response.headers['etag']
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[route].append(time.perf_counter() - start)
+                statuses[route][status] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        after = await upstream_calls(client, api, fake_espn)
+
+    report = {}
+    for route in routes:
+        samples = latencies[route]
+        report[route] = {
+            'requests': len(samples),
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'p99': percentile(samples, 99),
+            'statuses': dict(statuses[route]),
+        }
+    upstream = {view: after[view] - before.get(view, 0) for view in after if after[view] - before.get(view, 0)}
+    return {'routes': report, 'elapsed': elapsed, 'total': sum(len(s) for s in latencies.values()), 'upstream': upstream}
+
+
+def print_report(result: dict):
+    print(f"\n{result['total']} requests in {result['elapsed']:.2f}s ({result['total'] / result['elapsed']:.1f} req/s)\n")
+    print(f"{'route':60} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for route, stats in result['routes'].items():
+        print(f"{route[:60]:60} {stats['requests']:>6} {stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} "
+              f"{stats['p99'] * 1000:>9.1f}  {stats['statuses']}")
+    print('\nESPN calls during the run:')
+    for view, count in sorted(result['upstream'].items(), key=lambda item: -item[1]):
+        print(f'  {count:>8g}  {view}')
+    if not result['upstream']:
+        print('  none')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api', default='http://127.0.0.1:8000')
+    parser.add_argument('--routes', help='comma separated routes, default: ' + ' '.join(DEFAULT_ROUTES))
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--duration', type=float, help='run for this many seconds instead of --requests')
+    parser.add_argument('--revalidate', action='store_true', help='send If-None-Match like the frontend does')
+    parser.add_argument('--spawn', action='store_true', help='start the fake ESPN server and api.py')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn workers when spawning')
+    parser.add_argument('--latency-ms', type=float, default=100, help='fake ESPN latency when spawning')
+    parser.add_argument('--error-rate', type=float, default=0, help='fake ESPN error rate when spawning')
+    args = parser.parse_args()
+    # routes themselves contain commas, so split only before a leading slash
+    routes = re.split(r',(?=/)', args.routes) if args.routes else DEFAULT_ROUTES
+
+    fake_espn = api_process = None
+    try:
+        if args.spawn:
+            fake_espn = serve(port=0, latency=args.latency_ms / 1000, error_rate=args.error_rate)
+            port = 8765
+            args.api = f'http://127.0.0.1:{port}'
+            env = dict(os.environ, **fake_espn.environment())
+            if args.workers > 1 and 'SHARED_CACHE_PATH' not in env:
+                env['SHARED_CACHE_PATH'] = os.path.join(API_DIR, '.cache', 'loadtest-shared.db')
+            api_process = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'api:app', '--port', str(port), '--workers', str(args.workers),
+                 '--log-level', 'warning'], cwd=API_DIR, env=env)
+            print(f'Fake ESPN at {fake_espn.base_url}, api.py at {args.api}')
+
+        result = asyncio.run(run_load(args.api, routes, args.concurrency, args.requests, args.duration,
+                                      fake_espn=fake_espn.base_url if fake_espn else None,
+                                      revalidate=args.revalidate))
+        print_report(result)
+    finally:
+        if api_process is not None:
+            api_process.terminate()
+            api_process.wait(timeout=10)
+        if fake_espn is not None:
+            fake_espn.shutdown()
+
+
+if __name__ == '__main__':
+    main()
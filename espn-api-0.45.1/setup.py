@@ -15,10 +15,11 @@ setup(
     description='ESPN API',
     long_description=readme,
     long_description_content_type="text/markdown",
-    install_requires=['requests>=2.0.0,<3.0.0', 'urllib3<=2.2.3'],
+    install_requires=['requests>=2.0.0,<3.0.0', 'urllib3>=1.26.0,<=2.2.3'],
+    extras_require={'async': ['httpx>=0.23.0'], 'brotli': ['brotli']},
     setup_requires=['nose>=1.0'],
     test_suite='nose.collector',
-    tests_require=['nose', 'requests_mock', 'coverage'],
+    tests_require=['nose', 'requests_mock', 'coverage', 'httpx>=0.23.0'],
     url='https://github.com/cwendt94/espn-api',
     classifiers=[
         'Programming Language :: Python :: 3',
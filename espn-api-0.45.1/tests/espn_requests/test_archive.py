@@ -0,0 +1,67 @@
+import gzip
+import os
+import tempfile
+from unittest import mock, TestCase
+import requests_mock
+
+from espn_api.requests.archive import ArchiveMiss, TrafficArchive, default_archive
+from espn_api.requests.espn_requests import EspnFantasyRequests, create_session
+from espn_api.requests.response_cache import ResponseCache
+
+
+class TrafficArchiveTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'espn.jsonl.gz')
+
+    def make_request(self, archive):
+        return EspnFantasyRequests(sport='nfl', year=2019, league_id=1234, cookies={'espn_s2': 'secret', 'SWID': '{id}'},
+                                   session=create_session(), cache=ResponseCache(ttls={}), archive=archive)
+
+    def test_record_then_replay(self):
+        with requests_mock.Mocker() as m:
+            m.get(requests_mock.ANY, json=[{'id': 1234, 'teams': []}])
+            request = self.make_request(TrafficArchive(self.path, 'record'))
+            request.get_league()
+            request.get_player_card([1, 2], 17)
+            self.assertEqual(m.call_count, 2)
+
+        with gzip.open(self.path, 'rt') as f:
+            self.assertNotIn('secret', f.read())
+
+        # no mocked responses: any network call would raise
+        with requests_mock.Mocker() as m:
+            request = self.make_request(TrafficArchive(self.path))
+            self.assertEqual(request.get_league(), {'id': 1234, 'teams': []})
+            self.assertEqual(request.get_player_card([1, 2], 17), {'id': 1234, 'teams': []})
+            self.assertEqual(m.call_count, 0)
+
+            with self.assertRaises(ArchiveMiss):
+                request.get_player_card([3], 17)
+
+    def test_replays_status(self):
+        with requests_mock.Mocker() as m:
+            m.get(requests_mock.ANY, status_code=404, json={})
+            request = self.make_request(TrafficArchive(self.path, 'record'))
+            with self.assertRaises(Exception):
+                request.get_pro_schedule()
+
+        archive = TrafficArchive(self.path)
+        self.assertEqual(len(archive), 1)
+        self.assertEqual(archive.replay(request.ENDPOINT, {'view': 'proTeamSchedules_wl'})[0], 404)
+
+    def test_default_archive(self):
+        with mock.patch.dict(os.environ, {'ESPN_ARCHIVE_PATH': self.path, 'ESPN_ARCHIVE_MODE': 'record'}):
+            archive = default_archive()
+            self.assertTrue(archive.recording)
+            self.assertIs(default_archive(), archive)
+            self.assertIs(EspnFantasyRequests(sport='nfl', year=2019, league_id=1234).archive, archive)
+
+        with mock.patch.dict(os.environ, {'ESPN_ARCHIVE_PATH': ''}):
+            self.assertIsNone(default_archive())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            TrafficArchive(self.path, 'rewind')
@@ -0,0 +1,109 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, mock
+
+import httpx
+
+from espn_api.requests.async_espn_requests import AsyncEspnFantasyRequests
+from espn_api.requests import espn_requests
+from espn_api.requests.espn_requests import ESPNAccessDenied, ESPNInvalidLeague, ESPNUnknownError
+from espn_api.requests.response_cache import ResponseCache
+from espn_api.requests.throttle import HostThrottle
+
+
+class AsyncEspnRequestsTest(IsolatedAsyncioTestCase):
+
+    def make_request(self, handler, **kwargs):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        # no rate limit or backoff delays, and failures here don't trip the shared per-host breaker
+        kwargs.setdefault('throttle', HostThrottle(rate=0, backoff_factor=0))
+        return AsyncEspnFantasyRequests(sport='nfl', year=2019, league_id=1234, client=client, **kwargs)
+
+    async def test_league_get(self):
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json=[{'id': 1234}])
+
+        request = self.make_request(handler, cookies={'espn_s2': 'abc', 'SWID': '{def}'})
+        data = await request.get_league()
+
+        self.assertEqual(data, {'id': 1234})
+        self.assertEqual(seen[0].url.params.get_list('view'), ['mTeam', 'mRoster', 'mMatchup', 'mSettings', 'mStandings'])
+        self.assertEqual(seen[0].headers['cookie'], 'espn_s2=abc; SWID={def}')
+
+    async def test_status_errors(self):
+        request = self.make_request(lambda r: httpx.Response(404, json={}))
+        with self.assertRaises(ESPNInvalidLeague):
+            await request.get_league()
+
+        request = self.make_request(lambda r: httpx.Response(500, json={}))
+        with self.assertRaises(ESPNUnknownError):
+            await request.get_pro_schedule()
+
+    async def test_league_endpoint_fallback(self):
+        def handler(request):
+            if '/leagueHistory/' in str(request.url):
+                return httpx.Response(200, json=[{'id': 1234}])
+            return httpx.Response(401, json={})
+
+        request = self.make_request(handler)
+        results = await asyncio.gather(request.get_league(), request.get_league_draft())
+
+        self.assertEqual(results, [{'id': 1234}, {'id': 1234}])
+        self.assertIn('/leagueHistory/1234?seasonId=2019', request.LEAGUE_ENDPOINT)
+
+        request = self.make_request(lambda r: httpx.Response(401, json={}))
+        with self.assertRaises(ESPNAccessDenied):
+            await request.get_league()
+
+    async def test_concurrency_bounded_by_semaphore(self):
+        in_flight = 0
+        max_in_flight = 0
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={})
+
+        request = self.make_request(handler, max_concurrency=2)
+        await asyncio.gather(*[request.get_pro_schedule() for _ in range(6)])
+
+        self.assertEqual(max_in_flight, 2)
+
+    async def test_response_cache(self):
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={'settings': {'proTeams': []}})
+
+        request = self.make_request(handler)
+        await request.get_pro_schedule()
+        self.assertEqual(await request.get_pro_schedule(), {'settings': {'proTeams': []}})
+        self.assertEqual(len(seen), 1)
+
+    async def test_retries_throttled_calls(self):
+        responses = [httpx.Response(429, headers={'Retry-After': '0'}), httpx.Response(200, json={'settings': {}})]
+        request = self.make_request(lambda r: responses.pop(0))
+
+        self.assertEqual(await request.get_pro_schedule(), {'settings': {}})
+        self.assertEqual(responses, [])
+
+    async def test_serves_stale_after_retries(self):
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json=[{'id': 1234}]) if len(seen) == 1 else httpx.Response(503)
+
+        request = self.make_request(handler, cache=ResponseCache())
+        self.assertEqual(await request.get_league(), {'id': 1234})
+        self.assertEqual(await request.get_league(), {'id': 1234})
+        self.assertGreater(len(seen), 2)
+        self.assertEqual(request.cache.stale_hits, 1)
+
+    async def test_default_session_unused(self):
+        with mock.patch.object(espn_requests, '_default_session', None):
+            self.make_request(lambda r: httpx.Response(200, json={}))
+            self.assertIsNone(espn_requests._default_session)
@@ -1,7 +1,7 @@
 from unittest import mock, TestCase
 import requests_mock
 import io
-from espn_api.requests.espn_requests import EspnFantasyRequests
+from espn_api.requests.espn_requests import EspnFantasyRequests, create_session, get_default_session
 
 class EspnRequestsTest(TestCase):
 
@@ -54,4 +54,62 @@ class EspnRequestsTest(TestCase):
     #     request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019)
     #     request.authentication(username='user', password='pass')
     #     self.assertEqual(request.cookies['espn_s2'], 'cookie1')
-    #     self.assertEqual(request.cookies['swid'], 'cookie2')
\ No newline at end of file
+    #     self.assertEqual(request.cookies['swid'], 'cookie2')
+
+
+class EspnRequestsSessionTest(TestCase):
+
+    def test_default_session_is_shared(self):
+        first = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019)
+        second = EspnFantasyRequests(sport='nfl', league_id=5678, year=2019)
+        self.assertIs(first.session, get_default_session())
+        self.assertIs(first.session, second.session)
+
+    def test_create_session(self):
+        session = create_session(pool_size=4, retries=3)
+        adapter = session.get_adapter('https://lm-api-reads.fantasy.espn.com')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 3)
+        # statuses are retried by the host throttle, not the adapter
+        self.assertEqual(adapter.max_retries.status, 0)
+
+    @requests_mock.Mocker()
+    def test_requests_use_session(self, mock_request):
+        session = create_session()
+        mock_request.get(requests_mock.ANY, json=[{'id': 1234}], headers={'Set-Cookie': 'tracker=1; Domain=.espn.com'})
+        first = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, cookies={'espn_s2': 'abc', 'SWID': '{def}'},
+                                    session=session, timeout=7)
+        second = EspnFantasyRequests(sport='nfl', league_id=5678, year=2019, session=session)
+
+        self.assertEqual(first.get_league(), {'id': 1234})
+        self.assertEqual(mock_request.last_request.timeout, 7)
+        # the cookie order differs between requests versions
+        self.assertEqual(sorted(mock_request.last_request.headers['Cookie'].split('; ')), ['SWID={def}', 'espn_s2=abc'])
+
+        # cookies belong to the league that sent them, not to the shared session
+        second.get_league()
+        self.assertNotIn('Cookie', mock_request.last_request.headers)
+        self.assertEqual(len(session.cookies), 0)
+
+    @requests_mock.Mocker()
+    def test_iter_pro_players(self, mock_request):
+        players = [{'id': 1, 'fullName': 'Player One'}, {'id': 2, 'fullName': 'Player Two'}]
+        mock_request.get(requests_mock.ANY, json=players)
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, session=create_session())
+
+        self.assertEqual(list(request.iter_pro_players()), players)
+        self.assertIn('players_wl', mock_request.last_request.url)
+        self.assertIn('gzip', mock_request.last_request.headers['Accept-Encoding'])
+
+    @requests_mock.Mocker()
+    def test_league_endpoint_switched_once(self, mock_request):
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, session=create_session())
+        seasons_endpoint = request.LEAGUE_ENDPOINT
+        mock_request.get(requests_mock.ANY, json=[{'id': 1234}])
+
+        # a request that saw the 401 after another one switched keeps the new endpoint
+        request._switch_league_endpoint()
+        history_endpoint = request.LEAGUE_ENDPOINT
+        self.assertEqual(request.checkRequestStatus(401, league_endpoint=seasons_endpoint), [{'id': 1234}])
+        self.assertEqual(request.LEAGUE_ENDPOINT, history_endpoint)
+        self.assertIn('/leagueHistory/', mock_request.last_request.url)
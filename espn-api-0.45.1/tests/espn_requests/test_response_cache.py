@@ -0,0 +1,102 @@
+from unittest import mock, TestCase
+import requests_mock
+
+from espn_api.requests.espn_requests import EspnFantasyRequests, create_session
+from espn_api.requests.response_cache import ResponseCache
+
+
+class ResponseCacheTest(TestCase):
+
+    def test_ttl_per_view(self):
+        cache = ResponseCache(ttls={'proTeamSchedules_wl': 3600, 'mMatchupScore': 10})
+        self.assertEqual(cache.ttl('proTeamSchedules_wl'), 3600)
+        self.assertEqual(cache.ttl('mMatchupScore,proTeamSchedules_wl'), 10)
+        self.assertEqual(cache.ttl('mTeam'), 0)
+        self.assertEqual(cache.ttl('mTeam,mMatchupScore'), 0)
+
+    def test_key(self):
+        cache = ResponseCache()
+        key = cache.key('url', {'view': ['a', 'b'], 'scoringPeriodId': 3}, {'x-fantasy-filter': '{}'})
+        self.assertEqual(key, cache.key('url', {'scoringPeriodId': '3', 'view': ['a', 'b']}, {'x-fantasy-filter': '{}'}))
+        self.assertNotEqual(key, cache.key('url', {'view': ['a', 'b'], 'scoringPeriodId': 4}, {'x-fantasy-filter': '{}'}))
+        self.assertNotEqual(key, cache.key('url', {'view': ['a', 'b'], 'scoringPeriodId': 3}))
+        self.assertNotEqual(key, cache.key('url', {'view': ['a', 'b'], 'scoringPeriodId': 3}, {'x-fantasy-filter': '{}'},
+                                           {'espn_s2': 'abc'}))
+
+    def test_expiry(self):
+        cache = ResponseCache()
+        with mock.patch('espn_api.requests.response_cache.time.monotonic', return_value=1000):
+            cache.set('key', b'body', ttl=10)
+            self.assertEqual(cache.get('key'), b'body')
+        with mock.patch('espn_api.requests.response_cache.time.monotonic', return_value=1010):
+            self.assertIsNone(cache.get('key'))
+            self.assertEqual(cache.get_stale('key'), b'body')
+        self.assertIsNone(cache.get_stale('other'))
+        self.assertEqual(cache.stats(), {'hits': 1, 'stale_hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 4})
+
+    def test_keep_stale(self):
+        cache = ResponseCache(keep_stale=False)
+        cache.set('uncached', b'body', ttl=0)
+        cache.set('cached', b'body', ttl=10)
+        self.assertIsNone(cache.get_stale('uncached'))
+        self.assertEqual(cache.get_stale('cached'), b'body')
+
+        cache = ResponseCache()
+        cache.set('uncached', b'body', ttl=0)
+        self.assertEqual(cache.get_stale('uncached'), b'body')
+
+    def test_lru_by_bytes(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set('a', b'aaaa', ttl=60)
+        cache.set('b', b'bbbb', ttl=60)
+        cache.get('a')
+        cache.set('c', b'cccc', ttl=60)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'aaaa')
+        self.assertEqual(cache.get('c'), b'cccc')
+        self.assertEqual(cache.bytes, 8)
+        self.assertEqual(cache.evictions, 1)
+
+        # bodies bigger than the whole cache are not stored
+        cache.set('d', b'd' * 11, ttl=60)
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(len(cache), 2)
+
+
+class EspnRequestsResponseCacheTest(TestCase):
+
+    def make_request(self, **kwargs):
+        return EspnFantasyRequests(sport='nfl', year=2019, league_id=1234, session=create_session(), **kwargs)
+
+    @requests_mock.Mocker()
+    def test_cached_view(self, mock_request):
+        mock_request.get(requests_mock.ANY, json={'settings': {'proTeams': []}})
+        request = self.make_request()
+
+        self.assertEqual(request.get_pro_schedule(), {'settings': {'proTeams': []}})
+        self.assertEqual(request.get_pro_schedule(), {'settings': {'proTeams': []}})
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(request.cache.hits, 1)
+
+    @requests_mock.Mocker()
+    def test_uncached_view(self, mock_request):
+        mock_request.get(requests_mock.ANY, json=[{'id': 1234}])
+        request = self.make_request()
+
+        request.get_league()
+        request.get_league()
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(request.cache.misses, 0)
+        # the default cache doesn't hold on to views it never serves
+        self.assertEqual(len(request.cache), 0)
+
+    @requests_mock.Mocker()
+    def test_errors_are_not_cached(self, mock_request):
+        mock_request.get(requests_mock.ANY, [{'status_code': 404}, {'json': {'settings': {}}}])
+        request = self.make_request(cache=ResponseCache(ttls={'proTeamSchedules_wl': 60}))
+
+        with self.assertRaises(Exception):
+            request.get_pro_schedule()
+        self.assertEqual(request.get_pro_schedule(), {'settings': {}})
+        self.assertEqual(mock_request.call_count, 2)
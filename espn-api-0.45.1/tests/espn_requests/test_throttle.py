@@ -0,0 +1,97 @@
+from unittest import mock, TestCase
+import requests_mock
+
+from espn_api.requests.espn_requests import EspnFantasyRequests, ESPNUnavailable, ESPNUnknownError, create_session
+from espn_api.requests.response_cache import ResponseCache
+from espn_api.requests.throttle import CircuitBreaker, HostThrottle, TokenBucket, get_throttle, parse_retry_after
+
+
+class ThrottleTest(TestCase):
+
+    def test_token_bucket(self):
+        with mock.patch('espn_api.requests.throttle.time.monotonic', return_value=100):
+            bucket = TokenBucket(rate=2, burst=2)
+            self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1.0])
+        with mock.patch('espn_api.requests.throttle.time.monotonic', return_value=103):
+            # refills at rate, but never past burst
+            self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0.5])
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        with mock.patch('espn_api.requests.throttle.time.monotonic', return_value=100):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+        with mock.patch('espn_api.requests.throttle.time.monotonic', return_value=130):
+            # one trial call after the timeout, a failure opens it again
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with mock.patch('espn_api.requests.throttle.time.monotonic', return_value=160):
+            self.assertTrue(breaker.allow())
+            breaker.record_success()
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            self.assertTrue(breaker.allow())
+
+    def test_retry_delay(self):
+        throttle = HostThrottle(retries=2, backoff_factor=1, max_backoff=30)
+        self.assertLessEqual(throttle.retry_delay(1), 2)
+        self.assertEqual(throttle.retry_delay(0, retry_after='7'), 7)
+        self.assertIsNone(throttle.retry_delay(0, retry_after='120'))
+        self.assertIsNone(throttle.retry_delay(2))
+
+        self.assertAlmostEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_shared_per_host(self):
+        self.assertIs(get_throttle('https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl'),
+                      get_throttle('https://lm-api-reads.fantasy.espn.com/apis/v3/games/fba'))
+        self.assertIsNot(get_throttle('https://lm-api-reads.fantasy.espn.com/'), get_throttle('https://site.api.espn.com/'))
+
+
+class EspnRequestsThrottleTest(TestCase):
+
+    def make_request(self, **kwargs):
+        throttle = HostThrottle(rate=0, retries=2, backoff_factor=0, failure_threshold=3)
+        return EspnFantasyRequests(sport='nfl', year=2019, league_id=1234, session=create_session(),
+                                   throttle=throttle, **kwargs)
+
+    @requests_mock.Mocker()
+    def test_retries_throttled_calls(self, mock_request):
+        mock_request.get(requests_mock.ANY, [{'status_code': 429, 'headers': {'Retry-After': '0'}},
+                                             {'status_code': 503}, {'json': [{'id': 1234}]}])
+        request = self.make_request()
+
+        self.assertEqual(request.get_league(), {'id': 1234})
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(request.throttle.breaker.failures, 0)
+
+    @requests_mock.Mocker()
+    def test_gives_up_after_retries(self, mock_request):
+        mock_request.get(requests_mock.ANY, status_code=503)
+        request = self.make_request()
+
+        with self.assertRaises(ESPNUnknownError):
+            request.get_league()
+        self.assertEqual(mock_request.call_count, 3)
+
+    @requests_mock.Mocker()
+    def test_serves_stale_while_open(self, mock_request):
+        mock_request.get(requests_mock.ANY, [{'json': [{'id': 1234}]}, {'status_code': 503}])
+        request = self.make_request(cache=ResponseCache())
+
+        self.assertEqual(request.get_league(), {'id': 1234})
+        # retries run out, so the last good response is served and the circuit opens
+        self.assertEqual(request.get_league(), {'id': 1234})
+        self.assertEqual(request.throttle.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(mock_request.call_count, 4)
+
+        # while open ESPN isn't called at all
+        self.assertEqual(request.get_league(), {'id': 1234})
+        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(request.cache.stale_hits, 2)
+
+        with self.assertRaises(ESPNUnavailable):
+            request.get_pro_schedule()
@@ -0,0 +1,43 @@
+from unittest import TestCase
+import json
+
+from espn_api.football.core_stats import normalize_core_stats, normalize_core_stats_many
+
+
+class CoreStatsTest(TestCase):
+    def setUp(self):
+        with open('tests/football/unit/data/core_stats_2023.json') as data:
+            self.data = json.loads(data.read())
+
+    def test_normalize_core_stats(self):
+        stats = normalize_core_stats(self.data)
+
+        self.assertEqual(stats['passingCompletions'], 401.0)
+        self.assertEqual(stats['passingAttempts'], 597.0)
+        self.assertEqual(stats['passingYards'], 4424.0)
+        # totalTouchdowns in the passing category isn't passingTouchdowns
+        self.assertEqual(stats['passingTouchdowns'], 27.0)
+        self.assertEqual(stats['passingInterceptions'], 14.0)
+        self.assertEqual(stats['rushingYards'], 389.0)
+        self.assertEqual(stats['defensiveFumbles'], 1.0)
+        self.assertEqual(stats['defensiveForcedFumbles'], 0.0)
+        self.assertNotIn('netPassingYards', stats)
+        self.assertNotIn('totalPoints', stats)
+
+    def test_derived_stats(self):
+        stats = normalize_core_stats(self.data)
+
+        self.assertAlmostEqual(stats['passingCompletionPercentage'], 401 / 597)
+        self.assertAlmostEqual(stats['rushingYardsPerAttempt'], 389 / 75)
+        # no receptions, so no yards per reception
+        self.assertNotIn('receivingYardsPerReception', stats)
+
+    def test_empty_payloads(self):
+        self.assertEqual(normalize_core_stats({}), {})
+        self.assertEqual(normalize_core_stats({'splits': {'categories': [{'name': 'passing'}]}}), {})
+
+    def test_normalize_many(self):
+        stats = normalize_core_stats_many([((1, 2023), self.data), ((2, 2023), {})])
+
+        self.assertEqual(stats[(1, 2023)]['passingYards'], 4424.0)
+        self.assertEqual(stats[(2, 2023)], {})
@@ -0,0 +1,129 @@
+from collections import Counter
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+import requests_mock
+
+from espn_api.football import League
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.response_cache import ResponseCache
+from espn_api.requests.throttle import HostThrottle, get_throttle, set_throttle
+
+
+def team_data(team_id):
+    return {
+        'id': team_id, 'abbrev': f'T{team_id}', 'name': f'Team {team_id}', 'divisionId': 0,
+        'record': {'overall': {'wins': team_id, 'losses': 4 - team_id, 'ties': 0, 'pointsFor': 100.0 + team_id,
+                               'pointsAgainst': 90.0, 'streakLength': 1, 'streakType': 'WIN'}},
+        'playoffSeed': team_id, 'rankCalculatedFinal': 0, 'owners': [],
+        'roster': {'entries': [
+            {'lineupSlotId': 0, 'playerPoolEntry': {'player': {
+                'fullName': f'Player {team_id}{i}', 'id': team_id * 100 + i, 'eligibleSlots': [0, 7, 20],
+                'proTeamId': 1, 'stats': []}}}
+            for i in range(2)
+        ]},
+    }
+
+
+def league_data():
+    '''A four team league with three played weeks, small enough to build in the test'''
+    schedule = []
+    for week in range(1, 4):
+        schedule.append({'matchupPeriodId': week, 'id': week * 10 + 1, 'winner': 'HOME',
+                         'home': {'teamId': 1, 'totalPoints': 10.0 * week}, 'away': {'teamId': 2, 'totalPoints': 9.0}})
+        schedule.append({'matchupPeriodId': week, 'id': week * 10 + 2, 'winner': 'AWAY',
+                         'home': {'teamId': 3, 'totalPoints': 8.0}, 'away': {'teamId': 4, 'totalPoints': 7.0 * week}})
+    return {
+        'id': 1234, 'seasonId': 2019, 'scoringPeriodId': 3,
+        'status': {'currentMatchupPeriod': 3, 'firstScoringPeriod': 1, 'finalScoringPeriod': 17,
+                   'latestScoringPeriod': 3, 'previousSeasons': [2018]},
+        'settings': {
+            'name': 'Test', 'size': 4,
+            'scheduleSettings': {'matchupPeriodCount': 13, 'matchupPeriods': {'1': [1], '2': [2], '3': [3]},
+                                 'playoffTeamCount': 2, 'playoffSeedingRule': 'TOTAL_POINTS_SCORED',
+                                 'divisions': [{'id': 0, 'name': 'East'}]},
+            'tradeSettings': {'vetoVotesRequired': 4}, 'draftSettings': {'keeperCount': 0},
+            'scoringSettings': {'matchupTieRule': 'NONE', 'playoffMatchupTieRule': 'NONE', 'scoringItems': []},
+            'acquisitionSettings': {'isUsingAcquisitionBudget': True, 'acquisitionBudget': 100},
+            'rosterSettings': {'lineupSlotCounts': {'0': 1}},
+        },
+        'teams': [team_data(team_id) for team_id in range(1, 5)],
+        'schedule': schedule,
+        'members': [],
+    }
+
+
+PLAYERS = [{'id': team_id * 100 + i, 'fullName': f'Player {team_id}{i}'} for team_id in range(1, 5) for i in range(2)]
+DRAFT = {'draftDetail': {'drafted': True, 'picks': [
+    {'teamId': 1, 'playerId': 100, 'roundId': 1, 'roundPickNumber': 1, 'bidAmount': 5, 'keeper': False, 'nominatingTeamId': 2}]}}
+PRO_SCHEDULE = {'settings': {'proTeams': [
+    {'id': 1, 'proGamesByScoringPeriod': {'3': [{'homeProTeamId': 1, 'awayProTeamId': 2, 'date': 1568000000000}]}}]}}
+
+
+class LazyLeagueTest(TestCase):
+
+    def setUp(self):
+        # no rate limit, retries or breaker state shared with other tests
+        self.addCleanup(set_throttle, FANTASY_BASE_ENDPOINT, get_throttle(FANTASY_BASE_ENDPOINT))
+        set_throttle(FANTASY_BASE_ENDPOINT, HostThrottle(rate=0, backoff_factor=0))
+
+    def mock_espn(self, m) -> Counter:
+        '''Routes every ESPN view to its payload and returns the calls made per view'''
+        views = Counter()
+        def respond(request, context):
+            view = ','.join(parse_qs(urlparse(request.url).query).get('view', []))
+            views[view] += 1
+            if view == 'players_wl':
+                return PLAYERS
+            if view == 'proTeamSchedules_wl':
+                return PRO_SCHEDULE
+            if view == 'mDraftDetail':
+                return DRAFT
+            return league_data()
+        m.get(requests_mock.ANY, json=respond)
+        return views
+
+    @requests_mock.Mocker()
+    def test_sections_fetched_once_on_first_access(self, m):
+        views = self.mock_espn(m)
+
+        league = League(1234, 2019, lazy=True)
+        self.assertEqual(list(views), ['mTeam,mRoster,mMatchup,mSettings,mStandings'])
+        self.assertEqual(league.teams[0].team_name, 'Team 1')
+        self.assertEqual(repr(league.teams[0].roster[0]), 'Player(Player 10)')
+        self.assertEqual(sum(views.values()), 1)
+
+        # the pro schedule is shared by every player
+        self.assertEqual(league.teams[0].roster[0].schedule['3']['team'], 'BUF')
+        league.teams[3].roster[1].schedule
+        self.assertEqual(views['proTeamSchedules_wl'], 1)
+
+        self.assertEqual(repr(league.draft[0]), 'Pick(R:1 P:1, Player 10, Team(Team 1))')
+        league.draft
+        self.assertEqual(views['mDraftDetail'], 1)
+        self.assertEqual(views['players_wl'], 1)
+        self.assertEqual(league.player_map[200], 'Player 20')
+        self.assertEqual(views['players_wl'], 1)
+
+    @requests_mock.Mocker()
+    def test_refresh_draft_refetches_on_next_access(self, m):
+        views = self.mock_espn(m)
+
+        # players_wl would otherwise come from the response cache
+        league = League(1234, 2019, lazy=True, cache=ResponseCache(ttls={}))
+        league.draft
+        league.refresh_draft(refresh_players=True)
+        self.assertEqual(views['mDraftDetail'], 1)
+        league.draft
+        self.assertEqual(views['mDraftDetail'], 2)
+        self.assertEqual(views['players_wl'], 2)
+
+    @requests_mock.Mocker()
+    def test_eager_league_matches_lazy(self, m):
+        views = self.mock_espn(m)
+
+        eager = League(1234, 2019)
+        self.assertEqual(sum(views.values()), 4)
+        lazy = League(1234, 2019, lazy=True)
+        self.assertEqual(repr(lazy.draft), repr(eager.draft))
+        self.assertEqual(lazy.teams[1].roster[0].schedule, eager.teams[1].roster[0].schedule)
+        self.assertEqual(lazy.player_map.get('Player 41'), eager.player_map.get('Player 41'))
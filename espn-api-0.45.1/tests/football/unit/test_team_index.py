@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from espn_api.football import League
+
+
+class Team(object):
+    def __init__(self, team_id):
+        self.team_id = team_id
+
+
+class TeamIndexTest(TestCase):
+
+    def setUp(self):
+        self.league = League(1234, 2019, fetch_league=False)
+        self.league.teams = [Team(team_id) for team_id in (3, 1, 2)]
+
+    def test_get_team_data(self):
+        self.assertIs(self.league.get_team_data(1), self.league.teams[1])
+        self.assertIsNone(self.league.get_team_data(4))
+        self.assertEqual(self.league._team_index(), {1: 0, 2: 1, 3: 2})
+
+    def test_teams_replaced(self):
+        self.league.get_team_data(1)
+        # a new list of the same length
+        self.league.teams = [Team(team_id) for team_id in (3, 1, 2)]
+        self.assertIs(self.league.get_team_data(1), self.league.teams[1])
+
+        self.league.teams.append(Team(4))
+        self.assertIs(self.league.get_team_data(4), self.league.teams[3])
+
+        self.league.teams = [Team(5)]
+        self.assertIsNone(self.league.get_team_data(1))
+        self.assertEqual(self.league._team_index(), {5: 0})
@@ -0,0 +1,103 @@
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+from unittest import TestCase, skipIf
+
+try:
+    import api
+    from fastapi.testclient import TestClient
+except ImportError:  # the API's dependencies (fastapi) aren't installed with the package
+    api = None
+
+
+def team(team_id, player_ids, position='QB'):
+    roster = [SimpleNamespace(playerId=player_id, name=f'Player {player_id}', position=position) for player_id in player_ids]
+    return SimpleNamespace(team_id=team_id, team_name=f'Team {team_id}', wins=1, losses=2, ties=0, roster=roster)
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class ConditionalResponseTest(TestCase):
+
+    def setUp(self):
+        # without the lifespan no warmup runs, every handler reads the stubbed snapshot and pool
+        self.client = TestClient(api.app)
+        self.addCleanup(api._league_snapshots.clear)
+        self.addCleanup(api.free_agent_pool_cache.invalidate, 'pool')
+
+    def stub_snapshot(self, teams):
+        league = SimpleNamespace(teams=teams)
+        snapshot = api.get_league_snapshot()
+        snapshot._league, snapshot._fetched_at = league, time.time()
+        snapshot.etag = api.content_etag(api.league_fingerprint(league))
+        snapshot.modified_at = 1_700_000_000
+        snapshot.bodies = api.EncodedBodies()
+        return snapshot
+
+    def test_teams_not_modified(self):
+        snapshot = self.stub_snapshot([team(1, [10, 11]), team(2, [20])])
+
+        response = self.client.get('/teams')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], snapshot.etag)
+        self.assertEqual([t['id'] for t in response.json()], [1, 2])
+
+        for headers in ({'If-None-Match': snapshot.etag}, {'If-None-Match': f'"other", W/{snapshot.etag}'},
+                        {'If-Modified-Since': formatdate(snapshot.modified_at, usegmt=True)}):
+            response = self.client.get('/teams', headers=headers)
+            self.assertEqual(response.status_code, 304, headers)
+            self.assertEqual(response.headers['ETag'], snapshot.etag)
+            self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.client.get('/teams', headers={'If-None-Match': '"other"'}).status_code, 200)
+        # If-None-Match wins over a matching If-Modified-Since
+        headers = {'If-None-Match': '"other"', 'If-Modified-Since': formatdate(snapshot.modified_at, usegmt=True)}
+        self.assertEqual(self.client.get('/teams', headers=headers).status_code, 200)
+
+    def test_etag_follows_rosters(self):
+        etag = api.content_etag(api.league_fingerprint(SimpleNamespace(teams=[team(1, [10, 11])])))
+
+        self.assertEqual(etag, api.content_etag(api.league_fingerprint(SimpleNamespace(teams=[team(1, [10, 11])]))))
+        for teams in ([team(1, [10])], [team(1, [10, 12])], [team(1, [11, 10])], [team(1, [10, 11], position='RB')]):
+            self.assertNotEqual(etag, api.content_etag(api.league_fingerprint(SimpleNamespace(teams=teams))), teams)
+
+        snapshot = self.stub_snapshot([team(1, [10, 11])])
+        stale = snapshot.etag
+        self.stub_snapshot([team(1, [10])])
+        self.assertEqual(self.client.get('/teams', headers={'If-None-Match': stale}).status_code, 200)
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class FreeAgentsTest(TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api.app)
+        self.addCleanup(api.free_agent_pool_cache.invalidate, 'pool')
+        players = [{'id': i, 'position': position} for i, position in enumerate(['QB', 'RB', 'QB', 'WR', 'QB', 'RB'])]
+        self.pool = api.FreeAgentPool(players)
+        api.free_agent_pool_cache.set('pool', self.pool)
+
+    def ids(self, players):
+        return [player['id'] for player in players]
+
+    def test_slices(self):
+        self.assertEqual(self.ids(self.client.get('/free-agents').json()), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(self.ids(self.client.get('/free-agents?size=2&offset=3').json()), [3, 4])
+        self.assertEqual(self.client.get('/free-agents?offset=10').json(), [])
+
+    def test_groups(self):
+        groups = self.client.get('/free-agents?positions=qb, RB,K,QB&size=2&offset=1').json()
+        self.assertEqual(list(groups), ['QB', 'RB', 'K'])
+        self.assertEqual(self.ids(groups['QB']), [2, 4])
+        self.assertEqual(self.ids(groups['RB']), [5])
+        self.assertEqual(groups['K'], [])
+        self.assertEqual(self.ids(self.client.get('/free-agents-qb').json()), [0, 2, 4])
+
+    def test_not_modified(self):
+        response = self.client.get('/free-agents?positions=QB')
+        self.assertEqual(response.headers['ETag'], self.pool.etag)
+        response = self.client.get('/free-agents?positions=QB', headers={'If-None-Match': self.pool.etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_slices(self):
+        for query in ('size=-5', 'size=0', 'offset=-1', f'size={api.FREE_AGENT_POOL_SIZE + 1}'):
+            self.assertEqual(self.client.get(f'/free-agents?{query}').status_code, 422, query)
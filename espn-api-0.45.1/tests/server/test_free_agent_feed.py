@@ -0,0 +1,68 @@
+from unittest import TestCase, skipIf
+
+try:
+    import api
+except ImportError:  # the API's dependencies (fastapi) aren't installed with the package
+    api = None
+
+
+def pool(player_ids, fetched_at):
+    pool = api.FreeAgentPool([{'id': player_id, 'position': 'QB'} for player_id in player_ids])
+    pool.fetched_at = fetched_at
+    return pool
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class FreeAgentFeedTest(TestCase):
+
+    def setUp(self):
+        self.feed = api.FreeAgentFeed(history=3)
+        self.feed.publish(pool([1, 2], fetched_at=100))
+
+    def test_publish_diffs(self):
+        self.assertEqual(self.feed.seq, 0)
+        queue = self.feed.subscribe()
+        self.feed.publish(pool([2, 3], fetched_at=101))
+        # the same players again is not an event
+        self.feed.publish(pool([3, 2], fetched_at=102))
+
+        self.assertEqual(self.feed.seq, 1)
+        event = queue.get_nowait()
+        self.assertEqual((event['seq'], event['added'], event['removed']), (1, [3], [1]))
+        self.assertTrue(queue.empty())
+
+    def test_out_of_order_publish_ignored(self):
+        newer = pool([2, 3], fetched_at=110)
+        self.feed.publish(newer)
+        self.feed.publish(pool([1, 2], fetched_at=105))
+
+        self.assertIs(self.feed.pool, newer)
+        self.assertEqual(self.feed.seq, 1)
+
+    def test_resume_from_event_id(self):
+        for seq, player_ids in enumerate([[2, 3], [3, 4], [4, 5]], start=1):
+            self.feed.publish(pool(player_ids, fetched_at=100 + seq))
+
+        since = self.feed.parse_event_id(self.feed.event_id(1))
+        self.assertEqual(since, 1)
+        self.assertEqual([event['seq'] for event in self.feed.since(since)], [2, 3])
+        self.assertEqual(self.feed.since(3), [])
+
+    def test_event_id_from_another_feed(self):
+        other = api.FreeAgentFeed(history=3)
+        self.assertIsNone(self.feed.parse_event_id(other.event_id(0)))
+        # bare sequence numbers carry no feed and can't be trusted
+        self.assertIsNone(self.feed.parse_event_id('0'))
+        self.assertIsNone(self.feed.parse_event_id(None))
+        self.assertIsNone(self.feed.parse_event_id(f'{self.feed.id}:x'))
+
+    def test_past_the_buffer(self):
+        for seq in range(1, 6):
+            self.feed.publish(pool([seq * 10], fetched_at=100 + seq))
+
+        # events 1 and 2 fell out of the history, so 1 can't be resumed from
+        self.assertIsNone(self.feed.since(0))
+        self.assertIsNone(self.feed.since(1))
+        self.assertEqual([event['seq'] for event in self.feed.since(2)], [3, 4, 5])
+        # a seq this feed never reached, e.g. from before a restart
+        self.assertIsNone(self.feed.since(6))
@@ -0,0 +1,42 @@
+import json
+import tempfile
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+try:
+    import api
+    from fastapi.testclient import TestClient
+except ImportError:  # the API's dependencies (fastapi) aren't installed with the package
+    api = None
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class PlayerStatsBatchTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = api.PlayerStatsCache(directory.name, current_season_ttl=3600)
+        patcher = patch.object(api, 'player_stats_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(api.app)
+
+    def test_cached_first_then_fetched(self):
+        season = api.YEAR - 1
+        self.cache.set(1, season, {'year': season, 'stats': {'receptions': 5.0}})
+        fetched = []
+
+        async def fetch(player_id, year):
+            fetched.append((player_id, year))
+            return {'year': year, 'stats': {}}
+
+        with patch.object(api, 'fetch_player_stats_from_espn', fetch):
+            response = self.client.post('/player-stats/batch', json={'playerIds': [1, 2, 1], 'seasons': [season]})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(lines, [{'playerId': 1, 'year': season, 'stats': {'receptions': 5.0}},
+                                 {'playerId': 2, 'year': season, 'stats': {}}])
+        self.assertEqual(fetched, [(2, season)])
+        # each pair is read from disk once
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipIf
+
+from espn_api.football.transaction import Transaction
+
+try:
+    import api
+except ImportError:  # the API's dependencies (fastapi) aren't installed with the package
+    api = None
+
+
+def transaction(date, items, status='EXECUTED', scoring_period=3):
+    data = {'teamId': 1, 'type': 'FREEAGENT', 'status': status, 'scoringPeriodId': scoring_period,
+            'processDate': date, 'items': items}
+    return Transaction(data, {}, lambda team_id: None)
+
+
+def item(type, player_id, from_team_id=-1, to_team_id=-1):
+    return {'type': type, 'playerId': player_id, 'fromTeamId': from_team_id, 'toTeamId': to_team_id}
+
+
+def league(rosters, scoring_period=3):
+    teams = [SimpleNamespace(team_id=team_id, roster=[SimpleNamespace(playerId=player_id) for player_id in player_ids])
+             for team_id, player_ids in rosters.items()]
+    return SimpleNamespace(teams=teams, scoringPeriodId=scoring_period)
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class RosterIndexTest(TestCase):
+
+    def setUp(self):
+        self.index = api.RosterIndex()
+        # rosters fetched at t=1000s, so the cursor starts a minute before
+        self.index.seed(league({1: [10, 11], 2: [20]}), fetched_at=1000)
+
+    def test_seed(self):
+        self.assertEqual(self.index.team_by_player, {10: 1, 11: 1, 20: 2})
+        self.assertEqual(self.index.cursor, (1000 - api.ROSTER_CURSOR_OVERLAP_SECONDS) * 1000)
+        self.assertEqual(self.index.cursor_period, 3)
+        self.assertIn(10, self.index)
+        self.assertEqual(len(self.index), 3)
+
+    def test_add_drop_trade(self):
+        self.index.apply([
+            transaction(2_000_000, [item('ADD', 30, to_team_id=2), item('DROP', 20, from_team_id=2)]),
+            transaction(2_000_001, [item('TRADE', 10, from_team_id=1, to_team_id=2),
+                                    item('TRADE', 30, from_team_id=2, to_team_id=1)]),
+        ])
+        self.assertEqual(self.index.team_by_player, {10: 2, 11: 1, 30: 1})
+        self.assertEqual(self.index.cursor, 2_000_001)
+
+    def test_applied_in_date_order(self):
+        # 20 is dropped and then picked up by team 1, listed newest first
+        self.index.apply([
+            transaction(2_000_002, [item('ADD', 20, to_team_id=1)]),
+            transaction(2_000_001, [item('DROP', 20, from_team_id=2)]),
+        ])
+        self.assertEqual(self.index.team_by_player[20], 1)
+
+    def test_stale_drop_ignored(self):
+        # the player already moved on, so a drop from the old team doesn't remove them
+        self.index.apply([transaction(2_000_000, [item('DROP', 10, from_team_id=2)])])
+        self.assertEqual(self.index.team_by_player[10], 1)
+
+    def test_skips_unexecuted_and_applied(self):
+        self.index.apply([
+            transaction(2_000_000, [item('ADD', 30, to_team_id=1)], status='PENDING'),
+            transaction(900_000, [item('DROP', 10, from_team_id=1)]),
+        ])
+        self.assertEqual(self.index.team_by_player, {10: 1, 11: 1, 20: 2})
+        self.assertEqual(self.index.cursor, (1000 - api.ROSTER_CURSOR_OVERLAP_SECONDS) * 1000)
+
+        self.index.apply([transaction(2_000_000, [item('ADD', 30, to_team_id=1)])])
+        self.index.apply([transaction(2_000_000, [item('DROP', 30, from_team_id=1)])])
+        self.assertEqual(self.index.team_by_player[30], 1)
+
+    def test_state_round_trip(self):
+        self.index.apply([transaction(2_000_000, [item('ADD', 30, to_team_id=2)], scoring_period=4)])
+        state = api.json_loads(api.encode_json(self.index.to_state()))
+
+        other = api.RosterIndex()
+        other.load_state(state)
+        self.assertEqual(other.team_by_player, self.index.team_by_player)
+        self.assertEqual((other.cursor, other.cursor_period, other.synced_at, other.updated_at),
+                         (self.index.cursor, 4, self.index.synced_at, self.index.updated_at))
+
+    def test_poll_periods(self):
+        self.assertEqual(self.index.poll_periods(3), [3])
+        # the period rolled over while the cursor is still in the last one
+        self.assertEqual(self.index.poll_periods(4), [3, 4])
+        self.index.apply([transaction(2_000_000, [item('ADD', 30, to_team_id=2)], scoring_period=4)])
+        self.assertEqual(self.index.poll_periods(4), [4])
+
+
+@skipIf(api is None, 'fastapi is not installed')
+class RosterIndexPollTest(IsolatedAsyncioTestCase):
+
+    async def test_polls_previous_period(self):
+        index = api.RosterIndex()
+        index.seed(league({1: [10]}), fetched_at=1000)
+        polled = []
+        async def transactions_async(scoring_period, types):
+            polled.append(scoring_period)
+            if scoring_period == 3:
+                # processed in period 3 after the last poll
+                return [transaction(2_000_000, [item('ADD', 30, to_team_id=1)], scoring_period=3)]
+            raise Exception('No transactions found')
+        snapshot_league = league({1: [10]}, scoring_period=4)
+        snapshot_league.transactions_async = transactions_async
+
+        async def get():
+            return snapshot_league, 1000
+        with mock.patch.object(api, 'get_league_snapshot', return_value=SimpleNamespace(get=get)), \
+                mock.patch.object(api, 'cached_value', return_value=None):
+            state = await index._poll()
+
+        self.assertEqual(polled, [3, 4])
+        self.assertEqual(dict(state['team_by_player']), {10: 1, 30: 1})
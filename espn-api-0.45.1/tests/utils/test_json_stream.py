@@ -0,0 +1,34 @@
+import json
+from unittest import TestCase
+
+from espn_api.utils.json_stream import iter_json_array, iter_text
+
+
+class JsonStreamTest(TestCase):
+
+    def test_every_chunk_boundary(self):
+        data = [{'id': 1, 'fullName': 'Amon-Ra St. Brown'}, 12345, -1.5e3, 'a ] , [ b', None, True, [1, [2]], {}]
+        text = json.dumps(data)
+        for size in range(1, len(text) + 1):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.assertEqual(list(iter_json_array(chunks)), data, f'chunk size {size}')
+
+    def test_whitespace_and_empty(self):
+        self.assertEqual(list(iter_json_array([' \n[ ', ' ] '])), [])
+        self.assertEqual(list(iter_json_array(['[ 1 ,\n 2 ]'])), [1, 2])
+
+    def test_lazy(self):
+        players = iter_json_array(['[{"id": 1}, ', '{"id": 2}, {"id"'])
+        self.assertEqual(next(players), {'id': 1})
+        self.assertEqual(next(players), {'id': 2})
+        with self.assertRaises(ValueError):
+            next(players)
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['{"id": 1}']))
+
+    def test_iter_text_multibyte(self):
+        body = json.dumps([{'fullName': 'Mecole Hardman Jr. ✓ Żółć'}], ensure_ascii=False).encode('utf-8')
+        self.assertEqual(''.join(iter_text(body, chunk_size=3)), body.decode('utf-8'))
+        self.assertEqual(list(iter_json_array(iter_text(body, chunk_size=1))), json.loads(body))
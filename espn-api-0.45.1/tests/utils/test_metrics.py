@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+import requests_mock
+
+from espn_api.requests.espn_requests import EspnFantasyRequests
+from espn_api.requests.response_cache import ResponseCache
+from espn_api.requests.throttle import HostThrottle
+from espn_api.utils.metrics import ESPN_REQUESTS, ESPN_REQUEST_SECONDS, MetricsRegistry, request_view
+
+
+class MetricsTest(TestCase):
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('calls_total', 'Calls', ('view',))
+        histogram = registry.histogram('call_seconds', 'Call time', ('view',), buckets=(0.1, 1))
+        counter.inc(view='mTeam')
+        counter.inc(2, view='mTeam')
+        histogram.observe(0.5, view='mTeam')
+        registry.collector('hits_total', 'Hits', 'counter', lambda: [({'cache': 'pool'}, 4)])
+
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE calls_total counter', lines)
+        self.assertIn('calls_total{view="mTeam"} 3', lines)
+        self.assertIn('call_seconds_bucket{view="mTeam",le="0.1"} 0', lines)
+        self.assertIn('call_seconds_bucket{view="mTeam",le="1.0"} 1', lines)
+        self.assertIn('call_seconds_bucket{view="mTeam",le="+Inf"} 1', lines)
+        self.assertIn('call_seconds_count{view="mTeam"} 1', lines)
+        self.assertIn('hits_total{cache="pool"} 4', lines)
+
+        # registering the same name again returns the existing metric
+        self.assertIs(registry.counter('calls_total', 'Calls', ('view',)), counter)
+
+    def test_request_view(self):
+        self.assertEqual(request_view({'view': ['mTeam', 'mRoster']}), 'mTeam,mRoster')
+        self.assertEqual(request_view({'view': 'kona_playercard'}), 'kona_playercard')
+        self.assertEqual(request_view(None, '/players'), '/players')
+
+    @requests_mock.Mocker()
+    def test_upstream_calls_recorded_per_view(self, m):
+        request = EspnFantasyRequests(sport='nfl', year=2019, league_id=1234, cache=ResponseCache(ttls={}),
+                                      throttle=HostThrottle(rate=0))
+        m.get(request.ENDPOINT + '?view=proTeamSchedules_wl', status_code=200, json={})
+        before = ESPN_REQUESTS.value(view='proTeamSchedules_wl', status=200)
+        observed = ESPN_REQUEST_SECONDS.count(view='proTeamSchedules_wl')
+
+        request.get_pro_schedule()
+        request.get_pro_schedule()
+
+        self.assertEqual(ESPN_REQUESTS.value(view='proTeamSchedules_wl', status=200), before + 2)
+        self.assertEqual(ESPN_REQUEST_SECONDS.count(view='proTeamSchedules_wl'), observed + 2)
@@ -0,0 +1,63 @@
+import json
+from unittest import TestCase
+
+from espn_api.utils.player_directory import PlayerDirectory, normalize_name
+
+
+class PlayerDirectoryTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open('tests/football/unit/data/league_players_2018.json') as f:
+            cls.players = json.loads(f.read())
+
+    def setUp(self):
+        self.directory = PlayerDirectory(self.players)
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name('Amon-Ra St. Brown'), 'amon ra st brown')
+        self.assertEqual(normalize_name("  Le'Veon  BELL "), 'leveon bell')
+        self.assertEqual(normalize_name('Żółć'), 'zoc')
+
+    def test_player_map_lookups(self):
+        self.assertEqual(len(self.directory), len(self.players))
+        self.assertEqual(self.directory[15795], 'DeAndre Hopkins')
+        self.assertEqual(self.directory['DeAndre Hopkins'], 15795)
+        self.assertEqual(self.directory.get('deandre hopkins'), 15795)
+        self.assertIn(15795, self.directory)
+        self.assertNotIn('Not A Player', self.directory)
+        self.assertEqual(self.directory.get(-1, ''), '')
+        self.assertEqual(self.directory.record(15795).pro_team_id, 34)
+
+    def test_duplicate_names(self):
+        ids = [player['id'] for player in self.players if player['fullName'] == 'David Johnson']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(self.directory.ids('David Johnson'), ids)
+        # name lookups give the first, as the dict player_map did
+        self.assertEqual(self.directory['David Johnson'], ids[0])
+
+    def test_prefix(self):
+        self.assertEqual([r.name for r in self.directory.prefix('deandre hop')], ['DeAndre Hopkins'])
+        self.assertEqual([r.name for r in self.directory.prefix('hopkins')], ['DeAndre Hopkins', 'Dustin Hopkins'])
+        self.assertEqual(len(self.directory.prefix('j', limit=5)), 5)
+        self.assertEqual(self.directory.prefix(''), [])
+
+    def test_fuzzy(self):
+        names = [record.name for record, _ in self.directory.fuzzy('hopkns')]
+        self.assertEqual(sorted(names), ['DeAndre Hopkins', 'Dustin Hopkins'])
+        self.assertEqual(self.directory.fuzzy('patrik mahomes', limit=1)[0][0].name, 'Patrick Mahomes')
+        self.assertEqual(self.directory.fuzzy('zzzz'), [])
+
+    def test_search(self):
+        self.assertEqual(self.directory.search('DeAndre Hopkins', limit=1)[0].id, 15795)
+        self.assertEqual(self.directory.search('mahoms', limit=1)[0].name, 'Patrick Mahomes')
+        names = [record.name for record in self.directory.search('hop', limit=10)]
+        self.assertEqual(names[:2], ['DeAndre Hopkins', 'Dustin Hopkins'])
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_rename(self):
+        self.directory.add(15795, 'Nuk Hopkins')
+        self.assertEqual(self.directory.ids('DeAndre Hopkins'), [])
+        self.assertEqual(self.directory['nuk hopkins'], 15795)
+        self.assertEqual([r.id for r in self.directory.prefix('deandre hopk')], [])
+        self.assertEqual(self.directory.fuzzy('nuk hopkins', limit=1)[0][0].id, 15795)
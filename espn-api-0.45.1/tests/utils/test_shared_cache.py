@@ -0,0 +1,113 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from espn_api.utils.shared_cache import SQLiteSharedCache
+from espn_api.utils.single_flight import SWRCache
+
+
+class SharedCacheTestBase(object):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open_cache(self) -> SQLiteSharedCache:
+        # each instance stands in for a separate worker process
+        cache = SQLiteSharedCache(self.path)
+        self.addCleanup(cache.close)
+        return cache
+
+
+class SQLiteSharedCacheTest(SharedCacheTestBase, TestCase):
+
+    def test_entries_visible_to_other_connections(self):
+        first, second = self.open_cache(), self.open_cache()
+        first.set('key', b'value', stored_at=1000)
+
+        self.assertEqual(second.get('key'), (1000, b'value'))
+        self.assertEqual(second.stored_at('key'), 1000)
+        second.delete('key')
+        self.assertIsNone(first.get('key'))
+
+    def test_lease(self):
+        first, second = self.open_cache(), self.open_cache()
+
+        self.assertTrue(first.acquire_lease('key', ttl=30))
+        self.assertFalse(second.acquire_lease('key', ttl=30))
+        self.assertTrue(second.lease_held('key'))
+        # releasing someone else's lease does nothing
+        second.release_lease('key')
+        self.assertFalse(second.acquire_lease('key', ttl=30))
+
+        first.release_lease('key')
+        self.assertTrue(second.acquire_lease('key', ttl=30))
+
+    def test_expired_lease_can_be_taken(self):
+        first, second = self.open_cache(), self.open_cache()
+        with mock.patch('espn_api.utils.shared_cache.time.time', return_value=1000):
+            first.acquire_lease('key', ttl=30)
+        with mock.patch('espn_api.utils.shared_cache.time.time', return_value=1031):
+            self.assertTrue(second.acquire_lease('key', ttl=30))
+
+
+class SharedSWRCacheTest(SharedCacheTestBase, IsolatedAsyncioTestCase):
+
+    def waiting_cache(self, waiting: asyncio.Event) -> SQLiteSharedCache:
+        '''A worker's cache that sets waiting once it has failed to take a lease'''
+        cache = self.open_cache()
+        acquire_lease, loop = cache.acquire_lease, asyncio.get_running_loop()
+        def acquire(*args):
+            acquired = acquire_lease(*args)
+            if not acquired:
+                loop.call_soon_threadsafe(waiting.set)
+            return acquired
+        cache.acquire_lease = acquire
+        return cache
+
+    async def test_one_worker_loads_for_all(self):
+        loads = []
+        first_loading, second_waiting = asyncio.Event(), asyncio.Event()
+        def loader(name):
+            async def load():
+                loads.append(name)
+                first_loading.set()
+                # hold the lease until the other worker is waiting on it
+                await second_waiting.wait()
+                return {'loaded_by': name}
+            return load
+
+        first = SWRCache('pool', ttl=60, shared=self.open_cache())
+        second = SWRCache('pool', ttl=60, shared=self.waiting_cache(second_waiting), poll_interval=0.01)
+        first_get = asyncio.ensure_future(first.get('key', loader('first')))
+        await first_loading.wait()
+        results = await asyncio.gather(first_get, second.get('key', loader('second')))
+
+        self.assertEqual(results, [{'loaded_by': 'first'}, {'loaded_by': 'first'}])
+        self.assertEqual(loads, ['first'])
+        self.assertEqual(second.shared_hits, 1)
+
+        # a worker starting later reads the stored entry
+        third = SWRCache('pool', ttl=60, shared=self.open_cache())
+        self.assertEqual(await third.get('key', loader('third')), {'loaded_by': 'first'})
+        self.assertEqual(await third.get_fresh('key', loader('third')), {'loaded_by': 'first'})
+        self.assertEqual(loads, ['first'])
+
+    async def test_stored_before_lease_taken(self):
+        # the holder stores and releases between a waiter's last check and its next acquire
+        first_shared, second_shared = self.open_cache(), self.open_cache()
+        acquire_lease = second_shared.acquire_lease
+        def acquire(key, ttl):
+            first_shared.set(key, b'{"loaded_by": "first"}')
+            return acquire_lease(key, ttl)
+        second_shared.acquire_lease = acquire
+
+        async def load():
+            self.fail('loaded although a fresh entry was stored')
+        second = SWRCache('pool', ttl=60, shared=second_shared)
+        self.assertEqual(await second.refresh('key', load), {'loaded_by': 'first'})
+        self.assertEqual(second.shared_hits, 1)
+        self.assertFalse(second_shared.lease_held('pool:%r' % 'key'))
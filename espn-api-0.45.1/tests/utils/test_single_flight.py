@@ -0,0 +1,106 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, mock
+
+from espn_api.utils.single_flight import SingleFlight, SWRCache, single_flight
+
+
+class SingleFlightTest(IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_share_one_load(self):
+        calls = []
+        async def load(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do('key', load, 21) for _ in range(5)])
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, [21])
+        self.assertNotIn('key', flight)
+
+        # a finished call is not reused
+        await flight.do('key', load, 1)
+        self.assertEqual(calls, [21, 1])
+
+    async def test_errors_are_shared_and_not_kept(self):
+        calls = []
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError('boom')
+
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do('key', load), flight.do('key', load), return_exceptions=True)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        with self.assertRaises(ValueError):
+            await flight.do('key', load)
+        self.assertEqual(len(calls), 2)
+
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        async def load():
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do('key', load))
+        second = asyncio.ensure_future(flight.do('key', load))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 'done')
+
+    async def test_decorator_keys_by_arguments(self):
+        calls = []
+        @single_flight
+        async def load(a, b=0):
+            calls.append((a, b))
+            await asyncio.sleep(0.01)
+            return a + b
+
+        results = await asyncio.gather(load(1, b=2), load(1, b=2), load(2))
+
+        self.assertEqual(results, [3, 3, 2])
+        self.assertEqual(sorted(calls), [(1, 2), (2, 0)])
+
+
+class SWRCacheTest(IsolatedAsyncioTestCase):
+
+    async def test_hit_and_miss(self):
+        loads = []
+        async def load():
+            loads.append(1)
+            return len(loads)
+
+        cache = SWRCache('test', ttl=60)
+        self.assertFalse(cache.is_fresh('key'))
+        self.assertEqual(await cache.get('key', load), 1)
+        self.assertTrue(cache.is_fresh('key'))
+        self.assertEqual(await cache.get('key', load), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    async def test_stale_entry_served_while_refreshing(self):
+        loads = []
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return len(loads)
+
+        cache = SWRCache('test', ttl=60, stale_ttl=60)
+        with mock.patch('espn_api.utils.single_flight.time.time', return_value=1000):
+            await cache.get('key', load)
+        with mock.patch('espn_api.utils.single_flight.time.time', return_value=1070):
+            # expired: every caller gets the old value and only one refresh starts
+            results = await asyncio.gather(*[cache.get('key', load) for _ in range(3)])
+            self.assertEqual(results, [1, 1, 1])
+            await asyncio.sleep(0.02)
+            self.assertEqual(len(loads), 2)
+            self.assertEqual(await cache.get('key', load), 2)
+        self.assertEqual(cache.stale_hits, 3)
+
+        with mock.patch('espn_api.utils.single_flight.time.time', return_value=2000):
+            # past the stale window the caller waits for a fresh load
+            self.assertEqual(await cache.get('key', load), 3)
@@ -0,0 +1,25 @@
+// Conditional GET for the FastAPI read endpoints.
+// Keeps the last body and ETag per URL and revalidates with If-None-Match,
+// so an unchanged snapshot costs a 304 instead of a full JSON download.
+const responseCache = new Map();
+
+export async function fetchJsonConditional(url, fetchFn = fetch) {
+  const cached = responseCache.get(url);
+  const headers = cached ? { 'If-None-Match': cached.etag } : {};
+
+  const response = await fetchFn(url, { headers });
+
+  if (response.status === 304 && cached) {
+    return { ok: true, status: 200, data: cached.data };
+  }
+  if (!response.ok) {
+    return { ok: false, status: response.status, data: null };
+  }
+
+  const data = await response.json();
+  const etag = response.headers.get('etag');
+  if (etag) {
+    responseCache.set(url, { etag, data });
+  }
+  return { ok: true, status: response.status, data };
+}
@@ -0,0 +1,89 @@
+// Live view of the free-agent pool from the API's /events/free-agents stream.
+// The API sends a `reset` event with every free-agent id, then `diff` events
+// with the ids added and removed. On reconnect we send Last-Event-ID so only
+// the missed diffs are replayed; a reconnect that reaches another API worker
+// gets a fresh reset instead. Callers fall back to polling while the feed is
+// not live.
+const FEED_URL = 'http://localhost:8000/events/free-agents';
+const RECONNECT_DELAY_MS = 5000;
+
+const feed = {
+  ids: new Set(),
+  lastEventId: null,
+  live: false,
+  started: false
+};
+
+function applyEvent(event, data) {
+  if (event === 'reset') {
+    feed.ids = new Set(data.ids);
+    feed.live = true;
+  } else if (event === 'diff') {
+    for (const id of data.removed) feed.ids.delete(id);
+    for (const id of data.added) feed.ids.add(id);
+  }
+}
+
+function handleMessage(message) {
+  let event = 'message';
+  let id = null;
+  const dataLines = [];
+  for (const line of message.split('\n')) {
+    if (line.startsWith(':')) continue;
+    if (line.startsWith('event: ')) event = line.slice(7);
+    else if (line.startsWith('id: ')) id = line.slice(4);
+    else if (line.startsWith('data: ')) dataLines.push(line.slice(6));
+  }
+  if (dataLines.length === 0) return;
+
+  applyEvent(event, JSON.parse(dataLines.join('\n')));
+  if (id !== null) feed.lastEventId = id;
+}
+
+async function connect() {
+  const headers = feed.lastEventId !== null ? { 'Last-Event-ID': feed.lastEventId } : {};
+  const response = await fetch(FEED_URL, { headers });
+  if (!response.ok || !response.body) {
+    throw new Error(`Free agent feed request failed with ${response.status}`);
+  }
+
+  // A resumed stream starts with diffs; the ids we hold are still current
+  if (feed.lastEventId !== null) feed.live = true;
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      handleMessage(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+    }
+  }
+}
+
+async function run() {
+  while (true) {
+    try {
+      await connect();
+    } catch (error) {
+      console.error('Free agent feed disconnected:', error.message);
+    }
+    feed.live = false;
+    await new Promise(resolve => setTimeout(resolve, RECONNECT_DELAY_MS));
+  }
+}
+
+export function startFreeAgentFeed() {
+  if (feed.started) return;
+  feed.started = true;
+  run();
+}
+
+// The current free-agent ids, or null while the feed is not live
+export function getLiveFreeAgentIds() {
+  return feed.live ? feed.ids : null;
+}
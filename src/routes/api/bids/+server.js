@@ -1,10 +1,14 @@
 import { json } from '@sveltejs/kit';
 import { broadcastToSSEClients } from '$lib/sse.js';
+import { fetchJsonConditional } from '$lib/conditional-fetch.js';
+import { startFreeAgentFeed, getLiveFreeAgentIds } from '$lib/free-agent-feed.js';
 
 // In-memory storage for demo purposes
 // In production, this should be replaced with a proper database
 let bidsStorage = [];
 
+const FREE_AGENT_POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DT', 'DE', 'LB', 'CB', 'S', 'K'];
+
 // Cache for free agents to reduce API calls
 let freeAgentsCache = {
   data: new Set(),
@@ -14,6 +18,12 @@ let freeAgentsCache = {
 
 // Function to get current free agents list with caching
 async function getCurrentFreeAgents() {
+  startFreeAgentFeed();
+  const liveIds = getLiveFreeAgentIds();
+  if (liveIds) {
+    return liveIds;
+  }
+
   const now = Date.now();
   
   // Return cached data if still valid
@@ -22,33 +32,16 @@ async function getCurrentFreeAgents() {
   }
   
   try {
-    // Use Promise.allSettled for better error handling
-    const responses = await Promise.allSettled([
-      fetch('http://localhost:8000/free-agents-qb'),
-      fetch('http://localhost:8000/free-agents-rb'),
-      fetch('http://localhost:8000/free-agents-wr'),
-      fetch('http://localhost:8000/free-agents-te'),
-      fetch('http://localhost:8000/free-agents-dt'),
-      fetch('http://localhost:8000/free-agents-de'),
-      fetch('http://localhost:8000/free-agents-lb'),
-      fetch('http://localhost:8000/free-agents-cb'),
-      fetch('http://localhost:8000/free-agents-s'),
-      fetch('http://localhost:8000/free-agents-k')
-    ]);
-    
-    const allPlayers = [];
-    
-    // Process responses with better error handling
-    await Promise.all(responses.map(async (result) => {
-      if (result.status === 'fulfilled' && result.value.ok) {
-        try {
-          const players = await result.value.json();
-          allPlayers.push(...players);
-        } catch (error) {
-          console.error('Error parsing player data:', error);
-        }
-      }
-    }));
+    // One request returns every position group from the API's shared free-agent pool
+    const response = await fetchJsonConditional(
+      `http://localhost:8000/free-agents?positions=${FREE_AGENT_POSITIONS.join(',')}&size=300`
+    );
+    if (!response.ok) {
+      throw new Error(`Free agents request failed with ${response.status}`);
+    }
+
+    const groups = response.data;
+    const allPlayers = Object.values(groups).flat();
     
     // Update cache
     freeAgentsCache.data = new Set(allPlayers.map(player => player.id));
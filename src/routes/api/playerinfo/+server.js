@@ -2,15 +2,18 @@ import { json } from '@sveltejs/kit';
 
 const EXTERNAL_API_BASE = 'http://localhost:8000';
 
+// GET /api/playerinfo?playerId=123 for one player, or ?ids=1,2,3 for many in one upstream request
 export async function GET({ url }) {
     const playerId = url.searchParams.get('playerId');
+    const ids = url.searchParams.get('ids');
     
-    if (!playerId) {
-        return json({ error: 'playerId parameter is required' }, { status: 400 });
+    if (!playerId && !ids) {
+        return json({ error: 'playerId or ids parameter is required' }, { status: 400 });
     }
     
     try {
-        const response = await fetch(`${EXTERNAL_API_BASE}/playerinfo?playerId=${playerId}`);
+        const query = ids ? `ids=${encodeURIComponent(ids)}` : `playerId=${playerId}`;
+        const response = await fetch(`${EXTERNAL_API_BASE}/playerinfo?${query}`);
         
         if (!response.ok) {
             return json({ error: 'Failed to fetch player info' }, { status: response.status });
@@ -22,4 +25,29 @@ export async function GET({ url }) {
         console.error('Error fetching player info:', error);
         return json({ error: 'Failed to fetch player info' }, { status: 500 });
     }
-}
\ No newline at end of file
+}
+
+// POST /api/playerinfo with { playerIds: [...] } for id lists too long for a query string
+export async function POST({ request }) {
+    try {
+        const { playerIds } = await request.json();
+        if (!Array.isArray(playerIds)) {
+            return json({ error: 'playerIds must be an array' }, { status: 400 });
+        }
+
+        const response = await fetch(`${EXTERNAL_API_BASE}/playerinfo`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ playerIds })
+        });
+
+        if (!response.ok) {
+            return json({ error: 'Failed to fetch player info' }, { status: response.status });
+        }
+
+        return json(await response.json());
+    } catch (error) {
+        console.error('Error fetching player info:', error);
+        return json({ error: 'Failed to fetch player info' }, { status: 500 });
+    }
+}
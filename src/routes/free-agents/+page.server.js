@@ -1,3 +1,5 @@
+import { fetchJsonConditional } from '$lib/conditional-fetch.js';
+
 export async function load({ fetch, setHeaders, url }) {
   // Set cache headers for better performance
   setHeaders({
@@ -7,14 +9,15 @@ export async function load({ fetch, setHeaders, url }) {
   // Check if a specific position is requested
   const position = url.searchParams.get('position');
   
+  const positionFilter = position && position !== 'All' ? position.toUpperCase() : null;
   let freeAgentsUrl = 'http://localhost:8000/free-agents';
-  if (position && position !== 'All') {
-    freeAgentsUrl = `http://localhost:8000/free-agents-${position.toLowerCase()}`;
+  if (positionFilter) {
+    freeAgentsUrl = `http://localhost:8000/free-agents?positions=${positionFilter}&size=300`;
   }
   
   const [teamsRes, freeAgentsRes] = await Promise.all([
-    fetch('http://localhost:8000/teams'),
-    fetch(freeAgentsUrl)
+    fetchJsonConditional('http://localhost:8000/teams', fetch),
+    fetchJsonConditional(freeAgentsUrl, fetch)
   ]);
 
   if (!teamsRes.ok || !freeAgentsRes.ok) {
@@ -26,8 +29,9 @@ export async function load({ fetch, setHeaders, url }) {
     };
   }
 
-  const teams = await teamsRes.json();
-  const freeAgents = await freeAgentsRes.json();
+  const teams = teamsRes.data;
+  const freeAgentsData = freeAgentsRes.data;
+  const freeAgents = positionFilter ? (freeAgentsData[positionFilter] || []) : freeAgentsData;
 
   return {
     teams,
@@ -36,7 +36,7 @@ cd espn-api-0.45.1
 pip show fastapi >nul 2>&1
 if errorlevel 1 (
     echo Installing Python dependencies...
-    pip install fastapi uvicorn espn-api requests
+    pip install fastapi uvicorn espn-api requests httpx orjson
     if errorlevel 1 (
         echo ERROR: Failed to install Python dependencies
         pause
@@ -62,8 +62,23 @@ echo.
 echo Starting ESPN API server on port 8000...
 start "ESPN API Server" cmd /c "cd espn-api-0.45.1 && python -m uvicorn api:app --host 0.0.0.0 --port 8000 --reload"
 
-REM Wait a moment for the API server to start
-timeout /t 3 /nobreak >nul
+REM Wait until the API has loaded the league, rosters and free agents
+echo Waiting for the ESPN API server to warm its caches...
+set READY_TRIES=0
+:wait_ready
+python -c "import urllib.request; urllib.request.urlopen('http://localhost:8000/readyz', timeout=2)" >nul 2>&1
+if not errorlevel 1 (
+    echo ESPN API server is ready
+    goto api_ready
+)
+set /a READY_TRIES+=1
+if %READY_TRIES% geq 120 (
+    echo WARNING: ESPN API server not ready after 120s, see http://localhost:8000/readyz
+    goto api_ready
+)
+timeout /t 1 /nobreak >nul
+goto wait_ready
+:api_ready
 
 echo Starting SvelteKit development server...
 start "SvelteKit Dev Server" cmd /c "npm run dev"
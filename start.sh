@@ -31,7 +31,7 @@ fi
 cd espn-api-0.45.1
 if ! python3 -c "import fastapi" &> /dev/null; then
     echo "Installing Python dependencies..."
-    pip3 install fastapi uvicorn espn-api requests
+    pip3 install fastapi uvicorn espn-api requests httpx orjson
     if [ $? -ne 0 ]; then
         echo "ERROR: Failed to install Python dependencies"
         exit 1
@@ -58,8 +58,23 @@ cd espn-api-0.45.1
 python3 -m uvicorn api:app --host 0.0.0.0 --port 8000 --reload &
 API_PID=$!
 
-# Wait a moment for the API server to start
-sleep 3
+# Wait until the API has loaded the league, rosters and free agents
+echo "Waiting for the ESPN API server to warm its caches..."
+READY_TIMEOUT=${API_READY_TIMEOUT:-120}
+for ((i = 0; i < READY_TIMEOUT; i++)); do
+    if python3 -c "import urllib.request; urllib.request.urlopen('http://localhost:8000/readyz', timeout=2)" &> /dev/null; then
+        echo "ESPN API server is ready"
+        break
+    fi
+    if ! kill -0 $API_PID 2>/dev/null; then
+        echo "ERROR: ESPN API server exited during startup"
+        exit 1
+    fi
+    sleep 1
+done
+if [ $i -ge $READY_TIMEOUT ]; then
+    echo "WARNING: ESPN API server not ready after ${READY_TIMEOUT}s, see http://localhost:8000/readyz"
+fi
 
 echo "Starting SvelteKit development server..."
 cd ..